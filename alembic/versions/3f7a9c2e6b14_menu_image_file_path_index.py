@@ -0,0 +1,33 @@
+"""menu image file path index
+
+Revision ID: 3f7a9c2e6b14
+Revises: b9e4c2d71a05
+Create Date: 2026-10-19 23:48:12.507311
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f7a9c2e6b14"
+down_revision: Union[str, Sequence[str], None] = "b9e4c2d71a05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_menu_images_file_path",
+        "menu_images",
+        ["file_path"],
+        unique=False,
+        postgresql_ops={"file_path": "varchar_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_menu_images_file_path", table_name="menu_images")
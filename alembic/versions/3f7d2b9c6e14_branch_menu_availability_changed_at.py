@@ -0,0 +1,32 @@
+"""branch menu availability changed at
+
+Revision ID: 3f7d2b9c6e14
+Revises: 8c2f4e1a9b37
+Create Date: 2026-10-19 11:04:27.552918
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f7d2b9c6e14"
+down_revision: Union[str, Sequence[str], None] = "8c2f4e1a9b37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "company_branches_menus",
+        sa.Column("available_changed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("company_branches_menus", "available_changed_at")
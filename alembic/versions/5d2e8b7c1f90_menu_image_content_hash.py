@@ -0,0 +1,38 @@
+"""menu image content hash
+
+Revision ID: 5d2e8b7c1f90
+Revises: a3c9e1f27b84
+Create Date: 2026-10-19 21:07:38.514926
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2e8b7c1f90"
+down_revision: Union[str, Sequence[str], None] = "a3c9e1f27b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "menu_images", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_menu_images_content_hash"),
+        "menu_images",
+        ["content_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_menu_images_content_hash"), table_name="menu_images")
+    op.drop_column("menu_images", "content_hash")
@@ -0,0 +1,122 @@
+"""menu delta sync
+
+Revision ID: 8c2f4e1a9b37
+Revises: 4ab8bc0aebf1
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2f4e1a9b37"
+down_revision: Union[str, Sequence[str], None] = "4ab8bc0aebf1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "menu_item_tombstones",
+        sa.Column("menu_item_id", sa.Integer(), nullable=False),
+        sa.Column("slug", sa.String(length=255), nullable=False),
+        sa.Column("owner_company_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_company_id"],
+            ["companies.id"],
+            name=op.f("fk_menu_item_tombstones_owner_company_id_companies"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_menu_item_tombstones")),
+    )
+    op.create_index(
+        op.f("ix_menu_item_tombstones_menu_item_id"),
+        "menu_item_tombstones",
+        ["menu_item_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_menu_item_tombstones_owner_company_id"),
+        "menu_item_tombstones",
+        ["owner_company_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_menu_item_tombstones_deleted_at"),
+        "menu_item_tombstones",
+        ["deleted_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_menu_item_tombstones_company_deleted_at",
+        "menu_item_tombstones",
+        ["owner_company_id", "deleted_at"],
+        unique=False,
+    )
+    op.add_column(
+        "company_branches_menus",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "company_branches_menus",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        op.f("ix_company_branches_menus_created_at"),
+        "company_branches_menus",
+        ["created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_company_branches_menus_updated_at"),
+        "company_branches_menus",
+        ["updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_company_branches_menus_updated_at"),
+        table_name="company_branches_menus",
+    )
+    op.drop_index(
+        op.f("ix_company_branches_menus_created_at"),
+        table_name="company_branches_menus",
+    )
+    op.drop_column("company_branches_menus", "updated_at")
+    op.drop_column("company_branches_menus", "created_at")
+    op.drop_index(
+        "ix_menu_item_tombstones_company_deleted_at",
+        table_name="menu_item_tombstones",
+    )
+    op.drop_index(
+        op.f("ix_menu_item_tombstones_deleted_at"), table_name="menu_item_tombstones"
+    )
+    op.drop_index(
+        op.f("ix_menu_item_tombstones_owner_company_id"),
+        table_name="menu_item_tombstones",
+    )
+    op.drop_index(
+        op.f("ix_menu_item_tombstones_menu_item_id"),
+        table_name="menu_item_tombstones",
+    )
+    op.drop_table("menu_item_tombstones")
@@ -0,0 +1,33 @@
+"""menu image variants
+
+Revision ID: a3c9e1f27b84
+Revises: e7f05a4d91c6
+Create Date: 2026-10-19 18:42:10.215304
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c9e1f27b84"
+down_revision: Union[str, Sequence[str], None] = "e7f05a4d91c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "menu_images",
+        sa.Column("variants", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("menu_images", "variants")
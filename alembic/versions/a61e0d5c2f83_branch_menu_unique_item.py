@@ -0,0 +1,45 @@
+"""branch menu unique item
+
+Revision ID: a61e0d5c2f83
+Revises: 3f7d2b9c6e14
+Create Date: 2026-10-19 12:21:09.804113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a61e0d5c2f83"
+down_revision: Union[str, Sequence[str], None] = "3f7d2b9c6e14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the most recent row of any duplicated (branch, item) pair
+    op.execute(
+        """
+        DELETE FROM company_branches_menus a
+        USING company_branches_menus b
+        WHERE a.company_branch_id = b.company_branch_id
+          AND a.menu_item_id = b.menu_item_id
+          AND a.id < b.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_company_branches_menus_branch_item",
+        "company_branches_menus",
+        ["company_branch_id", "menu_item_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "uq_company_branches_menus_branch_item",
+        "company_branches_menus",
+        type_="unique",
+    )
@@ -0,0 +1,42 @@
+"""menu image status
+
+Revision ID: b9e4c2d71a05
+Revises: 5d2e8b7c1f90
+Create Date: 2026-10-19 22:31:04.882173
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b9e4c2d71a05"
+down_revision: Union[str, Sequence[str], None] = "5d2e8b7c1f90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "menu_images",
+        sa.Column(
+            "status", sa.String(length=20), server_default="ready", nullable=False
+        ),
+    )
+    op.add_column(
+        "menu_images", sa.Column("job_id", sa.String(length=32), nullable=True)
+    )
+    op.create_unique_constraint(
+        op.f("uq_menu_images_job_id"), "menu_images", ["job_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f("uq_menu_images_job_id"), "menu_images", type_="unique")
+    op.drop_column("menu_images", "job_id")
+    op.drop_column("menu_images", "status")
@@ -0,0 +1,44 @@
+"""menu item template id
+
+Revision ID: c4b81f3e7a52
+Revises: a61e0d5c2f83
+Create Date: 2026-10-19 13:37:52.160472
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4b81f3e7a52"
+down_revision: Union[str, Sequence[str], None] = "a61e0d5c2f83"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("menu_items", sa.Column("template_id", sa.Integer(), nullable=True))
+    op.create_index(
+        op.f("ix_menu_items_template_id"), "menu_items", ["template_id"], unique=False
+    )
+    op.create_foreign_key(
+        op.f("fk_menu_items_template_id_menu_items"),
+        "menu_items",
+        "menu_items",
+        ["template_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        op.f("fk_menu_items_template_id_menu_items"), "menu_items", type_="foreignkey"
+    )
+    op.drop_index(op.f("ix_menu_items_template_id"), table_name="menu_items")
+    op.drop_column("menu_items", "template_id")
@@ -0,0 +1,56 @@
+"""menu item search vector
+
+Revision ID: e7f05a4d91c6
+Revises: c4b81f3e7a52
+Create Date: 2026-10-19 15:08:33.927415
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7f05a4d91c6"
+down_revision: Union[str, Sequence[str], None] = "c4b81f3e7a52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "menu_items",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_menu_items_search_vector",
+        "menu_items",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_menu_items_search_vector",
+        table_name="menu_items",
+        postgresql_using="gin",
+    )
+    op.drop_column("menu_items", "search_vector")
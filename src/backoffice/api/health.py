@@ -1,11 +1,10 @@
-import asyncio
-
 from fastapi import APIRouter, HTTPException, status
 from sqlalchemy import text
 
 from src.backoffice.core.config import kafka_settings, s3_settings
 from src.backoffice.core.dependencies.database import engine
 from src.backoffice.core.services.kafka_client import kafka_client
+from src.backoffice.core.services.metrics import metrics
 from src.backoffice.core.services.s3_client import s3_client
 
 router = APIRouter(prefix="/health", tags=["health"])
@@ -16,6 +15,12 @@ async def liveness():
     return {"status": "ok"}
 
 
+@router.get("/metrics")
+async def process_metrics():
+    """Counters of this worker since start, e.g. URL cache hits"""
+    return metrics.snapshot()
+
+
 @router.get("/ready")
 async def readiness():
     checks = {
@@ -36,11 +41,7 @@ async def readiness():
 
     if s3_settings.endpoint_url:
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: s3_client.s3_client.head_bucket(Bucket=s3_client.bucket_name),
-            )
+            await s3_client.head_bucket()
             checks["s3"] = True
         except Exception as e:
             checks["s3"] = False
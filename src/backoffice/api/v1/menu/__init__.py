@@ -1,3 +1,5 @@
+from .branch_menu_router import router as branch_menu_router
+from .menu_events_router import router as menu_events_router
 from .menu_item_router import router as menu_item_router
 
-__all__ = ("menu_item_router",)
+__all__ = ("menu_item_router", "menu_events_router", "branch_menu_router")
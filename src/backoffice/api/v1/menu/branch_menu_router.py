@@ -0,0 +1,91 @@
+from fastapi import APIRouter
+
+from src.backoffice.apps.menu.schemas.branch_menu import (
+    PriceMatrixResponse,
+    PriceMatrixUpdate,
+    PriceMatrixUpdateResponse,
+    StopListResponse,
+    StopListUpdate,
+)
+from src.backoffice.core.dependencies import AuthenticatedUserDep, MenuApplicationDep
+
+router = APIRouter(prefix="/menu", tags=["branch-menu"])
+
+
+@router.get("/branches/{branch_id}/stop-list", response_model=StopListResponse)
+async def get_branch_stop_list(
+    branch_id: int,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+):
+    """
+    Get menu items currently unavailable in a branch
+
+    - **branch_id**: Company branch ID
+    """
+    return await application.get_branch_stop_list(
+        company_branch_id=branch_id,
+        user_id=request_user.id,
+    )
+
+
+@router.patch("/branches/{branch_id}/stop-list", response_model=StopListResponse)
+async def update_branch_stop_list(
+    branch_id: int,
+    payload: StopListUpdate,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+):
+    """
+    Toggle availability of many branch menu items at once
+
+    Repeated toggles of an item within the batch collapse into the latest one.
+    A toggle older than the one already applied (e.g. from another device) is
+    ignored, the response holds the resulting state of every toggled item.
+
+    - **branch_id**: Company branch ID
+    - **toggles**: Availability toggles, optionally with the device `changed_at`
+    """
+    return await application.update_branch_stop_list(
+        company_branch_id=branch_id,
+        stop_list_data=payload,
+        user_id=request_user.id,
+    )
+
+
+@router.get("/price-matrix", response_model=PriceMatrixResponse)
+async def get_price_matrix(
+    company_subdomain: str,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+):
+    """
+    Get company menu prices as an items by branches matrix
+
+    - **company_subdomain**: Company subdomain
+    """
+    return await application.get_price_matrix(
+        company_subdomain=company_subdomain,
+        user_id=request_user.id,
+    )
+
+
+@router.put("/price-matrix", response_model=PriceMatrixUpdateResponse)
+async def update_price_matrix(
+    payload: PriceMatrixUpdate,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+):
+    """
+    Set many branch prices at once
+
+    Cells for items not yet on a branch menu add them to it. Invalid cells are
+    reported in `errors` by their position and do not block the valid ones.
+
+    - **company_subdomain**: Company subdomain
+    - **cells**: (company_branch_id, menu_item_id, price) cells
+    """
+    return await application.update_price_matrix(
+        price_matrix_data=payload,
+        user_id=request_user.id,
+    )
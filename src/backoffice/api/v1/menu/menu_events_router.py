@@ -0,0 +1,42 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+
+from src.backoffice.apps.menu.application import MenuApplication
+from src.backoffice.core.dependencies import SessionFactoryDep, get_authenticated_user
+
+router = APIRouter(prefix="/menu", tags=["menu-events"])
+
+
+@router.get(
+    "/branches/{branch_id}/events",
+    response_class=StreamingResponse,
+    summary="Stream branch menu changes",
+)
+async def stream_branch_menu_events(
+    branch_id: int,
+    request: Request,
+    session_factory: SessionFactoryDep,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Server-sent events stream of menu and availability changes for a branch
+
+    - **branch_id**: Company branch ID
+    - **Last-Event-ID**: Resume after this event (sent by EventSource on reconnect)
+    """
+    # Checked in a session closed before streaming starts, a request session
+    # would hold its connection for as long as the client stays connected
+    async with session_factory() as session:
+        request_user = await get_authenticated_user(request, session)
+        stream = await MenuApplication(session).stream_branch_events(
+            company_branch_id=branch_id,
+            user_id=request_user.id,
+            last_event_id=last_event_id,
+        )
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
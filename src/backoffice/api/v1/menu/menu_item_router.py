@@ -1,10 +1,29 @@
-from fastapi import APIRouter, File, Form, UploadFile, status
+from datetime import datetime
+from typing import List, Optional
 
+from fastapi import APIRouter, File, Form, Header, Query, Request, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.backoffice.apps.menu.schemas.menu_analytics import MenuAnalyticsResponse
+from src.backoffice.apps.menu.schemas.menu_facets import MenuFacetsResponse
+from src.backoffice.apps.menu.schemas.menu_image import MenuImageJobResponse
+from src.backoffice.apps.menu.schemas.menu_import import MenuImportResponse
 from src.backoffice.apps.menu.schemas.menu_item import (
     MenuItemCreate,
     MenuItemResponse,
     MenuItemUpdate,
 )
+from src.backoffice.apps.menu.schemas.menu_search import MenuSearchResponse
+from src.backoffice.apps.menu.schemas.menu_sync import MenuChangesResponse
+from src.backoffice.apps.menu.schemas.menu_template import (
+    MenuTemplateCloneRequest,
+    MenuTemplateCloneResponse,
+)
+from src.backoffice.apps.menu.services import (
+    MenuExportFormat,
+    MenuFacet,
+    MenuImportFormat,
+)
 from src.backoffice.core.dependencies import AuthenticatedUserDep, MenuApplicationDep
 
 router = APIRouter(prefix="/menu", tags=["menu-items"])
@@ -24,20 +43,279 @@ async def get_company_menu_items(
     company_subdomain: str,
     request_user: AuthenticatedUserDep,
     application: MenuApplicationDep,
+    accept: Optional[str] = Header(None),
 ):
+    """
+    Menu items of a company
+
+    - **Accept**: image types listed explicitly (image/avif, image/webp) pick
+      the format of the image `srcset`, `sources` always lists every format
+    """
     return await application.get_company_menu_items(
         company_subdomain=company_subdomain,
         user_id=request_user.id,
+        accept=accept,
+    )
+
+
+@router.post(
+    "/templates/clone",
+    response_model=MenuTemplateCloneResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def clone_menu_templates(
+    payload: MenuTemplateCloneRequest,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+):
+    """
+    Copy menu templates into a company menu
+
+    - **company_subdomain**: Company subdomain
+    - **template_slugs**: Templates to copy
+    - **category_slug**: Copy all templates of the category subtree
+    - **branch_ids**: Branches to put the copies on, with **price**
+    """
+    return await application.clone_menu_templates(payload, request_user.id)
+
+
+@router.post("/import", response_model=MenuImportResponse)
+async def import_menu_items(
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+    file: UploadFile = File(..., description="CSV or NDJSON file"),
+    company_subdomain: str = Form(..., description="Company subdomain"),
+    format: Optional[MenuImportFormat] = Form(
+        None, description="File format, guessed from the file name when omitted"
+    ),
+    dry_run: bool = Form(False, description="Validate without creating items"),
+):
+    """
+    Import menu items from a file
+
+    One item per CSV row or NDJSON line, with the `MenuItemCreate` fields:
+    name, description, category_slug, grams, kilocalories, proteins, fats,
+    carbohydrated. Invalid rows are skipped and listed in the report.
+
+    - **file**: CSV with a header row, or NDJSON
+    - **company_subdomain**: Company subdomain
+    - **format**: csv or ndjson
+    - **dry_run**: Only validate the file
+    """
+    return await application.import_menu_items(
+        company_subdomain=company_subdomain,
+        file=file,
+        user_id=request_user.id,
+        import_format=format,
+        dry_run=dry_run,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse, summary="Export company menu")
+async def export_menu_items(
+    company_subdomain: str,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+    format: MenuExportFormat = Query(MenuExportFormat.CSV, description="File format"),
+):
+    """
+    Stream the company menu as CSV or NDJSON
+
+    The columns are accepted by `POST /menu/import`.
+
+    - **company_subdomain**: Company subdomain
+    - **format**: csv or ndjson
+    """
+    stream = await application.export_menu_items(
+        company_subdomain=company_subdomain,
+        user_id=request_user.id,
+        export_format=format,
+    )
+    filename = f"menu-{company_subdomain}.{format.value}"
+    return StreamingResponse(
+        stream,
+        media_type=format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/analytics", response_model=MenuAnalyticsResponse)
+async def get_menu_analytics(
+    company_subdomain: str,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+    company_branch_id: Optional[int] = Query(
+        None, description="Only items on this branch menu"
+    ),
+):
+    """
+    Nutrition analytics of the company menu
+
+    Distributions of grams and nutrients per item and per 100 grams,
+    averages by category and dishes far off the rest of the menu.
+    Results are cached until the menu changes.
+
+    - **company_subdomain**: Company subdomain
+    - **company_branch_id**: Branch ID, the whole company menu if omitted
+    """
+    return await application.get_menu_analytics(
+        company_subdomain=company_subdomain,
+        user_id=request_user.id,
+        company_branch_id=company_branch_id,
     )
 
 
+@router.get("/facets", response_model=MenuFacetsResponse)
+async def get_menu_facets(
+    company_subdomain: str,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+    facet: List[MenuFacet] = Query(
+        list(MenuFacet), description="Facets to count, all when omitted"
+    ),
+    company_branch_id: Optional[int] = Query(
+        None, description="Only items on this branch menu"
+    ),
+    category_slug: Optional[str] = Query(None, description="Only in this category"),
+    calories: Optional[str] = Query(
+        None, description="Only in this kilocalorie bucket, e.g. 200-399"
+    ),
+    has_image: Optional[bool] = Query(None, description="Only items with images"),
+):
+    """
+    Item counts by category, kilocalorie bucket and image presence
+
+    All requested facets are counted in a single query. A facet ignores its
+    own filter, so the counts of the other values stay visible. Results are
+    cached until the menu changes.
+
+    - **company_subdomain**: Company subdomain
+    - **facet**: category, calories or has_image, may be repeated
+    """
+    return await application.get_menu_facets(
+        company_subdomain=company_subdomain,
+        user_id=request_user.id,
+        facets=facet,
+        company_branch_id=company_branch_id,
+        category_slug=category_slug,
+        calories=calories,
+        has_image=has_image,
+    )
+
+
+@router.get("/search", response_model=MenuSearchResponse)
+async def search_menu_items(
+    company_subdomain: str,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    category_slug: Optional[str] = Query(None, description="Only in this category"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Full-text search over company menu item names and descriptions
+
+    Every word matches as a prefix, so partial input works for typeahead.
+    Facets count matches per category regardless of **category_slug**.
+
+    - **company_subdomain**: Company subdomain
+    - **q**: Search query
+    - **category_slug**: Narrow the hits to a category
+    """
+    return await application.search_menu_items(
+        company_subdomain=company_subdomain,
+        user_id=request_user.id,
+        query=q,
+        category_slug=category_slug,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.get("/changes", response_model=MenuChangesResponse)
+async def get_menu_changes(
+    company_subdomain: str,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+    since: Optional[datetime] = Query(
+        None, description="Watermark returned by the previous sync"
+    ),
+    branch_id: Optional[int] = Query(None, description="Company branch ID"),
+):
+    """
+    Get menu changes since a watermark
+
+    - **company_subdomain**: Company subdomain
+    - **since**: Watermark from the previous response, omit for a full snapshot
+    - **branch_id**: Limit to the branch menu and include price and availability
+    """
+    return await application.get_menu_changes(
+        company_subdomain=company_subdomain,
+        user_id=request_user.id,
+        since=since,
+        company_branch_id=branch_id,
+    )
+
+
+@router.get(
+    "/images/{image_id}",
+    response_class=StreamingResponse,
+    summary="Menu image resized on request",
+)
+async def get_resized_menu_image(
+    image_id: int,
+    application: MenuApplicationDep,
+    width: int = Query(..., description="Width in pixels, one of RESIZE_WIDTHS"),
+    format: Optional[str] = Query(
+        None, description="jpeg, webp or avif, negotiated from Accept when omitted"
+    ),
+    accept: Optional[str] = Header(None),
+):
+    """
+    Image at a whitelisted width (never upscaled) in a stored thumbnail format,
+    suitable for `<img src>`: no authentication, cached for a year
+
+    - **image_id**: Image ID
+    - **width**: Width in pixels
+    - **format**: Image format
+    """
+    resized = await application.get_resized_image(
+        image_id=image_id, width=width, image_format=format, accept=accept
+    )
+    headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Content-Length": str(len(resized.content)),
+    }
+    if format is None:
+        headers["Vary"] = "Accept"
+    return StreamingResponse(
+        resized.chunks(), media_type=resized.mime_type, headers=headers
+    )
+
+
+@router.get("/images/jobs/{job_id}", response_model=MenuImageJobResponse)
+async def get_menu_image_job(
+    job_id: str,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+):
+    """
+    Status of a background image upload
+
+    - **job_id**: Job ID returned by the upload
+    """
+    return await application.get_image_job(job_id, request_user.id)
+
+
 @router.get("/{slug}", response_model=MenuItemResponse)
 async def get_menu_item(
     slug: str,
     request_user: AuthenticatedUserDep,
     application: MenuApplicationDep,
+    accept: Optional[str] = Header(None),
 ):
-    return await application.get_menu_item_by_slug(slug, request_user.id)
+    return await application.get_menu_item_by_slug(slug, request_user.id, accept)
 
 
 @router.patch("/{slug}", response_model=MenuItemResponse)
@@ -59,15 +337,21 @@ async def delete_menu_item(
     await application.delete_menu_item(slug, request_user.id)
 
 
-@router.post("/{slug}/images", response_model=MenuItemResponse)
+@router.post(
+    "/{slug}/images",
+    response_model=MenuItemResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": MenuImageJobResponse}},
+)
 async def add_image_to_menu_item(
     slug: str,
+    request: Request,
     request_user: AuthenticatedUserDep,
     application: MenuApplicationDep,
     file: UploadFile = File(..., description="Image file"),  # TODO вынести
     alt_text: str = Form(..., description="Alternative text"),
     is_primary: bool = Form(..., description="Is it the main image"),
     display_order: int = Form(..., description="Display order"),
+    background: bool = Form(False, description="Render the sizes in the background"),
 ):
     """
     Add an image to a menu item
@@ -77,7 +361,28 @@ async def add_image_to_menu_item(
     - **alt_text**: Alternative text for the image
     - **is_primary**: Set as the primary image
     - **display_order**: Display order (0 - first)
+    - **background**: Store the original only and respond 202 with a job to
+      poll at /menu/images/jobs/{job_id}; `menu_image.processed` is published
+      on the company channel when it is done
     """
+    if background:
+        job = await application.enqueue_image_for_menu_item(
+            menu_item_slug=slug,
+            file=file,
+            user_id=request_user.id,
+            alt_text=alt_text,
+            is_primary=is_primary,
+            display_order=display_order,
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=job.model_dump(),
+            headers={
+                "Location": str(
+                    request.url_for("get_menu_image_job", job_id=job.job_id)
+                )
+            },
+        )
     return await application.add_image_to_menu_item(
         menu_item_slug=slug,
         file=file,
@@ -88,6 +393,40 @@ async def add_image_to_menu_item(
     )
 
 
+@router.post("/{slug}/images/batch", response_model=MenuItemResponse)
+async def add_images_to_menu_item(
+    slug: str,
+    request_user: AuthenticatedUserDep,
+    application: MenuApplicationDep,
+    files: List[UploadFile] = File(..., description="Image files"),
+    alt_texts: Optional[List[str]] = Form(
+        None, description="Alternative text of each file, in the same order"
+    ),
+    primary_index: Optional[int] = Form(
+        None, description="Index of the file to set as the primary image"
+    ),
+    display_order: int = Form(0, description="Display order of the first file"),
+):
+    """
+    Add several images to a menu item in one request
+
+    - **slug**: Menu item slug
+    - **files**: Image files (jpg, png, gif, webp, bmp, svg), up to
+      BATCH_UPLOAD_MAX_FILES
+    - **alt_texts**: Alternative texts, one per file when given
+    - **primary_index**: Set this file as the primary image
+    - **display_order**: Display order of the first file, the next ones follow
+    """
+    return await application.add_images_to_menu_item(
+        menu_item_slug=slug,
+        files=files,
+        user_id=request_user.id,
+        alt_texts=alt_texts,
+        primary_index=primary_index,
+        display_order=display_order,
+    )
+
+
 @router.delete("/{slug}/images/{image_id}", response_model=MenuItemResponse)
 async def remove_image_from_menu_item(
     slug: str,
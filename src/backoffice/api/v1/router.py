@@ -4,8 +4,13 @@ from src.backoffice.api.v1.auth import auth_router
 from src.backoffice.api.v1.company import company_branch_router, company_router
 
 # from src.backoffice.api.v1.location import geocoding_router, location_router
-from src.backoffice.api.v1.menu import menu_item_router
+from src.backoffice.api.v1.menu import (
+    branch_menu_router,
+    menu_events_router,
+    menu_item_router,
+)
 from src.backoffice.api.v1.qr_manager import qr_code_router
+from src.backoffice.api.v1.search import search_router
 
 api_router = APIRouter()
 
@@ -17,6 +22,8 @@ api_router.include_router(auth_router)
 # api_router.include_router(location_router, prefix="/location")
 
 # Menu routes
+api_router.include_router(menu_events_router)
+api_router.include_router(branch_menu_router)
 api_router.include_router(menu_item_router)
 
 # Company routes
@@ -26,4 +33,7 @@ api_router.include_router(company_branch_router)
 # QR Code routes
 api_router.include_router(qr_code_router)
 
+# Search routes
+api_router.include_router(search_router)
+
 __all__ = ("api_router",)
@@ -0,0 +1,70 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+from src.backoffice.apps.search.schemas import (
+    BranchSearchResponse,
+    LocationKind,
+    LocationSearchResponse,
+    MenuItemSearchResponse,
+)
+from src.backoffice.core.dependencies import AuthenticatedUserDep, SearchApplicationDep
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/menu", response_model=MenuItemSearchResponse)
+async def search_menu_items(
+    company_subdomain: str,
+    request_user: AuthenticatedUserDep,
+    application: SearchApplicationDep,
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    category_slug: Optional[str] = Query(None, description="Only in this category"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Search company menu items in the search index
+
+    - **company_subdomain**: Company subdomain
+    - **q**: Search query, the last word may be incomplete
+    """
+    return await application.search_menu_items(
+        company_subdomain=company_subdomain,
+        user_id=request_user.id,
+        query=q,
+        category_slug=category_slug,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.get("/branches", response_model=BranchSearchResponse)
+async def search_branches(
+    request_user: AuthenticatedUserDep,
+    application: SearchApplicationDep,
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    company_subdomain: Optional[str] = Query(None, description="Only this company"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Search active company branches by name, company and address
+    """
+    return await application.search_branches(
+        query=q, company_subdomain=company_subdomain, limit=limit, offset=offset
+    )
+
+
+@router.get("/locations", response_model=LocationSearchResponse)
+async def search_locations(
+    request_user: AuthenticatedUserDep,
+    application: SearchApplicationDep,
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    kind: Optional[LocationKind] = Query(None, description="Location type"),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Search countries, regions and cities
+    """
+    return await application.search_locations(query=q, kind=kind, limit=limit)
@@ -3,8 +3,10 @@ from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backoffice.apps.account.services import UserService
+from src.backoffice.apps.company.events import CompanyEventType, company_channel
 from src.backoffice.apps.company.models import Company, CompanyBranch
 from src.backoffice.apps.company.models.types import CompanyRole
+from src.backoffice.apps.company.repositories import CompanyBranchRow, CompanyShortRow
 from src.backoffice.apps.company.schemas import (
     CompanyBranchCreate,
     CompanyBranchUpdate,
@@ -26,6 +28,7 @@ from src.backoffice.core.access.permissions import (
     CompanyBranchPermission,
     check_branch_permission,
 )
+from src.backoffice.core.services.event_bus import event_bus
 
 
 class CompanyApplication:
@@ -52,8 +55,10 @@ class CompanyApplication:
 
         return company
 
-    async def get_accessible_companies_for_user(self, user_id: int) -> List[Company]:
-        return await self.company_service.get_accessible_companies_for_user(user_id)
+    async def get_accessible_companies_for_user(
+        self, user_id: int
+    ) -> List[CompanyShortRow]:
+        return await self.company_service.list_accessible_company_rows(user_id)
 
     # Company Branch methods
     async def create_branch(
@@ -71,6 +76,7 @@ class CompanyApplication:
         await self.qr_code_service.create_qr_code_for_branch(branch.id)
 
         await self.session.commit()
+        await self._publish_branch_event(CompanyEventType.BRANCH_CREATED, branch)
         return branch
 
     async def get_branch_by_id(self, branch_id: int, user_id: int) -> CompanyBranch:
@@ -85,14 +91,14 @@ class CompanyApplication:
 
     async def get_branches_by_company(
         self, company_id: int, user_id: int
-    ) -> List[CompanyBranch]:
+    ) -> List[CompanyBranchRow]:
         await self.access_control.check_company_permission(
             company_id=company_id,
             user_id=user_id,
             permission=CompanyBranchPermission.READ,
             permission_checker=check_branch_permission,
         )
-        return await self.company_branch_service.get_branches_by_company(company_id)
+        return await self.company_branch_service.list_branch_rows_by_company(company_id)
 
     async def update_branch(
         self, branch_id: int, branch_data: CompanyBranchUpdate, user_id: int
@@ -108,6 +114,9 @@ class CompanyApplication:
             branch_id, branch_data
         )
         await self.session.commit()
+        await self._publish_branch_event(
+            CompanyEventType.BRANCH_UPDATED, updated_branch
+        )
         return updated_branch
 
     async def delete_branch(self, branch_id: int, user_id: int) -> None:
@@ -120,6 +129,7 @@ class CompanyApplication:
         )
         await self.company_branch_service.delete_branch_or_raise(branch_id)
         await self.session.commit()
+        await self._publish_branch_event(CompanyEventType.BRANCH_DELETED, branch)
 
     # Company Member methods
     async def add_member_by_email(
@@ -179,3 +189,11 @@ class CompanyApplication:
         )
         await self.session.commit()
         return CompanyMemberResponse.model_validate(member)
+
+    @staticmethod
+    async def _publish_branch_event(
+        event_type: CompanyEventType, branch: CompanyBranch
+    ) -> None:
+        await event_bus.publish(
+            company_channel(branch.company_id), event_type.value, {"id": branch.id}
+        )
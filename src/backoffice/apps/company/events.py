@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class CompanyEventType(str, Enum):
+    BRANCH_CREATED = "company_branch.created"
+    BRANCH_UPDATED = "company_branch.updated"
+    BRANCH_DELETED = "company_branch.deleted"
+
+
+def company_channel(company_id: int) -> str:
+    return f"company:{company_id}"
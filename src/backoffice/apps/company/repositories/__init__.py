@@ -1,9 +1,12 @@
 from .company_branch_repository import CompanyBranchRepository
 from .company_member_repository import CompanyMemberRepository
 from .company_repository import CompanyRepository
+from .projections import CompanyBranchRow, CompanyShortRow
 
 __all__ = (
     "CompanyRepository",
     "CompanyMemberRepository",
     "CompanyBranchRepository",
+    "CompanyShortRow",
+    "CompanyBranchRow",
 )
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backoffice.apps.company.models import Company, CompanyMember
+from src.backoffice.apps.company.repositories.projections import CompanyShortRow
 from src.backoffice.core.repositories import BaseRepository
 
 
@@ -33,3 +34,12 @@ class CompanyRepository(BaseRepository[Company]):
         )
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
+
+    async def select_user_company_rows(self, user_id: int) -> List[CompanyShortRow]:
+        stmt = (
+            select(*(getattr(Company, name) for name in CompanyShortRow._fields))
+            .join(CompanyMember, Company.id == CompanyMember.company_id)
+            .where(CompanyMember.user_id == user_id)
+        )
+        result = await self.session.execute(stmt)
+        return [CompanyShortRow._make(row) for row in result]
@@ -0,0 +1,21 @@
+from typing import NamedTuple, Optional
+
+
+class CompanyShortRow(NamedTuple):
+    name: str
+    description: Optional[str]
+    subdomain: str
+
+
+class CompanyBranchRow(NamedTuple):
+    name: str
+    description: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    address_id: Optional[int]
+    phone: Optional[str]
+    email: Optional[str]
+    external_id: Optional[str]
+    company_id: int
+    is_active: bool
+    is_verified: bool
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.backoffice.apps.company.models import CompanyBranch
 from src.backoffice.apps.company.repositories import (
     CompanyBranchRepository,
+    CompanyBranchRow,
     CompanyRepository,
 )
 from src.backoffice.apps.company.schemas import CompanyBranchCreate, CompanyBranchUpdate
@@ -29,6 +30,13 @@ class CompanyBranchService:
     async def get_branches_by_company(self, company_id: int) -> List[CompanyBranch]:
         return await self.repository.get_all(filters={"company_id": company_id})
 
+    async def list_branch_rows_by_company(
+        self, company_id: int
+    ) -> List[CompanyBranchRow]:
+        return await self.repository.get_rows(
+            CompanyBranchRow, filters={"company_id": company_id}
+        )
+
     async def update_branch_or_raise(
         self, branch_id: int, branch_data: CompanyBranchUpdate
     ) -> CompanyBranch:
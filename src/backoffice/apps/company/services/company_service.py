@@ -3,7 +3,7 @@ from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backoffice.apps.company.models import Company
-from src.backoffice.apps.company.repositories import CompanyRepository
+from src.backoffice.apps.company.repositories import CompanyRepository, CompanyShortRow
 from src.backoffice.apps.company.schemas import CompanyCreate
 from src.backoffice.apps.site.services import SiteService
 from src.backoffice.core.exceptions import NotFoundError, SubdomainAlreadyTaken
@@ -36,6 +36,9 @@ class CompanyService:
     async def get_accessible_companies_for_user(self, user_id: int) -> List[Company]:
         return await self.repository.select_user_companies(user_id)
 
+    async def list_accessible_company_rows(self, user_id: int) -> List[CompanyShortRow]:
+        return await self.repository.select_user_company_rows(user_id)
+
     async def get_by_subdomain_or_raise(self, subdomain: str) -> Company:
         company = await self.repository.get_by_subdomain(subdomain)
         if not company:
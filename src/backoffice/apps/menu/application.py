@@ -1,17 +1,69 @@
-from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence
 
 from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backoffice.apps.company.services import CompanyService
-from src.backoffice.apps.menu.models import MenuItem
-from src.backoffice.apps.menu.schemas import MenuItemCreate, MenuItemUpdate
-from src.backoffice.apps.menu.services import MenuImageService, MenuItemService
+from src.backoffice.apps.company.services import CompanyBranchService, CompanyService
+from src.backoffice.apps.menu.events import (
+    MenuEventType,
+    branch_channel,
+    company_channel,
+)
+from src.backoffice.apps.menu.models import MenuImage, MenuImageStatus, MenuItem
+from src.backoffice.apps.menu.schemas import (
+    ClonedMenuItemResponse,
+    MenuAnalyticsResponse,
+    MenuChangesResponse,
+    MenuFacetsResponse,
+    MenuImageJobResponse,
+    MenuImportResponse,
+    MenuItemCreate,
+    MenuItemResponse,
+    MenuItemTombstoneResponse,
+    MenuItemUpdate,
+    MenuSearchFacetResponse,
+    MenuSearchHitResponse,
+    MenuSearchResponse,
+    MenuSyncItemResponse,
+    MenuTemplateCloneRequest,
+    MenuTemplateCloneResponse,
+    PriceMatrixBranch,
+    PriceMatrixResponse,
+    PriceMatrixUpdate,
+    PriceMatrixUpdateResponse,
+    StopListItemResponse,
+    StopListResponse,
+    StopListUpdate,
+)
+from src.backoffice.apps.menu.services import (
+    BranchMenuService,
+    MenuAnalyticsService,
+    MenuExportFormat,
+    MenuExportService,
+    MenuFacet,
+    MenuFacetService,
+    MenuImageResizeService,
+    MenuImageService,
+    MenuImportFormat,
+    MenuImportService,
+    MenuItemService,
+    MenuSearchService,
+    MenuSyncService,
+    ResizedImage,
+    iter_import_rows,
+    publish_image_job,
+)
+from src.backoffice.apps.menu.services.menu_image_service import image_paths, image_urls
 from src.backoffice.core.access.access_control import CompanyAccessControl
 from src.backoffice.core.access.permissions import (
     MenuItemPermission,
     check_menu_item_permission,
 )
+from src.backoffice.core.exceptions import NotFoundError
+from src.backoffice.core.services.event_bus import event_bus, sse_stream
+from src.backoffice.core.services.kafka_client import message_broker
 from src.backoffice.core.services.s3_client import s3_client
 
 
@@ -20,10 +72,21 @@ class MenuApplication:
         self.session = session
         self.menu_item_service = MenuItemService(session)
         self.menu_image_service = MenuImageService(session)
+        self.menu_image_resize_service = MenuImageResizeService(session)
+        self.menu_sync_service = MenuSyncService(session)
+        self.branch_menu_service = BranchMenuService(session)
+        self.menu_import_service = MenuImportService(session)
+        self.menu_export_service = MenuExportService(session)
+        self.menu_search_service = MenuSearchService(session)
+        self.menu_analytics_service = MenuAnalyticsService(session)
+        self.menu_facet_service = MenuFacetService(session)
         self.company_service = CompanyService(session)
+        self.company_branch_service = CompanyBranchService(session)
         self.access_control = CompanyAccessControl(session)
 
-    async def get_menu_item_by_slug(self, slug: str, user_id: int) -> MenuItem:
+    async def get_menu_item_by_slug(
+        self, slug: str, user_id: int, accept: Optional[str] = None
+    ) -> MenuItem:
         menu_item = await self.menu_item_service.get_by_slug_with_relations_or_raise(
             slug
         )
@@ -33,14 +96,63 @@ class MenuApplication:
             permission=MenuItemPermission.READ,
             permission_checker=check_menu_item_permission,
         )
-        await self._add_urls_to_images(menu_item)
+        await self._add_urls_to_images(menu_item, accept=accept)
         return menu_item
 
     async def get_company_menu_items(
         self,
         company_subdomain: str,
         user_id: int,
-    ) -> List[MenuItem]:
+        accept: Optional[str] = None,
+    ) -> List[MenuItemResponse]:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.READ,
+            permission_checker=check_menu_item_permission,
+        )
+        entries = await self.menu_item_service.list_by_company(company_id=company.id)
+        urls = await s3_client.get_urls(
+            path
+            for entry in entries
+            for image in entry.images
+            for path in image_paths(image.file_path, image.variants)
+        )
+        return [
+            MenuItemResponse(
+                name=entry.item.name,
+                description=entry.item.description,
+                grams=entry.item.grams,
+                kilocalories=entry.item.kilocalories,
+                proteins=entry.item.proteins,
+                fats=entry.item.fats,
+                carbohydrated=entry.item.carbohydrated,
+                slug=entry.item.slug,
+                breadcrumbs=entry.breadcrumbs,
+                images=[
+                    {
+                        "display_order": image.display_order,
+                        "is_primary": image.is_primary,
+                        **image_urls(image, urls, accept),
+                    }
+                    for image in entry.images
+                ],
+            )
+            for entry in entries
+        ]
+
+    async def search_menu_items(
+        self,
+        company_subdomain: str,
+        user_id: int,
+        query: str,
+        category_slug: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> MenuSearchResponse:
         company = await self.company_service.get_by_subdomain_or_raise(
             company_subdomain
         )
@@ -50,10 +162,120 @@ class MenuApplication:
             permission=MenuItemPermission.READ,
             permission_checker=check_menu_item_permission,
         )
-        menu_items = await self.menu_item_service.list_by_company(company_id=company.id)
-        for menu_item in menu_items:
-            await self._add_urls_to_images(menu_item)
-        return menu_items
+        result = await self.menu_search_service.search(
+            company_id=company.id,
+            query=query,
+            category_slug=category_slug,
+            limit=limit,
+            offset=offset,
+        )
+        return MenuSearchResponse(
+            hits=[MenuSearchHitResponse.model_validate(hit) for hit in result.hits],
+            facets=[
+                MenuSearchFacetResponse.model_validate(facet) for facet in result.facets
+            ],
+            total=result.total,
+        )
+
+    async def get_menu_analytics(
+        self,
+        company_subdomain: str,
+        user_id: int,
+        company_branch_id: Optional[int] = None,
+    ) -> MenuAnalyticsResponse:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.READ,
+            permission_checker=check_menu_item_permission,
+        )
+        if company_branch_id is not None:
+            await self._get_company_branch_or_raise(company.id, company_branch_id)
+
+        analytics = await self.menu_analytics_service.get_analytics(
+            company_id=company.id, company_branch_id=company_branch_id
+        )
+        return MenuAnalyticsResponse.model_validate(analytics)
+
+    async def get_menu_facets(
+        self,
+        company_subdomain: str,
+        user_id: int,
+        facets: Sequence[MenuFacet] = tuple(MenuFacet),
+        company_branch_id: Optional[int] = None,
+        category_slug: Optional[str] = None,
+        calories: Optional[str] = None,
+        has_image: Optional[bool] = None,
+    ) -> MenuFacetsResponse:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.READ,
+            permission_checker=check_menu_item_permission,
+        )
+        if company_branch_id is not None:
+            await self._get_company_branch_or_raise(company.id, company_branch_id)
+
+        result = await self.menu_facet_service.get_facets(
+            company_id=company.id,
+            facets=facets,
+            company_branch_id=company_branch_id,
+            category_slug=category_slug,
+            calories=calories,
+            has_image=has_image,
+        )
+        return MenuFacetsResponse.model_validate(result)
+
+    async def get_menu_changes(
+        self,
+        company_subdomain: str,
+        user_id: int,
+        since: Optional[datetime] = None,
+        company_branch_id: Optional[int] = None,
+    ) -> MenuChangesResponse:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.READ,
+            permission_checker=check_menu_item_permission,
+        )
+        if company_branch_id is not None:
+            await self._get_company_branch_or_raise(company.id, company_branch_id)
+
+        change_set = await self.menu_sync_service.get_changes(
+            company_id=company.id,
+            since=since,
+            company_branch_id=company_branch_id,
+        )
+
+        await self._add_urls_to_images(*change_set.items)
+        upserted = []
+        for menu_item in change_set.items:
+            sync_item = MenuSyncItemResponse.model_validate(menu_item)
+            branch_menu = change_set.branch_menus.get(menu_item.id)
+            if branch_menu is not None:
+                sync_item.price = branch_menu.price
+                sync_item.available = branch_menu.available
+            upserted.append(sync_item)
+
+        return MenuChangesResponse(
+            upserted=upserted,
+            deleted=[
+                MenuItemTombstoneResponse.model_validate(tombstone)
+                for tombstone in change_set.tombstones
+            ],
+            watermark=change_set.watermark,
+            is_full_snapshot=since is None,
+        )
 
     async def create_menu_item(
         self, menu_item_data: MenuItemCreate, user_id: int
@@ -73,6 +295,7 @@ class MenuApplication:
         menu_item = await self.menu_item_service.get_by_id_with_relations_or_raise(
             menu_item.id
         )
+        await self._publish_item_event(MenuEventType.ITEM_CREATED, menu_item)
 
         await self._add_urls_to_images(menu_item)
         return menu_item
@@ -95,6 +318,7 @@ class MenuApplication:
         menu_item = await self.menu_item_service.get_by_slug_with_relations_or_raise(
             menu_item_slug
         )
+        await self._publish_item_event(MenuEventType.ITEM_UPDATED, menu_item)
         await self._add_urls_to_images(menu_item)
         return menu_item
 
@@ -108,6 +332,7 @@ class MenuApplication:
         )
         await self.menu_item_service.delete_by_slug_or_raise(menu_item_slug)
         await self.session.commit()
+        await self._publish_item_event(MenuEventType.ITEM_DELETED, menu_item)
 
     async def add_image_to_menu_item(
         self,
@@ -137,9 +362,91 @@ class MenuApplication:
         menu_item = await self.menu_item_service.get_by_slug_with_relations_or_raise(
             menu_item_slug
         )
+        await self._publish_item_event(MenuEventType.ITEM_UPDATED, menu_item)
+        await self._add_urls_to_images(menu_item)
+        return menu_item
+
+    async def add_images_to_menu_item(
+        self,
+        menu_item_slug: str,
+        files: Sequence[UploadFile],
+        user_id: int,
+        alt_texts: Optional[Sequence[Optional[str]]] = None,
+        primary_index: Optional[int] = None,
+        display_order: int = 0,
+    ) -> MenuItem:
+        menu_item = await self.menu_item_service.get_by_slug_or_raise(menu_item_slug)
+        await self.access_control.check_resource_permission(
+            resource_company_id=menu_item.owner_company_id,
+            user_id=user_id,
+            permission=MenuItemPermission.UPDATE,
+            permission_checker=check_menu_item_permission,
+        )
+
+        await self.menu_image_service.upload_images(
+            menu_item_id=menu_item.id,
+            files=files,
+            alt_texts=alt_texts,
+            primary_index=primary_index,
+            display_order=display_order,
+        )
+        await self.session.commit()
+        menu_item = await self.menu_item_service.get_by_slug_with_relations_or_raise(
+            menu_item_slug
+        )
+        await self._publish_item_event(MenuEventType.ITEM_UPDATED, menu_item)
         await self._add_urls_to_images(menu_item)
         return menu_item
 
+    async def enqueue_image_for_menu_item(
+        self,
+        menu_item_slug: str,
+        file: UploadFile,
+        user_id: int,
+        alt_text: Optional[str] = None,
+        is_primary: bool = False,
+        display_order: int = 0,
+    ) -> MenuImageJobResponse:
+        menu_item = await self.menu_item_service.get_by_slug_or_raise(menu_item_slug)
+        await self.access_control.check_resource_permission(
+            resource_company_id=menu_item.owner_company_id,
+            user_id=user_id,
+            permission=MenuItemPermission.UPDATE,
+            permission_checker=check_menu_item_permission,
+        )
+
+        image = await self.menu_image_service.upload_image(
+            menu_item_id=menu_item.id,
+            file=file,
+            alt_text=alt_text,
+            is_primary=is_primary,
+            display_order=display_order,
+            background=True,
+        )
+        await self.session.commit()
+        if image.status == MenuImageStatus.PROCESSING.value:
+            try:
+                await publish_image_job(message_broker, image)
+            except Exception:
+                image.status = MenuImageStatus.FAILED.value
+                await self.session.commit()
+                raise
+        await self._publish_item_event(MenuEventType.ITEM_UPDATED, menu_item)
+        return self._image_job_response(image, menu_item)
+
+    async def get_image_job(self, job_id: str, user_id: int) -> MenuImageJobResponse:
+        image = await self.menu_image_service.get_by_job_id_or_raise(job_id)
+        menu_item = await self.menu_item_service.get_by_id_with_relations_or_raise(
+            image.menu_item_id
+        )
+        await self.access_control.check_resource_permission(
+            resource_company_id=menu_item.owner_company_id,
+            user_id=user_id,
+            permission=MenuItemPermission.READ,
+            permission_checker=check_menu_item_permission,
+        )
+        return self._image_job_response(image, menu_item)
+
     async def remove_image_from_menu_item(
         self, menu_item_slug: str, image_id: int, user_id: int
     ) -> MenuItem:
@@ -156,6 +463,7 @@ class MenuApplication:
         menu_item = await self.menu_item_service.get_by_slug_with_relations_or_raise(
             menu_item_slug
         )
+        await self._publish_item_event(MenuEventType.ITEM_UPDATED, menu_item)
         await self._add_urls_to_images(menu_item)
         return menu_item
 
@@ -175,11 +483,293 @@ class MenuApplication:
         menu_item = await self.menu_item_service.get_by_slug_with_relations_or_raise(
             menu_item_slug
         )
+        await self._publish_item_event(MenuEventType.ITEM_UPDATED, menu_item)
         await self._add_urls_to_images(menu_item)
         return menu_item
 
+    async def clone_menu_templates(
+        self, clone_data: MenuTemplateCloneRequest, user_id: int
+    ) -> MenuTemplateCloneResponse:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            clone_data.company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.CREATE,
+            permission_checker=check_menu_item_permission,
+        )
+        branch_ids = sorted(set(clone_data.branch_ids))
+        if branch_ids:
+            branches = await self.company_branch_service.get_branches_by_company(
+                company.id
+            )
+            unknown_ids = set(branch_ids) - {branch.id for branch in branches}
+            if unknown_ids:
+                raise NotFoundError(
+                    f"Company branch with id {min(unknown_ids)} not found"
+                )
+
+        cloned = await self.menu_item_service.clone_templates(
+            company_id=company.id,
+            template_slugs=clone_data.template_slugs,
+            category_slug=clone_data.category_slug,
+        )
+        if cloned and branch_ids:
+            await self.branch_menu_service.add_items(
+                branch_ids, [item.id for item in cloned], clone_data.price
+            )
+        await self.session.commit()
+
+        if cloned:
+            await event_bus.publish(
+                company_channel(company.id),
+                MenuEventType.ITEMS_CLONED.value,
+                {"ids": [item.id for item in cloned]},
+            )
+        return MenuTemplateCloneResponse(
+            items=[ClonedMenuItemResponse.model_validate(item) for item in cloned]
+        )
+
+    async def import_menu_items(
+        self,
+        company_subdomain: str,
+        file: UploadFile,
+        user_id: int,
+        import_format: Optional[MenuImportFormat] = None,
+        dry_run: bool = False,
+    ) -> MenuImportResponse:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.CREATE,
+            permission_checker=check_menu_item_permission,
+        )
+        import_format = import_format or MenuImportFormat.from_filename(file.filename)
+        if import_format is None:
+            raise ValueError("Unsupported import format, expected csv or ndjson")
+
+        report = await self.menu_import_service.import_items(
+            company_id=company.id,
+            rows=iter_import_rows(file.file, import_format),
+            dry_run=dry_run,
+        )
+        if dry_run:
+            await self.session.rollback()
+        else:
+            await self.session.commit()
+            if report.imported:
+                await event_bus.publish(
+                    company_channel(company.id),
+                    MenuEventType.ITEMS_IMPORTED.value,
+                    {"company_id": company.id, "count": report.imported},
+                )
+
+        response = MenuImportResponse.model_validate(report)
+        response.dry_run = dry_run
+        return response
+
+    async def export_menu_items(
+        self,
+        company_subdomain: str,
+        user_id: int,
+        export_format: MenuExportFormat = MenuExportFormat.CSV,
+    ) -> AsyncIterator[str]:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.READ,
+            permission_checker=check_menu_item_permission,
+        )
+        return self.menu_export_service.export_items(company.id, export_format)
+
+    async def get_resized_image(
+        self,
+        image_id: int,
+        width: int,
+        image_format: Optional[str] = None,
+        accept: Optional[str] = None,
+    ) -> ResizedImage:
+        # Public like the stored objects themselves, no permission check
+        return await self.menu_image_resize_service.get_resized(
+            image_id, width, image_format, accept
+        )
+
+    async def get_branch_stop_list(
+        self, company_branch_id: int, user_id: int
+    ) -> StopListResponse:
+        await self._check_branch_permission(
+            company_branch_id, user_id, MenuItemPermission.READ
+        )
+        branch_menus = await self.branch_menu_service.get_stop_list(company_branch_id)
+        return StopListResponse(
+            items=[
+                StopListItemResponse.model_validate(branch_menu)
+                for branch_menu in branch_menus
+            ]
+        )
+
+    async def update_branch_stop_list(
+        self,
+        company_branch_id: int,
+        stop_list_data: StopListUpdate,
+        user_id: int,
+    ) -> StopListResponse:
+        await self._check_branch_permission(
+            company_branch_id, user_id, MenuItemPermission.UPDATE
+        )
+        branch_menus = await self.branch_menu_service.apply_stop_list(
+            company_branch_id, stop_list_data.toggles
+        )
+        await self.session.commit()
+
+        items = [
+            StopListItemResponse.model_validate(branch_menu)
+            for branch_menu in branch_menus
+        ]
+        found_ids = {item.menu_item_id for item in items}
+        missing_ids = sorted(
+            {toggle.menu_item_id for toggle in stop_list_data.toggles} - found_ids
+        )
+
+        # One event per batch, carrying the resulting state of every item
+        if items:
+            await event_bus.publish(
+                branch_channel(company_branch_id),
+                MenuEventType.STOP_LIST_UPDATED.value,
+                {
+                    "items": [
+                        {"menu_item_id": item.menu_item_id, "available": item.available}
+                        for item in items
+                    ]
+                },
+            )
+        return StopListResponse(items=items, missing_menu_item_ids=missing_ids)
+
+    async def get_price_matrix(
+        self, company_subdomain: str, user_id: int
+    ) -> PriceMatrixResponse:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.READ,
+            permission_checker=check_menu_item_permission,
+        )
+        branches = await self.company_branch_service.get_branches_by_company(company.id)
+        rows = await self.branch_menu_service.get_price_matrix(
+            company.id, [branch.id for branch in branches]
+        )
+        return PriceMatrixResponse(
+            branches=[PriceMatrixBranch.model_validate(branch) for branch in branches],
+            rows=rows,
+        )
+
+    async def update_price_matrix(
+        self, price_matrix_data: PriceMatrixUpdate, user_id: int
+    ) -> PriceMatrixUpdateResponse:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            price_matrix_data.company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.UPDATE,
+            permission_checker=check_menu_item_permission,
+        )
+        branches = await self.company_branch_service.get_branches_by_company(company.id)
+        applied, errors = await self.branch_menu_service.set_prices(
+            company_id=company.id,
+            company_branch_ids={branch.id for branch in branches},
+            cells=price_matrix_data.cells,
+        )
+        await self.session.commit()
+
+        # One event per affected branch rather than per cell
+        item_ids_by_branch: Dict[int, List[int]] = defaultdict(list)
+        for company_branch_id, menu_item_id, _ in applied:
+            item_ids_by_branch[company_branch_id].append(menu_item_id)
+        for company_branch_id, menu_item_ids in item_ids_by_branch.items():
+            await event_bus.publish(
+                branch_channel(company_branch_id),
+                MenuEventType.PRICES_UPDATED.value,
+                {"menu_item_ids": menu_item_ids},
+            )
+        return PriceMatrixUpdateResponse(applied=len(applied), errors=errors)
+
+    async def stream_branch_events(
+        self,
+        company_branch_id: int,
+        user_id: int,
+        last_event_id: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        branch = await self._check_branch_permission(
+            company_branch_id, user_id, MenuItemPermission.READ
+        )
+        subscription = await event_bus.subscribe(
+            [branch_channel(branch.id), company_channel(branch.company_id)],
+            last_event_id=last_event_id,
+        )
+        return sse_stream(subscription)
+
+    @staticmethod
+    async def _publish_item_event(
+        event_type: MenuEventType, menu_item: MenuItem
+    ) -> None:
+        if menu_item.owner_company_id is None:
+            return
+        await event_bus.publish(
+            company_channel(menu_item.owner_company_id),
+            event_type.value,
+            {"id": menu_item.id, "slug": menu_item.slug},
+        )
+
+    @staticmethod
+    def _image_job_response(
+        image: MenuImage, menu_item: MenuItem
+    ) -> MenuImageJobResponse:
+        return MenuImageJobResponse(
+            job_id=image.job_id,
+            status=image.status,
+            image_id=image.id,
+            menu_item_slug=menu_item.slug,
+        )
+
+    async def _check_branch_permission(
+        self,
+        company_branch_id: int,
+        user_id: int,
+        permission: MenuItemPermission,
+    ):
+        branch = await self.company_branch_service.get_branch_by_id_or_raise(
+            company_branch_id
+        )
+        await self.access_control.check_company_permission(
+            company_id=branch.company_id,
+            user_id=user_id,
+            permission=permission,
+            permission_checker=check_menu_item_permission,
+        )
+        return branch
+
+    async def _get_company_branch_or_raise(self, company_id: int, branch_id: int):
+        branch = await self.company_branch_service.get_branch_by_id_or_raise(branch_id)
+        if branch.company_id != company_id:
+            raise NotFoundError(f"Company branch with id {branch_id} not found")
+        return branch
+
     @staticmethod
-    async def _add_urls_to_images(menu_item: MenuItem) -> None:
-        if menu_item.images:
-            for image in menu_item.images:
-                image.url = await s3_client.get_presigned_url(image.file_path, 24)
+    async def _add_urls_to_images(
+        *menu_items: MenuItem, accept: Optional[str] = None
+    ) -> None:
+        images = [image for menu_item in menu_items for image in menu_item.images]
+        if images:
+            await MenuImageService.add_urls(images, accept)
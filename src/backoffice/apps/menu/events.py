@@ -0,0 +1,21 @@
+from enum import Enum
+
+from src.backoffice.apps.company.events import company_channel
+
+
+class MenuEventType(str, Enum):
+    ITEM_CREATED = "menu_item.created"
+    ITEM_UPDATED = "menu_item.updated"
+    ITEM_DELETED = "menu_item.deleted"
+    ITEMS_CLONED = "menu_item.cloned"
+    ITEMS_IMPORTED = "menu_item.imported"
+    STOP_LIST_UPDATED = "branch_menu.stop_list_updated"
+    PRICES_UPDATED = "branch_menu.prices_updated"
+    IMAGE_PROCESSED = "menu_image.processed"
+
+
+def branch_channel(company_branch_id: int) -> str:
+    return f"branch:{company_branch_id}"
+
+
+__all__ = ("MenuEventType", "company_channel", "branch_channel")
@@ -1,11 +1,14 @@
 from .category import Category
 from .company_branch_menu import CompanyBranchMenu
-from .menu_image import MenuImage
+from .menu_image import MenuImage, MenuImageStatus
 from .menu_item import MenuItem
+from .menu_item_tombstone import MenuItemTombstone
 
 __all__ = (
     "Category",
     "CompanyBranchMenu",
     "MenuImage",
+    "MenuImageStatus",
     "MenuItem",
+    "MenuItemTombstone",
 )
@@ -1,12 +1,14 @@
+from datetime import datetime
 from decimal import Decimal
+from typing import Optional
 
-from sqlalchemy import Boolean, ForeignKey, Numeric
+from sqlalchemy import Boolean, DateTime, ForeignKey, Numeric, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.backoffice.models import Base, IdMixin
+from src.backoffice.models import Base, CreatedUpdatedMixin, IdMixin
 
 
-class CompanyBranchMenu(Base, IdMixin):
+class CompanyBranchMenu(Base, IdMixin, CreatedUpdatedMixin):
     __tablename__ = "company_branches_menus"
 
     company_branch_id: Mapped[int] = mapped_column(
@@ -27,6 +29,11 @@ class CompanyBranchMenu(Base, IdMixin):
         default=True,
         nullable=False,
     )
+    # Device time of the last availability toggle, newer toggles win
+    available_changed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
 
     company_branch: Mapped["CompanyBranch"] = relationship(  # type: ignore
         back_populates="branch_menus",
@@ -34,3 +41,11 @@ class CompanyBranchMenu(Base, IdMixin):
     menu_item: Mapped["MenuItem"] = relationship(  # type: ignore
         back_populates="branch_menus",
     )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "company_branch_id",
+            "menu_item_id",
+            name="uq_company_branches_menus_branch_item",
+        ),
+    )
@@ -1,11 +1,20 @@
-from typing import Optional
+from enum import Enum as PyEnum
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.backoffice.models import Base, CreatedUpdatedMixin, IdMixin
 
 
+class MenuImageStatus(str, PyEnum):
+    # Variants are rendered by a worker, only the original is stored
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class MenuImage(Base, IdMixin, CreatedUpdatedMixin):
     __tablename__ = "menu_images"
     __repr_fields__ = ("filename", "menu_item_id", "is_primary")
@@ -15,8 +24,16 @@ class MenuImage(Base, IdMixin, CreatedUpdatedMixin):
     file_path: Mapped[str] = mapped_column(String(500), nullable=False)
     file_size: Mapped[int] = mapped_column(Integer, nullable=False)
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    # SHA-256 of the original, images with the same contents share its files
+    content_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     width: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     height: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Resized copies: size, width, height, file_path and file_size of each
+    variants: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(
+        JSONB, nullable=True
+    )
     alt_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     menu_item_id: Mapped[int] = mapped_column(
         ForeignKey("menu_items.id", ondelete="CASCADE"),
@@ -27,12 +44,31 @@ class MenuImage(Base, IdMixin, CreatedUpdatedMixin):
 
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_primary: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default=MenuImageStatus.READY.value,
+        server_default=MenuImageStatus.READY.value,
+        nullable=False,
+    )
+    # Background processing job, for status polling
+    job_id: Mapped[Optional[str]] = mapped_column(
+        String(32), nullable=True, unique=True
+    )
 
     # Relationships
     menu_item: Mapped["MenuItem"] = relationship(  # type: ignore
         back_populates="images", passive_deletes=True
     )
 
+    __table_args__ = (
+        # Pattern ops so that prefix LIKE lookups by file stem use the index
+        Index(
+            "ix_menu_images_file_path",
+            "file_path",
+            postgresql_ops={"file_path": "varchar_pattern_ops"},
+        ),
+    )
+
     @property
     def file_extension(self) -> str:
         return self.filename.split(".")[-1].lower() if "." in self.filename else ""
@@ -1,11 +1,19 @@
 from typing import Dict, List, Optional
 
-from sqlalchemy import (Boolean, CheckConstraint, ForeignKey, Index, Integer,
-                        String, Text)
+from sqlalchemy import (Boolean, CheckConstraint, Computed, ForeignKey, Index,
+                        Integer, String, Text)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.backoffice.models import Base, CreatedUpdatedMixin, IdMixin
 
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
 
 class MenuItem(Base, IdMixin, CreatedUpdatedMixin):
     __tablename__ = "menu_items"
@@ -34,6 +42,19 @@ class MenuItem(Base, IdMixin, CreatedUpdatedMixin):
         nullable=True,
         index=True,
     )
+    # Template the item was cloned from
+    template_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("menu_items.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
+    # Maintained by PostgreSQL, name outweighs description
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
+    )
 
     # Relationships
     category: Mapped["Category"] = relationship(  # type: ignore
@@ -63,6 +84,9 @@ class MenuItem(Base, IdMixin, CreatedUpdatedMixin):
             name="ck_menu_item_carbohydrated_pos",
         ),
         Index("ck_menu_item_category_slug", "category_id", "slug"),
+        Index(
+            "ix_menu_items_search_vector", "search_vector", postgresql_using="gin"
+        ),
         CheckConstraint(
             "(is_template = TRUE AND owner_company_id IS NULL) OR (is_template = FALSE AND owner_company_id IS NOT NULL)",
             name="ck_menu_item_template_owner_consistency",
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.backoffice.models import Base, IdMixin
+
+
+class MenuItemTombstone(Base, IdMixin):
+    """Marker left behind when a menu item disappears, used by delta sync"""
+
+    __tablename__ = "menu_item_tombstones"
+    __repr_fields__ = ("menu_item_id", "owner_company_id")
+
+    menu_item_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    slug: Mapped[str] = mapped_column(String(255), nullable=False)
+    owner_company_id: Mapped[int] = mapped_column(
+        ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_menu_item_tombstones_company_deleted_at",
+            "owner_company_id",
+            "deleted_at",
+        ),
+    )
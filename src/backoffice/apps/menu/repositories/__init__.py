@@ -1,9 +1,27 @@
 from .category_repository import CategoryRepository
+from .company_branch_menu_repository import CompanyBranchMenuRepository
 from .menu_image_repository import MenuImageRepository
 from .menu_item_repository import MenuItemRepository
+from .menu_item_tombstone_repository import MenuItemTombstoneRepository
+from .projections import (
+    CategoryRow,
+    FacetCountRow,
+    MenuImageRow,
+    MenuItemListEntry,
+    MenuItemRow,
+    NutritionRow,
+)
 
 __all__ = (
+    "CompanyBranchMenuRepository",
     "CategoryRepository",
     "MenuItemRepository",
     "MenuImageRepository",
+    "MenuItemTombstoneRepository",
+    "MenuItemRow",
+    "MenuImageRow",
+    "CategoryRow",
+    "MenuItemListEntry",
+    "NutritionRow",
+    "FacetCountRow",
 )
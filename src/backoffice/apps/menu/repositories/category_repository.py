@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backoffice.apps.menu.models import Category
+from src.backoffice.apps.menu.repositories.projections import CategoryRow
 from src.backoffice.core.repositories import BaseRepository
 
 
@@ -15,3 +16,42 @@ class CategoryRepository(BaseRepository[Category]):
         stmt = select(Category).where(Category.slug == slug)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
+
+    async def get_ids_by_slugs(self, slugs: Iterable[str]) -> Dict[str, int]:
+        result = await self.session.execute(
+            select(Category.slug, Category.id).where(Category.slug.in_(list(slugs)))
+        )
+        return {slug: category_id for slug, category_id in result.all()}
+
+    async def list_with_ancestors(
+        self, category_ids: Iterable[int]
+    ) -> List[CategoryRow]:
+        """The categories and all of their parents, as plain rows"""
+        ids = list(category_ids)
+        if not ids:
+            return []
+        chain = (
+            select(Category.id, Category.name, Category.slug, Category.parent_id)
+            .where(Category.id.in_(ids))
+            .cte("category_chain", recursive=True)
+        )
+        chain = chain.union(
+            select(Category.id, Category.name, Category.slug, Category.parent_id).where(
+                Category.id == chain.c.parent_id
+            )
+        )
+        result = await self.session.execute(select(chain))
+        return [CategoryRow._make(row) for row in result]
+
+    @staticmethod
+    def subtree_ids_query(category_id: int) -> Select:
+        """Ids of the category and all of its descendants, as a recursive CTE"""
+        subtree = (
+            select(Category.id)
+            .where(Category.id == category_id)
+            .cte("category_subtree", recursive=True)
+        )
+        subtree = subtree.union_all(
+            select(Category.id).where(Category.parent_id == subtree.c.id)
+        )
+        return select(subtree.c.id)
@@ -0,0 +1,190 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Integer,
+    Row,
+    and_,
+    bindparam,
+    column,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.models import CompanyBranchMenu, MenuItem
+from src.backoffice.core.repositories import BaseRepository
+
+AvailabilityChange = Tuple[bool, datetime]
+PriceCell = Tuple[int, int, Decimal]
+
+# Rows per multi-row INSERT, keeps PostgreSQL well under its bind parameter limit
+UPSERT_CHUNK_SIZE = 1000
+
+
+class CompanyBranchMenuRepository(BaseRepository[CompanyBranchMenu]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(CompanyBranchMenu, session)
+
+    async def list_by_branch(
+        self,
+        company_branch_id: int,
+        menu_item_ids: Optional[Iterable[int]] = None,
+        available: Optional[bool] = None,
+        refresh: bool = False,
+    ) -> List[CompanyBranchMenu]:
+        stmt = select(CompanyBranchMenu).where(
+            CompanyBranchMenu.company_branch_id == company_branch_id
+        )
+        if menu_item_ids is not None:
+            stmt = stmt.where(CompanyBranchMenu.menu_item_id.in_(list(menu_item_ids)))
+        if available is not None:
+            stmt = stmt.where(CompanyBranchMenu.available.is_(available))
+        stmt = stmt.order_by(CompanyBranchMenu.menu_item_id)
+        if refresh:
+            # Bulk updates bypass the identity map, reload loaded rows as well
+            stmt = stmt.execution_options(populate_existing=True)
+
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def apply_availability(
+        self,
+        company_branch_id: int,
+        changes: Dict[int, AvailabilityChange],
+    ) -> None:
+        """
+        Applies `{menu_item_id: (available, changed_at)}` to a branch menu.
+
+        A row is only overwritten by a toggle newer than the one it holds, so
+        concurrent batches from several devices converge on the latest toggle
+        whatever order they commit in.
+        """
+        if not changes:
+            return
+
+        table = CompanyBranchMenu.__table__
+        # Sorted ids keep the row lock order stable between concurrent batches
+        rows = [
+            (menu_item_id, available, changed_at)
+            for menu_item_id, (available, changed_at) in sorted(changes.items())
+        ]
+
+        if self.dialect_name == "postgresql":
+            # UPDATE ... FROM (VALUES ...): one statement and one round trip
+            toggles = values(
+                column("menu_item_id", Integer),
+                column("available", Boolean),
+                column("changed_at", DateTime(timezone=True)),
+                name="toggles",
+            ).data(rows)
+            stmt = (
+                update(table)
+                .where(
+                    table.c.company_branch_id == company_branch_id,
+                    table.c.menu_item_id == toggles.c.menu_item_id,
+                    or_(
+                        table.c.available_changed_at.is_(None),
+                        table.c.available_changed_at < toggles.c.changed_at,
+                    ),
+                )
+                .values(
+                    available=toggles.c.available,
+                    available_changed_at=toggles.c.changed_at,
+                )
+            )
+            await self.session.execute(stmt)
+            return
+
+        # Other dialects have no VALUES lists in UPDATE ... FROM: executemany
+        stmt = (
+            update(table)
+            .where(
+                table.c.company_branch_id == company_branch_id,
+                table.c.menu_item_id == bindparam("b_menu_item_id"),
+                or_(
+                    table.c.available_changed_at.is_(None),
+                    table.c.available_changed_at < bindparam("b_changed_at"),
+                ),
+            )
+            .values(
+                available=bindparam("b_available"),
+                available_changed_at=bindparam("b_changed_at"),
+            )
+        )
+        await self.session.execute(
+            stmt,
+            [
+                {
+                    "b_menu_item_id": menu_item_id,
+                    "b_available": available,
+                    "b_changed_at": changed_at,
+                }
+                for menu_item_id, available, changed_at in rows
+            ],
+        )
+
+    async def list_price_matrix(
+        self, company_id: int, company_branch_ids: Sequence[int]
+    ) -> List[Row]:
+        """
+        Company menu items joined with their prices in the given branches,
+        one row per assigned (item, branch) pair and one per unassigned item.
+        """
+        stmt = (
+            select(
+                MenuItem.id.label("menu_item_id"),
+                MenuItem.slug,
+                MenuItem.name,
+                CompanyBranchMenu.company_branch_id,
+                CompanyBranchMenu.price,
+            )
+            .outerjoin(
+                CompanyBranchMenu,
+                and_(
+                    CompanyBranchMenu.menu_item_id == MenuItem.id,
+                    CompanyBranchMenu.company_branch_id.in_(company_branch_ids),
+                ),
+            )
+            .where(MenuItem.owner_company_id == company_id)
+            .order_by(MenuItem.name, MenuItem.id, CompanyBranchMenu.company_branch_id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    async def upsert_prices(self, cells: Sequence[PriceCell]) -> None:
+        """
+        Inserts or updates `(company_branch_id, menu_item_id, price)` cells with
+        INSERT ... ON CONFLICT DO UPDATE. Unchanged prices are left untouched so
+        they do not show up in menu delta syncs.
+        """
+        now = datetime.now(timezone.utc)
+        for start in range(0, len(cells), UPSERT_CHUNK_SIZE):
+            chunk = cells[start : start + UPSERT_CHUNK_SIZE]
+            stmt = self._upsert_statement().values(
+                [
+                    {
+                        "company_branch_id": company_branch_id,
+                        "menu_item_id": menu_item_id,
+                        "price": price,
+                        "available": True,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for company_branch_id, menu_item_id, price in chunk
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    CompanyBranchMenu.company_branch_id,
+                    CompanyBranchMenu.menu_item_id,
+                ],
+                set_={"price": stmt.excluded.price, "updated_at": now},
+                where=CompanyBranchMenu.price != stmt.excluded.price,
+            )
+            await self.session.execute(stmt)
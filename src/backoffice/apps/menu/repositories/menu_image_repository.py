@@ -1,11 +1,18 @@
-from typing import List, Optional
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, literal, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backoffice.apps.menu.models import MenuImage
+from src.backoffice.apps.menu.models import MenuImage, MenuImageStatus, MenuItem
 from src.backoffice.core.repositories import BaseRepository
 
+# Prefix conditions per query when looking up file stems
+STEM_LOOKUP_CHUNK_SIZE = 500
+# Namespaces the advisory lock keys of stored contents
+CONTENTS_LOCK_PREFIX = "menu_image_contents:"
+
 
 class MenuImageRepository(BaseRepository[MenuImage]):
     def __init__(self, session: AsyncSession):
@@ -42,3 +49,171 @@ class MenuImageRepository(BaseRepository[MenuImage]):
         for image in images.scalars().all():
             image.is_primary = False
         await self.session.flush()
+
+    async def copy_from_templates(self, menu_item_ids: Sequence[int]) -> None:
+        """
+        Copies active template images onto the items cloned from them with a
+        single INSERT ... SELECT. Copies share the stored files.
+        """
+        if not menu_item_ids:
+            return
+
+        table = MenuImage.__table__
+        now = datetime.now(timezone.utc)
+        images = (
+            select(
+                MenuImage.filename,
+                MenuImage.original_filename,
+                MenuImage.file_path,
+                MenuImage.file_size,
+                MenuImage.mime_type,
+                MenuImage.content_hash,
+                MenuImage.width,
+                MenuImage.height,
+                MenuImage.variants,
+                MenuImage.alt_text,
+                MenuItem.id,
+                MenuImage.display_order,
+                MenuImage.is_active,
+                MenuImage.is_primary,
+                literal(now),
+                literal(now),
+            )
+            .join(MenuItem, MenuItem.template_id == MenuImage.menu_item_id)
+            .where(
+                MenuItem.id.in_(menu_item_ids),
+                MenuImage.is_active.is_(True),
+                MenuImage.status == MenuImageStatus.READY.value,
+            )
+        )
+        await self.session.execute(
+            insert(table).from_select(
+                [
+                    table.c.filename,
+                    table.c.original_filename,
+                    table.c.file_path,
+                    table.c.file_size,
+                    table.c.mime_type,
+                    table.c.content_hash,
+                    table.c.width,
+                    table.c.height,
+                    table.c.variants,
+                    table.c.alt_text,
+                    table.c.menu_item_id,
+                    table.c.display_order,
+                    table.c.is_active,
+                    table.c.is_primary,
+                    table.c.created_at,
+                    table.c.updated_at,
+                ],
+                images,
+            )
+        )
+
+    async def get_by_job_id(self, job_id: str) -> Optional[MenuImage]:
+        result = await self.session.execute(
+            select(MenuImage).where(MenuImage.job_id == job_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def lock_contents(self, content_hashes: Iterable[str]) -> None:
+        """
+        Serializes reusing and deleting the stored files of these contents
+        until the transaction ends. Taken before looking the images up, so
+        that the lookup runs after a concurrent upload or delete committed;
+        row locks would not do, a statement waiting on one keeps the snapshot
+        it started with and misses rows inserted meanwhile. SQLite runs one
+        writer at a time and needs no lock.
+        """
+        if self.dialect_name != "postgresql":
+            return
+        # Sorted, so that batches of overlapping contents cannot deadlock
+        for content_hash in sorted(set(content_hashes)):
+            await self.session.execute(
+                select(
+                    func.pg_advisory_xact_lock(
+                        func.hashtext(CONTENTS_LOCK_PREFIX + content_hash)
+                    )
+                )
+            )
+
+    async def get_by_content_hash(self, content_hash: str) -> Optional[MenuImage]:
+        """A processed image with these contents, see `lock_contents`"""
+        result = await self.session.execute(
+            select(MenuImage)
+            .where(
+                MenuImage.content_hash == content_hash,
+                MenuImage.status == MenuImageStatus.READY.value,
+            )
+            .order_by(MenuImage.id)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_content_hashes(
+        self, content_hashes: Iterable[str]
+    ) -> Dict[str, MenuImage]:
+        """`get_by_content_hash` for many hashes at once, keyed by hash"""
+        result = await self.session.execute(
+            select(MenuImage)
+            .where(
+                MenuImage.content_hash.in_(list(content_hashes)),
+                MenuImage.status == MenuImageStatus.READY.value,
+            )
+            .order_by(MenuImage.id)
+        )
+        images: Dict[str, MenuImage] = {}
+        for image in result.scalars():
+            images.setdefault(image.content_hash, image)
+        return images
+
+    async def insert_many(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """
+        Inserts images in bulk with one executemany, which SQLAlchemy sends as
+        multi-row INSERT statements; the identity map is bypassed
+        """
+        if not rows:
+            return
+
+        now = datetime.now(timezone.utc)
+        await self.session.execute(
+            insert(MenuImage.__table__),
+            [{"created_at": now, "updated_at": now, **row} for row in rows],
+        )
+
+    async def is_file_shared(self, file_path: str, exclude_image_id: int) -> bool:
+        """
+        Whether another image still points to the stored file; its contents
+        are to be locked first, see `lock_contents`
+        """
+        result = await self.session.execute(
+            select(MenuImage.id).where(MenuImage.file_path == file_path)
+        )
+        return any(image_id != exclude_image_id for image_id in result.scalars())
+
+    async def get_referenced_stems(self, folder: str, stems: Iterable[str]) -> Set[str]:
+        """
+        Which of the file `stems` (names without extension) under `folder`
+        still belong to an image's original, whatever its status
+        """
+        stems = list(stems)
+        referenced: Set[str] = set()
+        for start in range(0, len(stems), STEM_LOOKUP_CHUNK_SIZE):
+            chunk = stems[start : start + STEM_LOOKUP_CHUNK_SIZE]
+            result = await self.session.execute(
+                select(MenuImage.file_path)
+                .where(
+                    or_(
+                        *(
+                            MenuImage.file_path.startswith(
+                                f"{folder}/{stem}.", autoescape=True
+                            )
+                            for stem in chunk
+                        )
+                    )
+                )
+                .distinct()
+            )
+            for file_path in result.scalars():
+                referenced.add(os.path.splitext(os.path.basename(file_path))[0])
+        return referenced.intersection(stems)
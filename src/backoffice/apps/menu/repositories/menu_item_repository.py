@@ -1,12 +1,57 @@
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Float,
+    Integer,
+    Row,
+    Select,
+    String,
+    Text,
+    and_,
+    case,
+    cast,
+    exists,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
-from src.backoffice.apps.menu.models import Category, MenuItem
+from src.backoffice.apps.menu.models import (
+    Category,
+    CompanyBranchMenu,
+    MenuImage,
+    MenuItem,
+    MenuItemTombstone,
+)
+from src.backoffice.apps.menu.repositories.projections import (
+    FacetCountRow,
+    MenuImageRow,
+    MenuItemRow,
+    NutritionRow,
+)
 from src.backoffice.core.repositories import BaseRepository
 
+FACETS = ("category", "calories", "has_image")
+
 
 class MenuItemRepository(BaseRepository[MenuItem]):
     def __init__(self, session: AsyncSession):
@@ -18,6 +63,18 @@ class MenuItemRepository(BaseRepository[MenuItem]):
         )
         return result.scalar_one_or_none()
 
+    async def list_owned_ids(
+        self, company_id: int, item_ids: Iterable[int]
+    ) -> Set[int]:
+        """Subset of `item_ids` owned by the company"""
+        result = await self.session.execute(
+            select(MenuItem.id).where(
+                MenuItem.owner_company_id == company_id,
+                MenuItem.id.in_(list(item_ids)),
+            )
+        )
+        return set(result.scalars().all())
+
     async def _get_menu_item_with_relations(
         self, where_condition
     ) -> Optional[MenuItem]:
@@ -59,7 +116,7 @@ class MenuItemRepository(BaseRepository[MenuItem]):
         if category.parent:
             await self._load_category_parent_chain(category.parent)
 
-    async def update_by_slug(self, slug: str, **kwargs) -> Optional[MenuItem]:
+    async def update_by_slug(self, slug: str, /, **kwargs) -> Optional[MenuItem]:
         menu_item = await self.get_by_slug(slug)
         if not menu_item:
             return None
@@ -105,6 +162,206 @@ class MenuItemRepository(BaseRepository[MenuItem]):
         )
         return list(result.scalars().all())
 
+    async def get_templates_to_clone(
+        self,
+        company_id: int,
+        template_slugs: Optional[Sequence[str]] = None,
+        category_ids: Optional[Select] = None,
+    ) -> List[Row]:
+        """
+        Templates matching the slugs or categories, ordered by id. Templates
+        already cloned into the company are skipped.
+        """
+        filters = []
+        if template_slugs:
+            filters.append(MenuItem.slug.in_(template_slugs))
+        if category_ids is not None:
+            filters.append(MenuItem.category_id.in_(category_ids))
+        if not filters:
+            return []
+
+        clone = aliased(MenuItem)
+        stmt = (
+            select(
+                MenuItem.id,
+                MenuItem.name,
+                MenuItem.description,
+                MenuItem.category_id,
+                MenuItem.grams,
+                MenuItem.kilocalories,
+                MenuItem.proteins,
+                MenuItem.fats,
+                MenuItem.carbohydrated,
+            )
+            .where(
+                MenuItem.is_template.is_(True),
+                or_(*filters),
+                ~exists().where(
+                    clone.template_id == MenuItem.id,
+                    clone.owner_company_id == company_id,
+                ),
+            )
+            .order_by(MenuItem.id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    async def insert_many(self, rows: Sequence[Dict[str, Any]]) -> List[Row]:
+        """
+        Inserts menu items in bulk and returns `(id, name)` in the order of
+        `rows`. SQLAlchemy batches the rows into multi-row INSERT ... RETURNING
+        statements; the identity map is bypassed. Rows may carry ids taken
+        with `reserve_ids` to set the final slugs up front.
+        """
+        if not rows:
+            return []
+
+        now = datetime.now(timezone.utc)
+        table = MenuItem.__table__
+        result = await self.session.execute(
+            insert(table).returning(
+                table.c.id, table.c.name, sort_by_parameter_order=True
+            ),
+            [{"created_at": now, "updated_at": now, **row} for row in rows],
+        )
+        return list(result.all())
+
+    async def stream_company_export(
+        self, company_id: int, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Company menu rows with category and primary image columns, fetched
+        through a server-side cursor `chunk_size` rows at a time.
+        """
+        stmt = (
+            select(
+                MenuItem.slug,
+                MenuItem.name,
+                MenuItem.description,
+                Category.slug.label("category_slug"),
+                Category.name.label("category_name"),
+                MenuItem.grams,
+                MenuItem.kilocalories,
+                MenuItem.proteins,
+                MenuItem.fats,
+                MenuItem.carbohydrated,
+                MenuImage.file_path.label("image_file_path"),
+            )
+            .join(Category, Category.id == MenuItem.category_id)
+            .outerjoin(
+                MenuImage,
+                and_(
+                    MenuImage.menu_item_id == MenuItem.id,
+                    MenuImage.is_primary.is_(True),
+                    MenuImage.is_active.is_(True),
+                ),
+            )
+            .where(MenuItem.owner_company_id == company_id)
+            .order_by(MenuItem.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def search(
+        self,
+        company_id: int,
+        terms: Sequence[str],
+        category_slug: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Row]:
+        """
+        Company menu items matching every term as a prefix, best first, plus
+        per-category match counts, in a single statement.
+
+        Rows have `kind` "hit" (item columns and `rank`) or "facet"
+        (`category_slug`, `category_name` and `count`). Facets ignore the
+        `category_slug` filter so they can be used to switch categories.
+        """
+        if self.dialect_name == "postgresql":
+            # Prefix match in both configs, e.g. "soups:* & hot:*"
+            prefix_query = " & ".join(f"{term}:*" for term in terms)
+            ts_query = func.to_tsquery("russian", prefix_query).op("||")(
+                func.to_tsquery("english", prefix_query)
+            )
+            matched = MenuItem.search_vector.op("@@")(ts_query)
+            rank = func.ts_rank(MenuItem.search_vector, ts_query)
+        else:
+            matched = and_(
+                *(
+                    or_(
+                        func.lower(MenuItem.name).contains(term, autoescape=True),
+                        func.lower(MenuItem.description).contains(
+                            term, autoescape=True
+                        ),
+                    )
+                    for term in terms
+                )
+            )
+            rank = case(
+                (
+                    and_(
+                        *(
+                            func.lower(MenuItem.name).contains(term, autoescape=True)
+                            for term in terms
+                        )
+                    ),
+                    1.0,
+                ),
+                else_=0.5,
+            )
+
+        matches = (
+            select(
+                MenuItem.id,
+                MenuItem.slug,
+                MenuItem.name,
+                MenuItem.description,
+                Category.slug.label("category_slug"),
+                Category.name.label("category_name"),
+                cast(rank, Float).label("rank"),
+            )
+            .join(Category, Category.id == MenuItem.category_id)
+            .where(MenuItem.owner_company_id == company_id, matched)
+            .cte("matches")
+        )
+
+        hits = select(matches).order_by(
+            matches.c.rank.desc(), matches.c.name, matches.c.id
+        )
+        if category_slug is not None:
+            hits = hits.where(matches.c.category_slug == category_slug)
+        hits = hits.limit(limit).offset(offset).subquery("hits")
+
+        stmt = union_all(
+            select(
+                literal("hit").label("kind"),
+                hits.c.id,
+                hits.c.slug,
+                hits.c.name,
+                hits.c.description,
+                hits.c.category_slug,
+                hits.c.category_name,
+                hits.c.rank,
+                cast(null(), Integer).label("count"),
+            ),
+            select(
+                literal("facet"),
+                cast(null(), Integer),
+                cast(null(), String),
+                cast(null(), String),
+                cast(null(), Text),
+                matches.c.category_slug,
+                matches.c.category_name,
+                cast(null(), Float),
+                func.count(),
+            ).group_by(matches.c.category_slug, matches.c.category_name),
+        )
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
     async def list_with_optional_category(
         self,
         category_slug: Optional[str] = None,
@@ -153,3 +410,299 @@ class MenuItemRepository(BaseRepository[MenuItem]):
                 await self._load_category_parent_chain(menu_item.category)
 
         return menu_items
+
+    async def list_rows_by_company(self, company_id: int) -> List[MenuItemRow]:
+        """`list_by_company` columns only, without ORM objects"""
+        result = await self.session.execute(
+            select(*(getattr(MenuItem, name) for name in MenuItemRow._fields))
+            .where(MenuItem.owner_company_id == company_id)
+            .order_by(MenuItem.created_at.desc())
+        )
+        return [MenuItemRow._make(row) for row in result]
+
+    async def list_image_rows(self, item_ids: Sequence[int]) -> List[MenuImageRow]:
+        if not item_ids:
+            return []
+        result = await self.session.execute(
+            select(*(getattr(MenuImage, name) for name in MenuImageRow._fields))
+            .where(MenuImage.menu_item_id.in_(item_ids))
+            .order_by(MenuImage.id)
+        )
+        return [MenuImageRow._make(row) for row in result]
+
+    async def list_nutrition_rows(
+        self, company_id: int, company_branch_id: Optional[int] = None
+    ) -> List[NutritionRow]:
+        """Nutrition columns of the company menu, or of a single branch menu"""
+        stmt = (
+            select(
+                MenuItem.id,
+                MenuItem.slug,
+                MenuItem.name,
+                MenuItem.category_id,
+                Category.slug,
+                Category.name,
+                MenuItem.grams,
+                MenuItem.kilocalories,
+                MenuItem.proteins,
+                MenuItem.fats,
+                MenuItem.carbohydrated,
+            )
+            .join(Category, Category.id == MenuItem.category_id)
+            .where(MenuItem.owner_company_id == company_id)
+            .order_by(MenuItem.id)
+        )
+        if company_branch_id is not None:
+            stmt = stmt.join(
+                CompanyBranchMenu, CompanyBranchMenu.menu_item_id == MenuItem.id
+            ).where(CompanyBranchMenu.company_branch_id == company_branch_id)
+
+        result = await self.session.execute(stmt)
+        return [NutritionRow._make(row) for row in result]
+
+    async def get_menu_version(
+        self,
+        company_id: int,
+        company_branch_id: Optional[int] = None,
+        with_images: bool = False,
+    ) -> Tuple[Any, ...]:
+        """
+        Changes whenever an item of the menu is added, edited or removed:
+        item count, last item change and last tombstone of the company, plus
+        image count and last image change `with_images`
+        """
+        deleted_at = (
+            select(func.max(MenuItemTombstone.deleted_at))
+            .where(MenuItemTombstone.owner_company_id == company_id)
+            .scalar_subquery()
+        )
+        stmt = select(
+            func.count(MenuItem.id), func.max(MenuItem.updated_at), deleted_at
+        ).where(MenuItem.owner_company_id == company_id)
+        if with_images:
+            stmt = stmt.add_columns(
+                *(
+                    select(aggregate)
+                    .join(MenuItem, MenuItem.id == MenuImage.menu_item_id)
+                    .where(MenuItem.owner_company_id == company_id)
+                    .scalar_subquery()
+                    for aggregate in (
+                        func.count(MenuImage.id),
+                        func.max(MenuImage.updated_at),
+                    )
+                )
+            )
+        if company_branch_id is not None:
+            stmt = (
+                stmt.add_columns(func.max(CompanyBranchMenu.updated_at))
+                .join(CompanyBranchMenu, CompanyBranchMenu.menu_item_id == MenuItem.id)
+                .where(CompanyBranchMenu.company_branch_id == company_branch_id)
+            )
+
+        result = await self.session.execute(stmt)
+        return tuple(result.one())
+
+    async def count_facets(
+        self,
+        company_id: int,
+        facets: Sequence[str],
+        calorie_buckets: Sequence[Tuple[str, Optional[int]]],
+        unknown_calories: str,
+        company_branch_id: Optional[int] = None,
+        category_slug: Optional[str] = None,
+        calorie_bucket: Optional[str] = None,
+        has_image: Optional[bool] = None,
+    ) -> List[FacetCountRow]:
+        """
+        Counts of the requested facets ("category", "calories", "has_image")
+        and the total, in one grouped statement. Every facet ignores its own
+        filter so the other values stay selectable.
+        """
+        image_exists = (
+            select(MenuImage.id)
+            .where(MenuImage.menu_item_id == MenuItem.id, MenuImage.is_active.is_(True))
+            .exists()
+        )
+        items = (
+            select(
+                Category.slug.label("category"),
+                Category.name.label("category_name"),
+                case(
+                    (MenuItem.kilocalories.is_(None), unknown_calories),
+                    *(
+                        (MenuItem.kilocalories < upper, label)
+                        for label, upper in calorie_buckets
+                        if upper is not None
+                    ),
+                    else_=calorie_buckets[-1][0],
+                ).label("calories"),
+                image_exists.label("has_image"),
+            )
+            .join(Category, Category.id == MenuItem.category_id)
+            .where(MenuItem.owner_company_id == company_id)
+        )
+        if company_branch_id is not None:
+            items = items.join(
+                CompanyBranchMenu, CompanyBranchMenu.menu_item_id == MenuItem.id
+            ).where(CompanyBranchMenu.company_branch_id == company_branch_id)
+        items = items.cte("facet_items")
+
+        conditions = {
+            name: items.c[name] == value
+            for name, value in (
+                ("category", category_slug),
+                ("calories", calorie_bucket),
+                ("has_image", has_image),
+            )
+            if value is not None
+        }
+
+        def count_without(facet: Optional[str]):
+            others = [cond for name, cond in conditions.items() if name != facet]
+            return func.count().filter(and_(*others)) if others else func.count()
+
+        count_columns = [count_without(facet) for facet in FACETS] + [
+            count_without(None)
+        ]
+        facet_columns = {
+            "category": ("category", "category_name"),
+            "calories": ("calories",),
+            "has_image": ("has_image",),
+        }
+
+        def item_columns(names: Sequence[str]):
+            """Item columns, NULL where not grouped by `names`"""
+            return (
+                (
+                    column
+                    if column.name in names
+                    else cast(null(), column.type).label(column.name)
+                )
+                for column in items.c
+            )
+
+        if self.dialect_name == "postgresql":
+            grouped = [name for facet in facets for name in facet_columns[facet]]
+            stmt = select(
+                *(
+                    func.grouping(items.c[facet]) if facet in facets else literal(1)
+                    for facet in FACETS
+                ),
+                *item_columns(grouped),
+                *count_columns,
+            ).group_by(
+                func.grouping_sets(
+                    *(
+                        tuple_(*(items.c[name] for name in facet_columns[facet]))
+                        for facet in facets
+                    ),
+                    tuple_(),
+                )
+            )
+        else:
+            # No GROUPING SETS in SQLite, the same rows from a UNION ALL
+            selects = []
+            for grouping_set in (*facets, None):
+                names = facet_columns.get(grouping_set, ())
+                selects.append(
+                    select(
+                        *(literal(int(facet != grouping_set)) for facet in FACETS),
+                        *item_columns(names),
+                        *count_columns,
+                    )
+                    .select_from(items)
+                    .group_by(*(items.c[name] for name in names))
+                )
+            stmt = union_all(*selects)
+
+        result = await self.session.execute(stmt)
+        rows = []
+        for row in result:
+            groupings, row_counts = row[: len(FACETS)], row[-len(FACETS) - 1 :]
+            mapping = row._mapping
+            if all(groupings):
+                rows.append(FacetCountRow(None, None, None, row_counts[-1]))
+                continue
+            index = groupings.index(0)
+            facet = FACETS[index]
+            value = mapping[facet]
+            if facet == "has_image":
+                # SQLite returns EXISTS as 0/1
+                value = bool(value)
+            label = mapping["category_name"] if facet == "category" else None
+            rows.append(FacetCountRow(facet, value, label, row_counts[index]))
+        return rows
+
+    async def list_changed_since(
+        self, company_id: int, since: Optional[datetime] = None
+    ) -> List[MenuItem]:
+        """Company menu items changed after `since` (all items when omitted)"""
+        stmt = (
+            select(MenuItem)
+            .where(MenuItem.owner_company_id == company_id)
+            .options(
+                selectinload(MenuItem.images),
+                selectinload(MenuItem.category).selectinload(Category.parent),
+            )
+            .order_by(MenuItem.updated_at, MenuItem.id)
+        )
+        if since is not None:
+            stmt = stmt.where(
+                or_(
+                    MenuItem.updated_at > since,
+                    MenuItem.id.in_(self._images_changed_since(since)),
+                )
+            )
+
+        result = await self.session.execute(stmt)
+        menu_items = list(result.scalars().all())
+
+        for menu_item in menu_items:
+            if menu_item.category:
+                await self._load_category_parent_chain(menu_item.category)
+
+        return menu_items
+
+    async def list_branch_changed_since(
+        self, company_branch_id: int, since: Optional[datetime] = None
+    ) -> List[Tuple[MenuItem, CompanyBranchMenu]]:
+        """Branch menu entries whose item or branch price/availability changed"""
+        stmt = (
+            select(MenuItem, CompanyBranchMenu)
+            .join(CompanyBranchMenu, CompanyBranchMenu.menu_item_id == MenuItem.id)
+            .where(CompanyBranchMenu.company_branch_id == company_branch_id)
+            .options(
+                selectinload(MenuItem.images),
+                selectinload(MenuItem.category).selectinload(Category.parent),
+            )
+            .order_by(MenuItem.updated_at, MenuItem.id)
+        )
+        if since is not None:
+            stmt = stmt.where(
+                or_(
+                    MenuItem.updated_at > since,
+                    CompanyBranchMenu.updated_at > since,
+                    MenuItem.id.in_(self._images_changed_since(since)),
+                )
+            )
+
+        result = await self.session.execute(stmt)
+        rows = [(row[0], row[1]) for row in result.all()]
+
+        for menu_item, _ in rows:
+            if menu_item.category:
+                await self._load_category_parent_chain(menu_item.category)
+
+        return rows
+
+    async def touch(self, item_id: int) -> None:
+        """Bump updated_at so delta sync clients pick up related changes"""
+        await self.session.execute(
+            update(MenuItem)
+            .where(MenuItem.id == item_id)
+            .values(updated_at=datetime.now(timezone.utc))
+        )
+
+    @staticmethod
+    def _images_changed_since(since: datetime):
+        return select(MenuImage.menu_item_id).where(MenuImage.updated_at > since)
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.models import MenuItemTombstone
+from src.backoffice.core.repositories import BaseRepository
+
+
+class MenuItemTombstoneRepository(BaseRepository[MenuItemTombstone]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(MenuItemTombstone, session)
+
+    async def list_since(
+        self, company_id: int, since: datetime
+    ) -> List[MenuItemTombstone]:
+        stmt = (
+            select(MenuItemTombstone)
+            .where(
+                MenuItemTombstone.owner_company_id == company_id,
+                MenuItemTombstone.deleted_at > since,
+            )
+            .order_by(MenuItemTombstone.deleted_at, MenuItemTombstone.id)
+        )
+
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
@@ -0,0 +1,59 @@
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class MenuItemRow(NamedTuple):
+    id: int
+    slug: str
+    name: str
+    description: str
+    grams: int
+    kilocalories: Optional[int]
+    proteins: Optional[int]
+    fats: Optional[int]
+    carbohydrated: Optional[int]
+    category_id: int
+
+
+class MenuImageRow(NamedTuple):
+    menu_item_id: int
+    file_path: str
+    mime_type: str
+    display_order: int
+    is_primary: bool
+    width: Optional[int]
+    variants: Optional[List[Dict[str, Any]]]
+
+
+class CategoryRow(NamedTuple):
+    id: int
+    name: str
+    slug: str
+    parent_id: Optional[int]
+
+
+class MenuItemListEntry(NamedTuple):
+    item: MenuItemRow
+    breadcrumbs: List[Dict[str, str]]
+    images: List[MenuImageRow]
+
+
+class NutritionRow(NamedTuple):
+    id: int
+    slug: str
+    name: str
+    category_id: int
+    category_slug: str
+    category_name: str
+    grams: int
+    kilocalories: Optional[int]
+    proteins: Optional[int]
+    fats: Optional[int]
+    carbohydrated: Optional[int]
+
+
+class FacetCountRow(NamedTuple):
+    # None for the total row
+    facet: Optional[str]
+    value: Any
+    label: Optional[str]
+    count: int
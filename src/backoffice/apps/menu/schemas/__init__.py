@@ -1,10 +1,27 @@
+from .branch_menu import (PriceMatrixBranch, PriceMatrixCell,
+                          PriceMatrixCellError, PriceMatrixResponse,
+                          PriceMatrixRow, PriceMatrixUpdate,
+                          PriceMatrixUpdateResponse, StopListItemResponse,
+                          StopListResponse, StopListToggle, StopListUpdate)
+from .menu_analytics import (CategoryNutritionResponse,
+                             MenuAnalyticsResponse, NutritionOutlierResponse,
+                             NutritionStatsResponse)
+from .menu_facets import MenuFacetsResponse, MenuFacetValueResponse
 from .menu_image import (MenuImageBase, MenuImageCreate,
-                         MenuImageDeleteResponse, MenuImageListResponse,
-                         MenuImagePresignedUrlResponse, MenuImageResponse,
-                         MenuImageUpdate, MenuImageUploadResponse,
-                         ThumbnailInfo)
-from .menu_item import (MenuItemBase, MenuItemCreate, MenuItemListResponse,
-                        MenuItemResponse, MenuItemUpdate)
+                         MenuImageDeleteResponse, MenuImageJobResponse,
+                         MenuImageListResponse, MenuImagePresignedUrlResponse,
+                         MenuImageResponse, MenuImageUpdate,
+                         MenuImageUploadResponse, ThumbnailInfo)
+from .menu_import import MenuImportResponse, MenuImportRowErrorResponse
+from .menu_item import (ImageSourceResponse, MenuItemBase, MenuItemCreate,
+                        MenuItemListResponse, MenuItemResponse,
+                        MenuItemUpdate)
+from .menu_search import (MenuSearchFacetResponse, MenuSearchHitResponse,
+                          MenuSearchResponse)
+from .menu_sync import (MenuChangesResponse, MenuItemTombstoneResponse,
+                        MenuSyncItemResponse)
+from .menu_template import (ClonedMenuItemResponse, MenuTemplateCloneRequest,
+                            MenuTemplateCloneResponse)
 
 __all__ = [
     # MenuItem schemas
@@ -22,5 +39,42 @@ __all__ = [
     "MenuImageUploadResponse",
     "MenuImageDeleteResponse",
     "MenuImagePresignedUrlResponse",
+    "MenuImageJobResponse",
     "ThumbnailInfo",
+    "ImageSourceResponse",
+    # Delta sync schemas
+    "MenuChangesResponse",
+    "MenuItemTombstoneResponse",
+    "MenuSyncItemResponse",
+    # Branch menu schemas
+    "StopListToggle",
+    "StopListUpdate",
+    "StopListItemResponse",
+    "StopListResponse",
+    "PriceMatrixBranch",
+    "PriceMatrixRow",
+    "PriceMatrixResponse",
+    "PriceMatrixCell",
+    "PriceMatrixUpdate",
+    "PriceMatrixCellError",
+    "PriceMatrixUpdateResponse",
+    # Menu template schemas
+    "MenuTemplateCloneRequest",
+    "MenuTemplateCloneResponse",
+    "ClonedMenuItemResponse",
+    # Menu analytics schemas
+    "MenuAnalyticsResponse",
+    "NutritionStatsResponse",
+    "CategoryNutritionResponse",
+    "NutritionOutlierResponse",
+    # Menu facets schemas
+    "MenuFacetsResponse",
+    "MenuFacetValueResponse",
+    # Menu import schemas
+    "MenuImportResponse",
+    "MenuImportRowErrorResponse",
+    # Menu search schemas
+    "MenuSearchResponse",
+    "MenuSearchHitResponse",
+    "MenuSearchFacetResponse",
 ]
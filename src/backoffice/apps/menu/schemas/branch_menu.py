@@ -0,0 +1,113 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class StopListToggle(BaseModel):
+    """Single availability toggle of a branch menu item"""
+
+    menu_item_id: int = Field(..., description="Menu item ID")
+    available: bool = Field(..., description="Available in the branch")
+    changed_at: Optional[datetime] = Field(
+        None, description="When the toggle was made on the device, defaults to now"
+    )
+
+
+class StopListUpdate(BaseModel):
+    """Batch of availability toggles for a branch"""
+
+    toggles: List[StopListToggle] = Field(
+        ..., min_length=1, max_length=1000, description="Toggles in the order made"
+    )
+
+
+class StopListItemResponse(BaseModel):
+    """Current availability of a branch menu item"""
+
+    menu_item_id: int = Field(..., description="Menu item ID")
+    available: bool = Field(..., description="Available in the branch")
+    available_changed_at: Optional[datetime] = Field(
+        None, description="Time of the toggle currently in effect"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StopListResponse(BaseModel):
+    """Availability of branch menu items"""
+
+    items: List[StopListItemResponse] = Field(
+        default_factory=list, description="Branch menu items"
+    )
+    missing_menu_item_ids: List[int] = Field(
+        default_factory=list, description="Toggled items not on the branch menu"
+    )
+
+
+class PriceMatrixBranch(BaseModel):
+    """Branch column of the price matrix"""
+
+    id: int = Field(..., description="Company branch ID")
+    name: str = Field(..., description="Company branch name")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PriceMatrixRow(BaseModel):
+    """Menu item row of the price matrix"""
+
+    menu_item_id: int = Field(..., description="Menu item ID")
+    slug: str = Field(..., description="Menu item slug")
+    name: str = Field(..., description="Menu item name")
+    prices: Dict[int, Decimal] = Field(
+        default_factory=dict,
+        description="Price by branch ID, absent when not on the branch menu",
+    )
+
+
+class PriceMatrixResponse(BaseModel):
+    """Company menu prices, items by branches"""
+
+    branches: List[PriceMatrixBranch] = Field(
+        default_factory=list, description="Company branches"
+    )
+    rows: List[PriceMatrixRow] = Field(
+        default_factory=list, description="Company menu items"
+    )
+
+
+class PriceMatrixCell(BaseModel):
+    """Price of a menu item in a branch"""
+
+    company_branch_id: int = Field(..., description="Company branch ID")
+    menu_item_id: int = Field(..., description="Menu item ID")
+    price: Decimal = Field(..., description="Price")
+
+
+class PriceMatrixUpdate(BaseModel):
+    """Bulk price matrix update"""
+
+    company_subdomain: str = Field(..., description="Company subdomain")
+    cells: List[PriceMatrixCell] = Field(
+        ..., min_length=1, max_length=10000, description="Cells to set"
+    )
+
+
+class PriceMatrixCellError(BaseModel):
+    """Rejected price matrix cell"""
+
+    index: int = Field(..., description="Position of the cell in the request")
+    company_branch_id: int = Field(..., description="Company branch ID")
+    menu_item_id: int = Field(..., description="Menu item ID")
+    message: str = Field(..., description="Reason")
+
+
+class PriceMatrixUpdateResponse(BaseModel):
+    """Result of a bulk price matrix update"""
+
+    applied: int = Field(..., description="Number of cells written")
+    errors: List[PriceMatrixCellError] = Field(
+        default_factory=list, description="Rejected cells"
+    )
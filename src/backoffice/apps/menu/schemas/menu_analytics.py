@@ -0,0 +1,68 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NutritionStatsResponse(BaseModel):
+    """Distribution of a nutrition value schema"""
+
+    count: int = Field(..., description="Items with the value filled in")
+    missing: int = Field(..., description="Items without the value")
+    min: Optional[float] = Field(None, description="Minimum")
+    max: Optional[float] = Field(None, description="Maximum")
+    mean: Optional[float] = Field(None, description="Mean")
+    median: Optional[float] = Field(None, description="Median")
+    p25: Optional[float] = Field(None, description="25th percentile")
+    p75: Optional[float] = Field(None, description="75th percentile")
+    p90: Optional[float] = Field(None, description="90th percentile")
+    stdev: Optional[float] = Field(None, description="Sample standard deviation")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CategoryNutritionResponse(BaseModel):
+    """Nutrition of a category schema"""
+
+    category_slug: str = Field(..., description="Category slug")
+    category_name: str = Field(..., description="Category name")
+    item_count: int = Field(..., description="Items in the category")
+    mean: Dict[str, Optional[float]] = Field(..., description="Mean per item")
+    mean_per_100g: Dict[str, Optional[float]] = Field(
+        ..., description="Mean per 100 grams"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NutritionOutlierResponse(BaseModel):
+    """Item far off the rest of the menu schema"""
+
+    slug: str = Field(..., description="Menu item slug")
+    name: str = Field(..., description="Menu item name")
+    metric: str = Field(..., description="Nutrition value")
+    value_per_100g: float = Field(..., description="Value per 100 grams")
+    lower_bound: float = Field(..., description="Lowest usual value per 100 grams")
+    upper_bound: float = Field(..., description="Highest usual value per 100 grams")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MenuAnalyticsResponse(BaseModel):
+    """Menu nutrition analytics schema"""
+
+    version: str = Field(..., description="Menu version the result was computed for")
+    item_count: int = Field(..., description="Items in the menu")
+    distributions: Dict[str, NutritionStatsResponse] = Field(
+        ..., description="Per item values"
+    )
+    per_100g: Dict[str, NutritionStatsResponse] = Field(
+        ..., description="Values per 100 grams"
+    )
+    categories: List[CategoryNutritionResponse] = Field(
+        default_factory=list, description="Largest categories first"
+    )
+    outliers: List[NutritionOutlierResponse] = Field(
+        default_factory=list, description="Most extreme first"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,26 @@
+from typing import Dict, List, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class MenuFacetValueResponse(BaseModel):
+    """Items with a facet value schema"""
+
+    value: Union[bool, str] = Field(..., description="Value to filter by")
+    label: Optional[str] = Field(None, description="Display name")
+    count: int = Field(..., description="Matching items")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MenuFacetsResponse(BaseModel):
+    """Menu facet counts schema"""
+
+    version: str = Field(..., description="Menu version the counts were taken at")
+    total: int = Field(..., description="Items matching all filters")
+    facets: Dict[str, List[MenuFacetValueResponse]] = Field(
+        default_factory=dict,
+        description="Values of every requested facet, most items first",
+    )
+
+    model_config = ConfigDict(from_attributes=True)
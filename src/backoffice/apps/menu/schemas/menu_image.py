@@ -3,6 +3,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from src.backoffice.apps.menu.schemas.menu_item import ImageSourceResponse
+
 
 class MenuImageBase(BaseModel):
     """Base menu image schema"""
@@ -27,6 +29,18 @@ class MenuImageUpdate(BaseModel):
     is_active: Optional[bool] = Field(None, description="Is active")
 
 
+class ThumbnailInfo(BaseModel):
+    """Thumbnail info schema"""
+
+    size: str = Field(..., description="Size (small, medium, large)")
+    width: int = Field(..., description="Width")
+    height: int = Field(..., description="Height")
+    file_path: str = Field(..., description="File path")
+    file_size: Optional[int] = Field(None, description="File size")
+    mime_type: str = Field("image/jpeg", description="MIME file type")
+    url: str = Field(..., description="URL")
+
+
 class MenuImageResponse(MenuImageBase):
     """Response menu image schema"""
 
@@ -39,8 +53,22 @@ class MenuImageResponse(MenuImageBase):
     width: Optional[int] = Field(None, description="Width")
     height: Optional[int] = Field(None, description="Height")
     url: str = Field(..., description="URL")
-    thumbnails: List[dict] = Field(default_factory=list, description="Thumbnails")
+    srcset: Optional[str] = Field(
+        None,
+        description="URLs of the stored sizes with their widths, in the best "
+        "format the Accept header names",
+    )
+    sources: List[ImageSourceResponse] = Field(
+        default_factory=list,
+        description="A srcset per stored format, best first, as <picture> sources",
+    )
+    thumbnails: List[ThumbnailInfo] = Field(
+        default_factory=list, description="Thumbnails"
+    )
     is_active: bool = Field(..., description="Is active")
+    status: str = Field(
+        "ready", description="Processing status (processing, ready, failed)"
+    )
     created_at: datetime = Field(..., description="Created at")
     updated_at: datetime = Field(..., description="Updated at")
     menu_item_id: int = Field(..., description="Menu item ID")
@@ -63,6 +91,15 @@ class MenuImageUploadResponse(BaseModel):
     image: MenuImageResponse = Field(..., description="Image")
 
 
+class MenuImageJobResponse(BaseModel):
+    """Background processing job of an uploaded menu image"""
+
+    job_id: str = Field(..., description="Job ID")
+    status: str = Field(..., description="Status (processing, ready, failed)")
+    image_id: int = Field(..., description="Image ID")
+    menu_item_slug: str = Field(..., description="Menu item slug")
+
+
 class MenuImageDeleteResponse(BaseModel):
     """Delete response menu image schema"""
 
@@ -76,13 +113,3 @@ class MenuImagePresignedUrlResponse(BaseModel):
     url: str = Field(..., description="Presigned URL")
     expires_at: datetime = Field(..., description="Expires at")
     image_id: int = Field(..., description="Image ID")
-
-
-class ThumbnailInfo(BaseModel):
-    """Thumbnail info schema"""
-
-    size: str = Field(..., description="Size (small, medium, large)")
-    width: int = Field(..., description="Width")
-    height: int = Field(..., description="Height")
-    file_path: str = Field(..., description="File path")
-    url: str = Field(..., description="URL")
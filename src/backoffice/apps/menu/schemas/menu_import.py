@@ -0,0 +1,26 @@
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class MenuImportRowErrorResponse(BaseModel):
+    """Rejected import row schema"""
+
+    row: int = Field(..., description="Row number, header excluded")
+    message: str = Field(..., description="Reason")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MenuImportResponse(BaseModel):
+    """Menu import report schema"""
+
+    total_rows: int = Field(..., description="Rows read")
+    imported: int = Field(..., description="Items created, or valid rows on dry run")
+    error_count: int = Field(..., description="Rejected rows")
+    errors: List[MenuImportRowErrorResponse] = Field(
+        default_factory=list, description="First rejected rows"
+    )
+    dry_run: bool = Field(False, description="Nothing was written")
+
+    model_config = ConfigDict(from_attributes=True)
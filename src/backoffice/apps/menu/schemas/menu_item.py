@@ -2,17 +2,24 @@ from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+# Bounds of the INTEGER columns, nutrition values are checked positive there
+MAX_INTEGER = 2**31 - 1
+
 
 class MenuItemBase(BaseModel):
     """Base menu item schema"""
 
     name: str = Field(..., min_length=1, max_length=255, description="Name")
     description: str = Field(..., min_length=1, description="Description")
-    grams: int = Field(..., gt=0, description="Grams")
-    kilocalories: Optional[int] = Field(None, ge=0, description="Kilocalories")
-    proteins: Optional[int] = Field(None, ge=0, description="Proteins")
-    fats: Optional[int] = Field(None, ge=0, description="Fats")
-    carbohydrated: Optional[int] = Field(None, ge=0, description="Carbohydrated")
+    grams: int = Field(..., gt=0, le=MAX_INTEGER, description="Grams")
+    kilocalories: Optional[int] = Field(
+        None, gt=0, le=MAX_INTEGER, description="Kilocalories"
+    )
+    proteins: Optional[int] = Field(None, gt=0, le=MAX_INTEGER, description="Proteins")
+    fats: Optional[int] = Field(None, gt=0, le=MAX_INTEGER, description="Fats")
+    carbohydrated: Optional[int] = Field(
+        None, gt=0, le=MAX_INTEGER, description="Carbohydrated"
+    )
 
 
 class MenuImageCreateData(BaseModel):
@@ -40,11 +47,20 @@ class MenuItemUpdate(BaseModel):
     description: Optional[str] = Field(None, min_length=1)
     category_slug: Optional[str] = Field(None, description="Category slug")
     company_subdomain: Optional[str] = Field(None, description="Company subdomain")
-    grams: Optional[int] = Field(None, gt=0)
-    kilocalories: Optional[int] = Field(None, ge=0)
-    proteins: Optional[int] = Field(None, ge=0)
-    fats: Optional[int] = Field(None, ge=0)
-    carbohydrated: Optional[int] = Field(None, ge=0)
+    grams: Optional[int] = Field(None, gt=0, le=MAX_INTEGER)
+    kilocalories: Optional[int] = Field(None, gt=0, le=MAX_INTEGER)
+    proteins: Optional[int] = Field(None, gt=0, le=MAX_INTEGER)
+    fats: Optional[int] = Field(None, gt=0, le=MAX_INTEGER)
+    carbohydrated: Optional[int] = Field(None, gt=0, le=MAX_INTEGER)
+
+
+class ImageSourceResponse(BaseModel):
+    """Image source schema, one per stored format"""
+
+    type: str = Field(..., description="MIME type")
+    srcset: Optional[str] = Field(
+        None, description="URLs of the stored sizes with their widths"
+    )
 
 
 class MenuImageResponse(BaseModel):
@@ -53,6 +69,15 @@ class MenuImageResponse(BaseModel):
     display_order: int = Field(..., description="Display order")
     is_primary: bool = Field(..., description="Is primary")
     url: str = Field(..., description="URL")
+    srcset: Optional[str] = Field(
+        None,
+        description="URLs of the stored sizes with their widths, in the best "
+        "format the Accept header names",
+    )
+    sources: List[ImageSourceResponse] = Field(
+        default_factory=list,
+        description="A srcset per stored format, best first, as <picture> sources",
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,38 @@
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class MenuSearchHitResponse(BaseModel):
+    """Found menu item schema"""
+
+    id: int = Field(..., description="Menu item ID")
+    slug: str = Field(..., description="Slug")
+    name: str = Field(..., description="Name")
+    description: str = Field(..., description="Description")
+    category_slug: str = Field(..., description="Category slug")
+    rank: float = Field(..., description="Relevance")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MenuSearchFacetResponse(BaseModel):
+    """Matches in a category schema"""
+
+    category_slug: str = Field(..., description="Category slug")
+    category_name: str = Field(..., description="Category name")
+    count: int = Field(..., description="Matching items")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MenuSearchResponse(BaseModel):
+    """Menu search result schema"""
+
+    hits: List[MenuSearchHitResponse] = Field(
+        default_factory=list, description="Best matches first"
+    )
+    facets: List[MenuSearchFacetResponse] = Field(
+        default_factory=list, description="Matches by category"
+    )
+    total: int = Field(0, description="Matching items in all categories")
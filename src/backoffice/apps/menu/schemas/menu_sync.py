@@ -0,0 +1,43 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.backoffice.apps.menu.schemas.menu_item import MenuItemResponse
+
+
+class MenuSyncItemResponse(MenuItemResponse):
+    """Menu item changed since the requested watermark"""
+
+    id: int = Field(..., description="Menu item ID")
+    updated_at: datetime = Field(..., description="Updated at")
+    price: Optional[Decimal] = Field(None, description="Branch price")
+    available: Optional[bool] = Field(None, description="Available in the branch")
+
+
+class MenuItemTombstoneResponse(BaseModel):
+    """Removed menu item marker"""
+
+    menu_item_id: int = Field(..., description="Menu item ID")
+    slug: str = Field(..., description="Menu item slug")
+    deleted_at: datetime = Field(..., description="Deleted at")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MenuChangesResponse(BaseModel):
+    """Menu delta since a watermark"""
+
+    upserted: List[MenuSyncItemResponse] = Field(
+        default_factory=list, description="Created or updated items"
+    )
+    deleted: List[MenuItemTombstoneResponse] = Field(
+        default_factory=list, description="Removed items"
+    )
+    watermark: Optional[datetime] = Field(
+        None, description="Pass as `since` on the next request"
+    )
+    is_full_snapshot: bool = Field(
+        ..., description="Client should replace its local menu instead of merging"
+    )
@@ -0,0 +1,48 @@
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class MenuTemplateCloneRequest(BaseModel):
+    """Clone menu templates into a company schema"""
+
+    company_subdomain: str = Field(..., description="Company subdomain")
+    template_slugs: List[str] = Field(
+        default_factory=list, max_length=1000, description="Template slugs"
+    )
+    category_slug: Optional[str] = Field(
+        None, description="Clone every template of the category and its subcategories"
+    )
+    branch_ids: List[int] = Field(
+        default_factory=list, description="Put the copies on these branch menus"
+    )
+    price: Decimal = Field(
+        Decimal("0.00"), ge=0, max_digits=10, decimal_places=2, description="Price"
+    )
+
+    @model_validator(mode="after")
+    def validate_selection(self):
+        if not self.template_slugs and self.category_slug is None:
+            raise ValueError("Either template_slugs or category_slug is required")
+        return self
+
+
+class ClonedMenuItemResponse(BaseModel):
+    """Menu item created from a template schema"""
+
+    id: int = Field(..., description="Menu item ID")
+    slug: str = Field(..., description="Slug")
+    name: str = Field(..., description="Name")
+    template_id: int = Field(..., description="Template menu item ID")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MenuTemplateCloneResponse(BaseModel):
+    """Clone menu templates result schema"""
+
+    items: List[ClonedMenuItemResponse] = Field(
+        default_factory=list,
+        description="Created items, templates cloned before are skipped",
+    )
@@ -1,4 +1,47 @@
-from .menu_image_service import MenuImageService
-from .menu_item_service import MenuItemService
+from .branch_menu_service import BranchMenuService
+from .menu_analytics_service import MenuAnalytics, MenuAnalyticsService
+from .menu_export_service import MenuExportFormat, MenuExportService
+from .menu_facet_service import MenuFacet, MenuFacets, MenuFacetService
+from .menu_image_gc_service import MenuImageGCReport, MenuImageGCService
+from .menu_image_resize_service import MenuImageResizeService, ResizedImage
+from .menu_image_service import IMAGE_FOLDER, MenuImageService
+from .menu_image_worker import MenuImageJob, MenuImageWorker, publish_image_job
+from .menu_import_service import (
+    MenuImportFormat,
+    MenuImportReport,
+    MenuImportService,
+    iter_import_rows,
+)
+from .menu_item_service import ClonedMenuItem, MenuItemService
+from .menu_search_service import MenuSearchResult, MenuSearchService
+from .menu_sync_service import MenuChangeSet, MenuSyncService
 
-__all__ = ["MenuItemService", "MenuImageService"]
+__all__ = [
+    "BranchMenuService",
+    "MenuItemService",
+    "MenuImageService",
+    "IMAGE_FOLDER",
+    "MenuImageResizeService",
+    "MenuImageGCService",
+    "MenuImageGCReport",
+    "ResizedImage",
+    "MenuImageWorker",
+    "MenuImageJob",
+    "publish_image_job",
+    "MenuSyncService",
+    "MenuChangeSet",
+    "ClonedMenuItem",
+    "MenuImportService",
+    "MenuImportReport",
+    "MenuImportFormat",
+    "iter_import_rows",
+    "MenuExportService",
+    "MenuExportFormat",
+    "MenuSearchService",
+    "MenuSearchResult",
+    "MenuAnalyticsService",
+    "MenuAnalytics",
+    "MenuFacetService",
+    "MenuFacets",
+    "MenuFacet",
+]
@@ -0,0 +1,160 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.models import CompanyBranchMenu
+from src.backoffice.apps.menu.repositories import (
+    CompanyBranchMenuRepository,
+    MenuItemRepository,
+)
+from src.backoffice.apps.menu.repositories.company_branch_menu_repository import (
+    AvailabilityChange,
+    PriceCell,
+)
+from src.backoffice.apps.menu.schemas import (
+    PriceMatrixCell,
+    PriceMatrixCellError,
+    PriceMatrixRow,
+    StopListToggle,
+)
+
+# Numeric(10, 2)
+MAX_PRICE = Decimal("99999999.99")
+
+
+class BranchMenuService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = CompanyBranchMenuRepository(session)
+        self.menu_item_repository = MenuItemRepository(session)
+
+    async def get_stop_list(self, company_branch_id: int) -> List[CompanyBranchMenu]:
+        return await self.repository.list_by_branch(
+            company_branch_id=company_branch_id, available=False
+        )
+
+    async def apply_stop_list(
+        self, company_branch_id: int, toggles: Iterable[StopListToggle]
+    ) -> List[CompanyBranchMenu]:
+        """Applies availability toggles and returns the resulting item states"""
+        changes = self.coalesce_toggles(toggles)
+        await self.repository.apply_availability(company_branch_id, changes)
+        return await self.repository.list_by_branch(
+            company_branch_id=company_branch_id,
+            menu_item_ids=changes.keys(),
+            refresh=True,
+        )
+
+    async def get_price_matrix(
+        self, company_id: int, company_branch_ids: Sequence[int]
+    ) -> List[PriceMatrixRow]:
+        rows = await self.repository.list_price_matrix(company_id, company_branch_ids)
+
+        matrix: Dict[int, PriceMatrixRow] = {}
+        for row in rows:
+            matrix_row = matrix.get(row.menu_item_id)
+            if matrix_row is None:
+                matrix_row = matrix[row.menu_item_id] = PriceMatrixRow(
+                    menu_item_id=row.menu_item_id, slug=row.slug, name=row.name
+                )
+            if row.company_branch_id is not None:
+                matrix_row.prices[row.company_branch_id] = row.price
+        return list(matrix.values())
+
+    async def set_prices(
+        self,
+        company_id: int,
+        company_branch_ids: Set[int],
+        cells: Sequence[PriceMatrixCell],
+    ) -> Tuple[List[PriceCell], List[PriceMatrixCellError]]:
+        """
+        Validates cells against the company branches and menu and upserts the
+        valid ones. Returns the written cells and the rejected ones.
+        """
+        owned_item_ids = await self.menu_item_repository.list_owned_ids(
+            company_id, {cell.menu_item_id for cell in cells}
+        )
+
+        prices: Dict[Tuple[int, int], Decimal] = {}
+        errors: List[PriceMatrixCellError] = []
+        for index, cell in enumerate(cells):
+            message = self._validate_price_cell(
+                cell, company_branch_ids, owned_item_ids
+            )
+            if message is not None:
+                errors.append(
+                    PriceMatrixCellError(
+                        index=index,
+                        company_branch_id=cell.company_branch_id,
+                        menu_item_id=cell.menu_item_id,
+                        message=message,
+                    )
+                )
+                continue
+            # A cell repeated in the request is written once, with its last value
+            prices[(cell.company_branch_id, cell.menu_item_id)] = cell.price
+
+        applied = [
+            (company_branch_id, menu_item_id, price)
+            for (company_branch_id, menu_item_id), price in sorted(prices.items())
+        ]
+        await self.repository.upsert_prices(applied)
+        return applied, errors
+
+    async def add_items(
+        self,
+        company_branch_ids: Sequence[int],
+        menu_item_ids: Sequence[int],
+        price: Decimal,
+    ) -> None:
+        """Puts the items on every given branch menu with the same price"""
+        await self.repository.upsert_prices(
+            [
+                (company_branch_id, menu_item_id, price)
+                for company_branch_id in company_branch_ids
+                for menu_item_id in menu_item_ids
+            ]
+        )
+
+    @staticmethod
+    def _validate_price_cell(
+        cell: PriceMatrixCell,
+        company_branch_ids: Set[int],
+        owned_item_ids: Set[int],
+    ) -> Optional[str]:
+        if cell.company_branch_id not in company_branch_ids:
+            return f"Company branch with id {cell.company_branch_id} not found"
+        if cell.menu_item_id not in owned_item_ids:
+            return f"Menu item with id {cell.menu_item_id} not found"
+        if cell.price < 0:
+            return "Price must not be negative"
+        if cell.price > MAX_PRICE:
+            return f"Price must not exceed {MAX_PRICE}"
+        if cell.price != cell.price.quantize(Decimal("0.01")):
+            return "Price must have at most 2 decimal places"
+        return None
+
+    @staticmethod
+    def coalesce_toggles(
+        toggles: Iterable[StopListToggle],
+    ) -> Dict[int, AvailabilityChange]:
+        """
+        Keeps the latest toggle per item. Toggles without a device time are
+        stamped with the server time, device times from the future are clamped
+        to it so a skewed clock cannot pin an item.
+        """
+        now = datetime.now(timezone.utc)
+        changes: Dict[int, AvailabilityChange] = {}
+        for toggle in toggles:
+            changed_at = toggle.changed_at or now
+            if changed_at.tzinfo is None:
+                changed_at = changed_at.replace(tzinfo=timezone.utc)
+            changed_at = min(changed_at, now)
+
+            current = changes.get(toggle.menu_item_id)
+            # On equal times the toggle sent later wins
+            if current is None or changed_at >= current[1]:
+                changes[toggle.menu_item_id] = (toggle.available, changed_at)
+        return changes
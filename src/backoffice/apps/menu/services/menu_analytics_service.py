@@ -0,0 +1,245 @@
+import math
+import statistics
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.repositories import MenuItemRepository, NutritionRow
+from src.backoffice.core.services.versioned_cache import VersionedCache
+
+NUTRIENTS = ("kilocalories", "proteins", "fats", "carbohydrated")
+METRICS = ("grams",) + NUTRIENTS
+
+# Tukey fences: values further than this many IQRs outside the quartiles
+OUTLIER_IQR_FACTOR = 1.5
+# Quartiles of fewer values are too noisy to call anything an outlier
+MIN_OUTLIER_SAMPLE = 4
+MAX_OUTLIERS = 50
+
+
+@dataclass
+class NutritionStats:
+    count: int = 0
+    missing: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    p25: Optional[float] = None
+    p75: Optional[float] = None
+    p90: Optional[float] = None
+    stdev: Optional[float] = None
+
+
+@dataclass
+class CategoryNutrition:
+    category_slug: str
+    category_name: str
+    item_count: int
+    mean: Dict[str, Optional[float]] = field(default_factory=dict)
+    mean_per_100g: Dict[str, Optional[float]] = field(default_factory=dict)
+
+
+@dataclass
+class NutritionOutlier:
+    slug: str
+    name: str
+    metric: str
+    value_per_100g: float
+    lower_bound: float
+    upper_bound: float
+
+
+@dataclass
+class MenuAnalytics:
+    version: str
+    item_count: int = 0
+    distributions: Dict[str, NutritionStats] = field(default_factory=dict)
+    per_100g: Dict[str, NutritionStats] = field(default_factory=dict)
+    categories: List[CategoryNutrition] = field(default_factory=list)
+    outliers: List[NutritionOutlier] = field(default_factory=list)
+
+
+class NutritionColumns:
+    """
+    Menu nutrition as one float column per metric, NaN where a value is not
+    filled in, so every statistic is a pass over a flat array
+    """
+
+    def __init__(self, rows: Sequence[NutritionRow]):
+        self.rows = rows
+        self.values: Dict[str, array] = {
+            metric: array(
+                "d",
+                (
+                    math.nan if value is None else value
+                    for value in (getattr(row, metric) for row in rows)
+                ),
+            )
+            for metric in METRICS
+        }
+        grams = self.values["grams"]
+        self.per_100g: Dict[str, array] = {
+            metric: array(
+                "d", (value * 100 / g for value, g in zip(self.values[metric], grams))
+            )
+            for metric in NUTRIENTS
+        }
+
+    def category_indices(self) -> Dict[int, List[int]]:
+        indices: Dict[int, List[int]] = defaultdict(list)
+        for index, row in enumerate(self.rows):
+            indices[row.category_id].append(index)
+        return indices
+
+
+class MenuAnalyticsService:
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: Optional[VersionedCache[MenuAnalytics]] = None,
+    ):
+        self.session = session
+        self.repository = MenuItemRepository(session)
+        self.cache = menu_analytics_cache if cache is None else cache
+
+    async def get_analytics(
+        self, company_id: int, company_branch_id: Optional[int] = None
+    ) -> MenuAnalytics:
+        """
+        Computed once per menu version: a cheap aggregate query tells whether
+        the cached result is still current before the menu is fetched
+        """
+        version = "-".join(
+            str(part)
+            for part in await self.repository.get_menu_version(
+                company_id, company_branch_id
+            )
+        )
+        key = (company_id, company_branch_id)
+        analytics = self.cache.get(key, version)
+        if analytics is None:
+            rows = await self.repository.list_nutrition_rows(
+                company_id, company_branch_id
+            )
+            analytics = self.compute(rows, version)
+            self.cache.set(key, version, analytics)
+        return analytics
+
+    @classmethod
+    def compute(cls, rows: Sequence[NutritionRow], version: str = "") -> MenuAnalytics:
+        columns = NutritionColumns(rows)
+        return MenuAnalytics(
+            version=version,
+            item_count=len(rows),
+            distributions={
+                metric: cls.describe(values)
+                for metric, values in columns.values.items()
+            },
+            per_100g={
+                metric: cls.describe(values)
+                for metric, values in columns.per_100g.items()
+            },
+            categories=cls._categories(columns),
+            outliers=cls._outliers(columns),
+        )
+
+    @staticmethod
+    def describe(values: Sequence[float]) -> NutritionStats:
+        present = sorted(value for value in values if not math.isnan(value))
+        stats = NutritionStats(count=len(present), missing=len(values) - len(present))
+        if not present:
+            return stats
+
+        stats.min, stats.max = present[0], present[-1]
+        stats.mean = statistics.fmean(present)
+        stats.median = statistics.median(present)
+        if len(present) > 1:
+            percentiles = statistics.quantiles(present, n=20, method="inclusive")
+            stats.p25, stats.p75, stats.p90 = (
+                percentiles[4],
+                percentiles[14],
+                percentiles[17],
+            )
+            stats.stdev = statistics.stdev(present, stats.mean)
+        else:
+            stats.p25 = stats.p75 = stats.p90 = present[0]
+            stats.stdev = 0.0
+        return stats
+
+    @staticmethod
+    def _mean(values: Sequence[float], indices: Sequence[int]) -> Optional[float]:
+        present = [values[i] for i in indices if not math.isnan(values[i])]
+        return statistics.fmean(present) if present else None
+
+    @classmethod
+    def _categories(cls, columns: NutritionColumns) -> List[CategoryNutrition]:
+        categories = []
+        for indices in columns.category_indices().values():
+            row = columns.rows[indices[0]]
+            categories.append(
+                CategoryNutrition(
+                    category_slug=row.category_slug,
+                    category_name=row.category_name,
+                    item_count=len(indices),
+                    mean={
+                        metric: cls._mean(values, indices)
+                        for metric, values in columns.values.items()
+                    },
+                    mean_per_100g={
+                        metric: cls._mean(values, indices)
+                        for metric, values in columns.per_100g.items()
+                    },
+                )
+            )
+        categories.sort(
+            key=lambda category: (-category.item_count, category.category_slug)
+        )
+        return categories
+
+    @staticmethod
+    def _fences(values: Sequence[float]) -> Optional[Tuple[float, float]]:
+        present = [value for value in values if not math.isnan(value)]
+        if len(present) < MIN_OUTLIER_SAMPLE:
+            return None
+        q1, _, q3 = statistics.quantiles(present, n=4, method="inclusive")
+        spread = (q3 - q1) * OUTLIER_IQR_FACTOR
+        return q1 - spread, q3 + spread
+
+    @classmethod
+    def _outliers(cls, columns: NutritionColumns) -> List[NutritionOutlier]:
+        """Dishes far off the rest of the menu per 100g, the most extreme first"""
+        found: List[Tuple[float, NutritionOutlier]] = []
+        for metric, values in columns.per_100g.items():
+            fences = cls._fences(values)
+            if fences is None:
+                continue
+            lower, upper = fences
+            for index, value in enumerate(values):
+                if lower <= value <= upper or math.isnan(value):
+                    continue
+                row = columns.rows[index]
+                distance = (lower - value if value < lower else value - upper) / (
+                    (upper - lower) or 1.0
+                )
+                found.append(
+                    (
+                        distance,
+                        NutritionOutlier(
+                            slug=row.slug,
+                            name=row.name,
+                            metric=metric,
+                            value_per_100g=value,
+                            lower_bound=lower,
+                            upper_bound=upper,
+                        ),
+                    )
+                )
+        found.sort(key=lambda item: -item[0])
+        return [outlier for _, outlier in found[:MAX_OUTLIERS]]
+
+
+menu_analytics_cache: VersionedCache[MenuAnalytics] = VersionedCache()
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.repositories import MenuItemRepository
+
+# Superset of the import columns, so an export can be imported back
+EXPORT_COLUMNS = (
+    "slug",
+    "name",
+    "description",
+    "category_slug",
+    "category_name",
+    "grams",
+    "kilocalories",
+    "proteins",
+    "fats",
+    "carbohydrated",
+    "image_file_path",
+)
+
+
+class MenuExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @property
+    def media_type(self) -> str:
+        if self == MenuExportFormat.CSV:
+            return "text/csv"
+        return "application/x-ndjson"
+
+
+class MenuExportService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = MenuItemRepository(session)
+
+    async def export_items(
+        self,
+        company_id: int,
+        export_format: MenuExportFormat,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[str]:
+        """Encoded company menu, one chunk per fetched batch of rows"""
+        if export_format == MenuExportFormat.CSV:
+            # Header goes out before the query, the client sees bytes at once
+            yield self._to_csv([EXPORT_COLUMNS])
+
+        async for rows in self.repository.stream_company_export(
+            company_id, chunk_size=chunk_size
+        ):
+            if export_format == MenuExportFormat.CSV:
+                yield self._to_csv(rows)
+            else:
+                yield self._to_ndjson(rows)
+
+    @staticmethod
+    def _to_csv(rows: Sequence[Sequence]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _to_ndjson(rows: Sequence[Row]) -> str:
+        return "".join(
+            json.dumps(row._asdict(), ensure_ascii=False) + "\n" for row in rows
+        )
@@ -0,0 +1,104 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.repositories import FacetCountRow, MenuItemRepository
+from src.backoffice.core.services.versioned_cache import VersionedCache
+
+# Kilocalorie buckets as (label, exclusive upper bound), the last one open
+CALORIE_BUCKETS = (
+    ("0-199", 200),
+    ("200-399", 400),
+    ("400-599", 600),
+    ("600-799", 800),
+    ("800+", None),
+)
+UNKNOWN_CALORIES = "unknown"
+
+
+class MenuFacet(str, Enum):
+    CATEGORY = "category"
+    CALORIES = "calories"
+    HAS_IMAGE = "has_image"
+
+
+@dataclass
+class MenuFacets:
+    version: str
+    total: int = 0
+    facets: Dict[str, List[FacetCountRow]] = field(default_factory=dict)
+
+
+class MenuFacetService:
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: Optional[VersionedCache[MenuFacets]] = None,
+    ):
+        self.session = session
+        self.repository = MenuItemRepository(session)
+        self.cache = menu_facets_cache if cache is None else cache
+
+    async def get_facets(
+        self,
+        company_id: int,
+        facets: Sequence[MenuFacet] = tuple(MenuFacet),
+        company_branch_id: Optional[int] = None,
+        category_slug: Optional[str] = None,
+        calories: Optional[str] = None,
+        has_image: Optional[bool] = None,
+    ) -> MenuFacets:
+        """Facet counts of the menu, computed once per menu version and filters"""
+        buckets = [label for label, _ in CALORIE_BUCKETS] + [UNKNOWN_CALORIES]
+        if calories is not None and calories not in buckets:
+            raise ValueError(
+                f"Unknown calorie bucket '{calories}', "
+                f"expected one of: {', '.join(buckets)}"
+            )
+        facet_names = [facet.value for facet in dict.fromkeys(facets)]
+
+        version = "-".join(
+            str(part)
+            for part in await self.repository.get_menu_version(
+                company_id, company_branch_id, with_images=True
+            )
+        )
+        key = (
+            company_id,
+            company_branch_id,
+            tuple(facet_names),
+            category_slug,
+            calories,
+            has_image,
+        )
+        result = self.cache.get(key, version)
+        if result is not None:
+            return result
+
+        rows = await self.repository.count_facets(
+            company_id,
+            facet_names,
+            CALORIE_BUCKETS,
+            UNKNOWN_CALORIES,
+            company_branch_id=company_branch_id,
+            category_slug=category_slug,
+            calorie_bucket=calories,
+            has_image=has_image,
+        )
+        result = MenuFacets(version=version)
+        result.facets = {name: [] for name in facet_names}
+        for row in rows:
+            if row.facet is None:
+                result.total = row.count
+            elif row.count:
+                result.facets[row.facet].append(row)
+        for name, values in result.facets.items():
+            values.sort(key=lambda row: (-row.count, str(row.value)))
+
+        self.cache.set(key, version, result)
+        return result
+
+
+menu_facets_cache: VersionedCache[MenuFacets] = VersionedCache(max_entries=1024)
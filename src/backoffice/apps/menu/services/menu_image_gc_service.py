@@ -0,0 +1,201 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.repositories import MenuImageRepository
+from src.backoffice.apps.menu.services.menu_image_service import IMAGE_FOLDER
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.s3_client import MAX_DELETE_KEYS, s3_client
+
+
+@dataclass
+class MenuImageGCReport:
+    dry_run: bool = False
+    scanned: int = 0
+    scanned_bytes: int = 0
+    # Younger than the grace period, possibly an upload still in progress
+    skipped_recent: int = 0
+    # Keys outside the folder layout, never touched
+    skipped_unknown: int = 0
+    orphaned: int = 0
+    orphaned_bytes: int = 0
+    deleted: int = 0
+    reclaimed_bytes: int = 0
+    failed: int = 0
+
+
+class RequestRateLimiter:
+    """Spaces requests at least 1 / `rate` seconds apart, unlimited without"""
+
+    def __init__(self, rate: Optional[float] = None):
+        self.interval = 1 / rate if rate else 0.0
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        # The slot is taken before sleeping, so concurrent callers queue up
+        now = time.monotonic()
+        at = max(now, self._next_at)
+        self._next_at = at + self.interval
+        if at > now:
+            await asyncio.sleep(at - now)
+
+
+def object_stem(folder: str, key: str) -> Optional[str]:
+    """
+    Stem of the original a stored object belongs to: `folder/{stem}.ext`
+    itself, or `folder/thumbnails/{stem}_{suffix}.ext` derived from it
+    """
+    if not key.startswith(f"{folder}/"):
+        return None
+    name = key[len(folder) + 1 :]
+    directory, _, filename = name.rpartition("/")
+    stem = os.path.splitext(filename)[0]
+    if directory == "thumbnails":
+        stem, separator, _ = stem.rpartition("_")
+        return stem if separator and stem else None
+    if directory:
+        return None
+    return stem or None
+
+
+class MenuImageGCService:
+    """
+    Deletes objects of the image folder no image refers to anymore: files of
+    deleted images and menu items, leftovers of failed uploads, and
+    thumbnails whose paths were guessed wrong on delete.
+
+    Objects are grouped by the stem of the original they derive from and
+    kept while an image row still has that original. The bucket is walked a
+    page at a time with one batched lookup per page, so memory is bounded by
+    the page size however large the bucket is.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        folder: str = IMAGE_FOLDER,
+        page_size: int = MAX_DELETE_KEYS,
+        min_age: timedelta = timedelta(hours=24),
+        rate: Optional[float] = None,
+        dry_run: bool = False,
+    ):
+        self.repository = MenuImageRepository(session)
+        self.folder = folder
+        self.page_size = page_size
+        self.min_age = min_age
+        self.limiter = RequestRateLimiter(rate)
+        self.dry_run = dry_run
+        self._logger = get_logger("menu_images")
+
+    async def collect(self) -> MenuImageGCReport:
+        report = MenuImageGCReport(dry_run=self.dry_run)
+        cutoff = datetime.now(timezone.utc) - self.min_age
+        pending: List[Tuple[str, dict]] = []
+
+        await self.limiter.wait()
+        async for page in s3_client.list_objects(f"{self.folder}/", self.page_size):
+            candidates: Dict[str, List[dict]] = {}
+            for item in page:
+                report.scanned += 1
+                report.scanned_bytes += item["Size"]
+                if item["LastModified"] > cutoff:
+                    report.skipped_recent += 1
+                    continue
+                stem = object_stem(self.folder, item["Key"])
+                if stem is None:
+                    report.skipped_unknown += 1
+                    continue
+                candidates.setdefault(stem, []).append(item)
+
+            referenced = await self.repository.get_referenced_stems(
+                self.folder, candidates
+            )
+            for stem, items in candidates.items():
+                if stem in referenced:
+                    continue
+                for item in items:
+                    report.orphaned += 1
+                    report.orphaned_bytes += item["Size"]
+                    pending.append((stem, item))
+                    if len(pending) == MAX_DELETE_KEYS:
+                        await self._delete(pending, cutoff, report)
+                        pending = []
+            await self.limiter.wait()
+
+        await self._delete(pending, cutoff, report)
+        self._logger.info("image_gc_finished", extra=vars(report))
+        return report
+
+    async def _delete(
+        self,
+        pending: List[Tuple[str, dict]],
+        cutoff: datetime,
+        report: MenuImageGCReport,
+    ) -> None:
+        """
+        Right before deleting, every object is checked with HEAD and then the
+        stems are looked up again: an upload of the same contents may have
+        written a content-addressed key since the listing, its row still
+        uncommitted
+        """
+        if not pending or self.dry_run:
+            return
+        pending = await self._still_old(pending, cutoff, report)
+        referenced = await self.repository.get_referenced_stems(
+            self.folder, {stem for stem, _ in pending}
+        )
+        items = [item for stem, item in pending if stem not in referenced]
+        if not items:
+            return
+
+        await self.limiter.wait()
+        failed = set(await s3_client.delete_files([item["Key"] for item in items]))
+        for item in items:
+            if item["Key"] in failed:
+                report.failed += 1
+            else:
+                report.deleted += 1
+                report.reclaimed_bytes += item["Size"]
+        if failed:
+            self._logger.warning("image_gc_delete_failed", extra={"count": len(failed)})
+
+    async def _still_old(
+        self,
+        pending: List[Tuple[str, dict]],
+        cutoff: datetime,
+        report: MenuImageGCReport,
+    ) -> List[Tuple[str, dict]]:
+        """The objects still older than `cutoff`, read with HEAD requests"""
+        # No more requests in flight than the S3 pool has threads
+        semaphore = asyncio.Semaphore(s3_client.pool.max_workers)
+
+        async def last_modified(key: str) -> Optional[datetime]:
+            async with semaphore:
+                await self.limiter.wait()
+                return await s3_client.get_last_modified(key)
+
+        results = await asyncio.gather(
+            *(last_modified(item["Key"]) for _, item in pending),
+            return_exceptions=True,
+        )
+        still_old = []
+        for (stem, item), modified in zip(pending, results):
+            if isinstance(modified, Exception):
+                report.failed += 1
+                self._logger.warning(
+                    "image_gc_head_failed",
+                    extra={"key": item["Key"]},
+                    exc_info=modified,
+                )
+            elif modified is not None and modified > cutoff:
+                report.skipped_recent += 1
+            elif modified is not None:
+                still_old.append((stem, item))
+        return still_old
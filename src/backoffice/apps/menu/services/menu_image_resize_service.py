@@ -0,0 +1,129 @@
+import mmap
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.repositories import MenuImageRepository
+from src.backoffice.core.config import s3_settings
+from src.backoffice.core.exceptions import NotFoundError
+from src.backoffice.core.services.disk_cache import DiskLRUCache
+from src.backoffice.core.services.image_processing import (
+    ImageFormat,
+    preferred_mime_type,
+    resize_to_width,
+)
+from src.backoffice.core.services.s3_client import s3_client
+from src.backoffice.core.services.single_flight import SingleFlight
+
+
+@dataclass
+class ResizedImage:
+    mime_type: str
+    # Freshly resized bytes, or a mapping of the disk cache entry
+    content: Union[bytes, mmap.mmap]
+
+    def chunks(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """The content piece by piece, unmapping the cache entry at the end"""
+        view = memoryview(self.content)
+        try:
+            for start in range(0, len(view), chunk_size):
+                yield view[start : start + chunk_size].tobytes()
+        finally:
+            view.release()
+            if isinstance(self.content, mmap.mmap):
+                self.content.close()
+
+
+class MenuImageResizeService:
+    """
+    Menu images at any whitelisted width and format, resized on request.
+
+    A variant is looked up on local disk, then in S3 (resized earlier by
+    another worker), and only then resized from the original; concurrent
+    requests for one variant share that work.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: Optional[DiskLRUCache] = None,
+        flights: Optional[SingleFlight[bytes]] = None,
+    ):
+        self.session = session
+        self.repository = MenuImageRepository(session)
+        self.cache = resized_image_cache if cache is None else cache
+        self.flights = resize_flights if flights is None else flights
+
+    async def get_resized(
+        self,
+        image_id: int,
+        width: int,
+        image_format: Optional[str] = None,
+        accept: Optional[str] = None,
+    ) -> ResizedImage:
+        """`image_format` by name (jpeg, webp), or negotiated from `accept`"""
+        if width not in s3_settings.resize_widths:
+            raise ValueError(
+                "Width must be one of "
+                + ", ".join(str(width) for width in s3_settings.resize_widths)
+            )
+        formats: Dict[str, ImageFormat] = {
+            candidate.name.lower(): candidate
+            for candidate in s3_client.thumbnail_formats
+        }
+        if image_format is None:
+            mime_type = preferred_mime_type(
+                accept, (candidate.mime_type for candidate in formats.values())
+            )
+            target = next(
+                candidate
+                for candidate in formats.values()
+                if candidate.mime_type == mime_type
+            )
+        elif image_format.lower() in formats:
+            target = formats[image_format.lower()]
+        else:
+            raise ValueError("Format must be one of " + ", ".join(formats))
+
+        image = await self.repository.get_by_id(image_id)
+        if image is None or not image.is_active:
+            raise NotFoundError(f"Image with id {image_id} not found")
+
+        # Never upscaled: wider requests share the original width's variant
+        if image.width:
+            width = min(width, image.width)
+        path = s3_client.thumbnail_path(image.file_path, f"w{width}", target.extension)
+
+        mapped = self.cache.open(path)
+        if mapped is not None:
+            return ResizedImage(mime_type=target.mime_type, content=mapped)
+        content = await self.flights.do(
+            path, lambda: self._resize(image.file_path, path, width, target)
+        )
+        return ResizedImage(mime_type=target.mime_type, content=content)
+
+    async def _resize(
+        self, file_path: str, path: str, width: int, image_format: ImageFormat
+    ) -> bytes:
+        content = await s3_client.get_object(path)
+        if content is None:
+            with tempfile.NamedTemporaryFile() as original:
+                if not await s3_client.download_file(file_path, original.name):
+                    raise NotFoundError(f"Image file {file_path} not found")
+                rendered = await s3_client.image_pool.run(
+                    "resize", resize_to_width, original.name, width, image_format
+                )
+            content = rendered.content
+            await s3_client.store_object(path, content, image_format.mime_type)
+        await self.cache.put(path, content)
+        return content
+
+
+resized_image_cache = DiskLRUCache(
+    s3_settings.resize_cache_dir,
+    s3_settings.resize_cache_max_bytes,
+    metric_prefix="resized_image_cache",
+)
+resize_flights: SingleFlight[bytes] = SingleFlight(metric_prefix="image_resize")
@@ -1,15 +1,132 @@
-from typing import List, Optional
+import asyncio
+import contextlib
+import tempfile
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backoffice.apps.menu.models import MenuImage
+from src.backoffice.apps.menu.models import MenuImage, MenuImageStatus
 from src.backoffice.apps.menu.repositories import (
     MenuImageRepository,
     MenuItemRepository,
 )
+from src.backoffice.core.config import s3_settings
 from src.backoffice.core.exceptions import NotFoundError
-from src.backoffice.core.services.s3_client import s3_client
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.image_processing import (
+    JPEG,
+    PREFERRED_MIME_TYPES,
+    preferred_mime_type,
+)
+from src.backoffice.core.services.s3_client import (
+    THUMBNAIL_SIZE_NAMES,
+    is_transient_error,
+    s3_client,
+)
+from src.backoffice.core.services.upload_stream import ReceivedUpload
+
+logger = get_logger("menu_images")
+
+# Bucket folder of uploaded originals, thumbnails go to its thumbnails/
+IMAGE_FOLDER = "menu-images"
+VARIANT_FIELDS = ("size", "width", "height", "file_path", "file_size", "mime_type")
+# What an upload reuses from an earlier image with the same contents
+STORED_FIELDS = (
+    "filename",
+    "file_path",
+    "file_size",
+    "mime_type",
+    "width",
+    "height",
+    "variants",
+)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Storage outages a background image job is worth running again for"""
+    return isinstance(error, TimeoutError) or is_transient_error(error)
+
+
+def variant_mime_type(variant: Dict[str, Any]) -> str:
+    # Variants recorded before other formats existed are all JPEG
+    return variant.get("mime_type", JPEG.mime_type)
+
+
+def image_sources(
+    file_path: str,
+    width: Optional[int],
+    variants: Optional[Iterable[Dict[str, Any]]],
+    mime_type: Optional[str] = None,
+    with_original: bool = True,
+) -> List[Tuple[str, int]]:
+    """
+    Stored copies of an image as (file_path, width), narrowest first: the
+    `mime_type` variants when given, and the original as the widest
+    """
+    by_width: Dict[int, str] = {}
+    for variant in variants or ():
+        if mime_type is None or variant_mime_type(variant) == mime_type:
+            by_width.setdefault(variant["width"], variant["file_path"])
+    if width and with_original:
+        by_width.setdefault(width, file_path)
+    return [(path, w) for w, path in sorted(by_width.items())]
+
+
+def image_paths(file_path: str, variants: Optional[Iterable[Dict[str, Any]]]):
+    yield file_path
+    for variant in variants or ():
+        yield variant["file_path"]
+
+
+def build_srcset(sources: Sequence[Tuple[str, int]], urls: Dict[str, str]):
+    """`srcset` attribute value, e.g. "<url> 150w, <url> 600w" """
+    if not sources:
+        return None
+    return ", ".join(f"{urls[path]} {width}w" for path, width in sources)
+
+
+def image_urls(
+    image: Any, urls: Dict[str, str], accept: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    `url`, `srcset` in the best format the Accept header names, and `sources`
+    with a srcset per stored format, best first, for a <picture> element
+    """
+    mime_types = {variant_mime_type(variant) for variant in image.variants or ()}
+    sources = [
+        {
+            "type": mime_type,
+            # Typed sources only list files of their type
+            "srcset": build_srcset(
+                image_sources(
+                    image.file_path,
+                    image.width,
+                    image.variants,
+                    mime_type,
+                    with_original=image.mime_type == mime_type,
+                ),
+                urls,
+            ),
+        }
+        for mime_type in PREFERRED_MIME_TYPES
+        if mime_type in mime_types
+    ]
+    preferred = preferred_mime_type(accept, mime_types)
+    return {
+        "url": urls[image.file_path],
+        "srcset": build_srcset(
+            image_sources(
+                image.file_path,
+                image.width,
+                image.variants,
+                preferred if mime_types else None,
+            ),
+            urls,
+        ),
+        "sources": sources,
+    }
 
 
 class MenuImageService:
@@ -25,24 +142,37 @@ class MenuImageService:
         alt_text: Optional[str] = None,
         is_primary: bool = False,
         display_order: int = 0,
+        background: bool = False,
     ) -> MenuImage:
+        """
+        With `background` only the original is stored here: the image is
+        left processing under a new `job_id` for `process_image` to finish
+        """
         menu_item = await self.menu_item_repository.get_by_id(menu_item_id)
         if not menu_item:
             raise NotFoundError(f"Menu item with id {menu_item_id} not found")
 
-        upload_result = await s3_client.upload_file(file, folder="menu-images")
+        status = MenuImageStatus.READY
+        async with s3_client.receive_upload(file) as received:
+            await self.repository.lock_contents([received.content_hash])
+            existing = await self.repository.get_by_content_hash(received.content_hash)
+            if existing is None:
+                stored = await self._store(received, not background)
+                if background:
+                    status = MenuImageStatus.PROCESSING
+            else:
+                # Same contents uploaded before: its files serve this one too
+                stored = {field: getattr(existing, field) for field in STORED_FIELDS}
 
         if is_primary:
             await self.repository.unset_primary_images(menu_item_id)
 
         menu_image_data = {
-            "filename": upload_result["filename"],
-            "original_filename": upload_result["original_filename"],
-            "file_path": upload_result["file_path"],
-            "file_size": upload_result["file_size"],
-            "mime_type": upload_result["mime_type"],
-            "width": upload_result.get("width"),
-            "height": upload_result.get("height"),
+            **stored,
+            "original_filename": received.original_filename,
+            "content_hash": received.content_hash,
+            "status": status.value,
+            "job_id": uuid.uuid4().hex if background else None,
             "alt_text": alt_text,
             "menu_item_id": menu_item_id,
             "display_order": display_order,
@@ -53,9 +183,130 @@ class MenuImageService:
         menu_image = await self.repository.create(**menu_image_data)
         return await self._add_url_to_image(menu_image)
 
+    async def upload_images(
+        self,
+        menu_item_id: int,
+        files: Sequence[UploadFile],
+        alt_texts: Optional[Sequence[Optional[str]]] = None,
+        primary_index: Optional[int] = None,
+        display_order: int = 0,
+    ) -> None:
+        """
+        Uploads several images at once, `display_order` onwards in the order
+        of `files`. New contents are stored and rendered concurrently, at
+        most `batch_upload_concurrency` at a time; the rows are inserted
+        together.
+        """
+        if not files:
+            raise ValueError("No files to upload")
+        if len(files) > s3_settings.batch_upload_max_files:
+            raise ValueError(
+                f"At most {s3_settings.batch_upload_max_files} files per upload"
+            )
+        if alt_texts is not None and len(alt_texts) != len(files):
+            raise ValueError("Alternative texts must match the files one to one")
+        if primary_index is not None and not 0 <= primary_index < len(files):
+            raise ValueError("Primary image index is out of range")
+
+        menu_item = await self.menu_item_repository.get_by_id(menu_item_id)
+        if not menu_item:
+            raise NotFoundError(f"Menu item with id {menu_item_id} not found")
+
+        async with contextlib.AsyncExitStack() as stack:
+            received = [
+                await stack.enter_async_context(s3_client.receive_upload(file))
+                for file in files
+            ]
+            await self.repository.lock_contents(
+                upload.content_hash for upload in received
+            )
+            existing = await self.repository.get_by_content_hashes(
+                upload.content_hash for upload in received
+            )
+            stored = {
+                content_hash: {field: getattr(image, field) for field in STORED_FIELDS}
+                for content_hash, image in existing.items()
+            }
+            # Contents repeated within the batch are stored once
+            pending = {
+                upload.content_hash: upload
+                for upload in received
+                if upload.content_hash not in stored
+            }
+            stored.update(await self._store_many(pending))
+
+        if primary_index is not None:
+            await self.repository.unset_primary_images(menu_item_id)
+
+        await self.repository.insert_many(
+            [
+                {
+                    **stored[upload.content_hash],
+                    "original_filename": upload.original_filename,
+                    "content_hash": upload.content_hash,
+                    "status": MenuImageStatus.READY.value,
+                    "alt_text": alt_texts[index] if alt_texts else None,
+                    "menu_item_id": menu_item_id,
+                    "display_order": display_order + index,
+                    "is_primary": index == primary_index,
+                    "is_active": True,
+                }
+                for index, upload in enumerate(received)
+            ]
+        )
+
+    async def get_by_job_id_or_raise(self, job_id: str) -> MenuImage:
+        image = await self.repository.get_by_job_id(job_id)
+        if not image:
+            raise NotFoundError(f"Image job {job_id} not found")
+        return image
+
+    async def process_image(
+        self, image_id: int, retry_outages: bool = False
+    ) -> Optional[MenuImage]:
+        """
+        Renders the variants of an image left processing by a background
+        upload; None when there is nothing left to do for it. An image that
+        cannot be read fails. With `retry_outages` a storage outage (see
+        `is_retryable`) is raised instead, the image left processing for
+        the job to run again.
+        """
+        image = await self.repository.get_by_id(image_id)
+        if image is None or image.status != MenuImageStatus.PROCESSING.value:
+            return None
+
+        try:
+            with tempfile.NamedTemporaryFile() as original:
+                if not await s3_client.download_file(image.file_path, original.name):
+                    raise NotFoundError(f"Image file {image.file_path} not found")
+                stored = await s3_client.store_thumbnails(
+                    original.name, image.file_path, strict=True
+                )
+        except Exception as e:
+            if retry_outages and is_retryable(e):
+                raise
+            logger.warning(
+                "image_processing_failed", extra={"image_id": image_id}, exc_info=e
+            )
+            image.status = MenuImageStatus.FAILED.value
+        else:
+            image.width = stored.get("width")
+            image.height = stored.get("height")
+            image.variants = [
+                {field: thumbnail[field] for field in VARIANT_FIELDS}
+                for thumbnail in stored["thumbnails"]
+            ]
+            image.status = MenuImageStatus.READY.value
+
+        await self.menu_item_repository.touch(image.menu_item_id)
+        await self.session.flush()
+        await self.session.refresh(image)
+        return image
+
     async def get_images_by_menu_item(self, menu_item_id: int) -> List[MenuImage]:
         images = await self.repository.get_by_menu_item(menu_item_id, active_only=True)
-        return [await self._add_url_to_image(image) for image in images]
+        await self.add_urls(images)
+        return images
 
     async def get_primary_image(self, menu_item_id: int) -> Optional[MenuImage]:
         image = await self.repository.get_primary_image(menu_item_id)
@@ -101,15 +352,17 @@ class MenuImageService:
         if not image:
             return False
 
-        await s3_client.delete_file(image.file_path)
+        # Template clones and uploads of the same contents share stored files
+        if image.content_hash is not None:
+            await self.repository.lock_contents([image.content_hash])
+        if not await self.repository.is_file_shared(image.file_path, image.id):
+            for file_path in self.stored_paths(image):
+                await s3_client.delete_file(file_path)
 
-        if image.file_path:
-            thumbnail_path = image.file_path.replace(
-                "menu-images/", "menu-images/thumbnails/"
-            )
-            await s3_client.delete_file(thumbnail_path)
-
-        return await self.repository.delete(image_id)
+        deleted = await self.repository.delete(image_id)
+        if deleted:
+            await self.menu_item_repository.touch(image.menu_item_id)
+        return deleted
 
     async def set_primary_image(self, image_id: int) -> MenuImage:
         image = await self.repository.get_by_id(image_id)
@@ -132,6 +385,79 @@ class MenuImageService:
         return await s3_client.get_presigned_url(image.file_path, expiry_hours)
 
     @staticmethod
-    async def _add_url_to_image(image: MenuImage) -> MenuImage:
-        image.url = await s3_client.get_presigned_url(image.file_path, 24)
+    def stored_paths(image: MenuImage) -> List[str]:
+        """The original and its thumbnails, as they were uploaded"""
+        if image.variants is None:
+            # Uploaded before variants were recorded
+            return [image.file_path] + [
+                s3_client.thumbnail_path(image.file_path, size_name)
+                for size_name in THUMBNAIL_SIZE_NAMES
+            ]
+        return list(image_paths(image.file_path, image.variants))
+
+    @staticmethod
+    async def add_urls(
+        images: Sequence[MenuImage], accept: Optional[str] = None
+    ) -> None:
+        """
+        Sets `url`, `srcset`, `sources` and `thumbnails`, signing all files at
+        once; `accept` is the client's Accept header
+        """
+        urls = await s3_client.get_urls(
+            path
+            for image in images
+            for path in image_paths(image.file_path, image.variants)
+        )
+        for image in images:
+            for name, value in image_urls(image, urls, accept).items():
+                setattr(image, name, value)
+            image.thumbnails = [
+                {
+                    **variant,
+                    "mime_type": variant_mime_type(variant),
+                    "url": urls[variant["file_path"]],
+                }
+                for variant in image.variants or ()
+            ]
+
+    async def _add_url_to_image(self, image: MenuImage) -> MenuImage:
+        await self.add_urls([image])
         return image
+
+    async def _store_many(
+        self, uploads: Dict[str, ReceivedUpload]
+    ) -> Dict[str, Dict[str, Any]]:
+        budget = asyncio.Semaphore(s3_settings.batch_upload_concurrency)
+
+        async def store(upload: ReceivedUpload) -> Dict[str, Any]:
+            async with budget:
+                return await self._store(upload)
+
+        results = await asyncio.gather(
+            *(store(upload) for upload in uploads.values()), return_exceptions=True
+        )
+        # Raised once every upload is done with its temporary file
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return dict(zip(uploads, results))
+
+    @staticmethod
+    async def _store(
+        received: ReceivedUpload, generate_thumbnails: bool = True
+    ) -> Dict[str, Any]:
+        upload_result = await s3_client.store_upload(
+            received, folder=IMAGE_FOLDER, generate_thumbnails=generate_thumbnails
+        )
+        return {
+            "filename": upload_result["filename"],
+            "file_path": upload_result["file_path"],
+            "file_size": upload_result["file_size"],
+            "mime_type": upload_result["mime_type"],
+            "width": upload_result.get("width"),
+            "height": upload_result.get("height"),
+            "variants": [
+                {field: thumbnail[field] for field in VARIANT_FIELDS}
+                for thumbnail in upload_result["thumbnails"]
+            ],
+        }
@@ -0,0 +1,125 @@
+import asyncio
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncContextManager, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.backoffice.apps.menu.events import MenuEventType, company_channel
+from src.backoffice.apps.menu.models import MenuImage
+from src.backoffice.apps.menu.repositories import MenuItemRepository
+from src.backoffice.apps.menu.services.menu_image_service import (
+    MenuImageService,
+    is_retryable,
+)
+from src.backoffice.core.config import s3_settings
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.event_bus import EventBus
+
+IMAGE_JOBS_TOPIC = "menu-image-jobs"
+IMAGE_WORKERS_GROUP = "menu-image-workers"
+
+
+@dataclass(frozen=True)
+class MenuImageJob:
+    job_id: str
+    image_id: int
+
+    def to_json(self) -> bytes:
+        return json.dumps(asdict(self)).encode()
+
+    @classmethod
+    def from_json(cls, raw: bytes) -> "MenuImageJob":
+        return cls(**json.loads(raw))
+
+
+async def publish_image_job(broker: Any, image: MenuImage) -> None:
+    job = MenuImageJob(job_id=image.job_id, image_id=image.id)
+    await broker.send(
+        IMAGE_JOBS_TOPIC, job.to_json(), key=str(image.menu_item_id).encode()
+    )
+
+
+class MenuImageWorker:
+    """
+    Consumer of image processing jobs: renders the variants of images
+    uploaded in the background, then announces the result on the company
+    channel.
+
+    Each job runs in its own session. A job hit by a storage outage is run
+    again after a backoff, up to `image_job_max_attempts` times in all; the
+    last attempt fails the image instead. Jobs delivered again after the
+    image was processed are skipped.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        broker: Any,
+        bus: EventBus,
+    ):
+        self.session_factory = session_factory
+        self.broker = broker
+        self.bus = bus
+        self._logger = get_logger("menu_images")
+
+    def run(self) -> AsyncContextManager[None]:
+        """Consumes jobs in the background while the context is open"""
+        return self.broker.consume(IMAGE_JOBS_TOPIC, IMAGE_WORKERS_GROUP, self.handle)
+
+    async def handle(self, value: bytes, key: Optional[bytes] = None) -> None:
+        try:
+            job = MenuImageJob.from_json(value)
+        except (TypeError, ValueError) as e:
+            self._logger.warning("image_job_decode_failed", exc_info=e)
+            return
+        max_attempts = max(s3_settings.image_job_max_attempts, 1)
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await self.process(job, retry_outages=attempt < max_attempts)
+                return
+            except Exception as e:
+                if attempt == max_attempts or not is_retryable(e):
+                    # Not the image's fault: it stays processing, uploading
+                    # it again starts over
+                    self._logger.warning(
+                        "image_job_failed", extra={"job_id": job.job_id}, exc_info=e
+                    )
+                    return
+                delay = s3_settings.image_job_retry_backoff * 2 ** (attempt - 1)
+                self._logger.warning(
+                    "image_job_retrying",
+                    extra={"job_id": job.job_id, "attempt": attempt, "delay": delay},
+                    exc_info=e,
+                )
+                await asyncio.sleep(delay)
+
+    async def process(
+        self, job: MenuImageJob, retry_outages: bool = False
+    ) -> Optional[MenuImage]:
+        async with self.session_factory() as session:
+            image = await MenuImageService(session).process_image(
+                job.image_id, retry_outages
+            )
+            if image is None:
+                return None
+            await session.commit()
+            menu_item = await MenuItemRepository(session).get_by_id(image.menu_item_id)
+
+        self._logger.info(
+            "image_job_processed",
+            extra={"job_id": job.job_id, "image_id": image.id, "status": image.status},
+        )
+        if menu_item is not None and menu_item.owner_company_id is not None:
+            await self.bus.publish(
+                company_channel(menu_item.owner_company_id),
+                MenuEventType.IMAGE_PROCESSED.value,
+                {
+                    "id": menu_item.id,
+                    "slug": menu_item.slug,
+                    "image_id": image.id,
+                    "job_id": job.job_id,
+                    "status": image.status,
+                },
+            )
+        return image
@@ -0,0 +1,202 @@
+import asyncio
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.repositories import CategoryRepository, MenuItemRepository
+from src.backoffice.apps.menu.schemas import MenuItemCreate
+from src.backoffice.core.services import SlugService
+
+# (row number, record, parse error)
+ImportRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+class MenuImportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @classmethod
+    def from_filename(cls, filename: Optional[str]) -> Optional["MenuImportFormat"]:
+        suffix = (filename or "").rsplit(".", 1)[-1].lower()
+        if suffix == "csv":
+            return cls.CSV
+        if suffix in ("ndjson", "jsonl"):
+            return cls.NDJSON
+        return None
+
+
+@dataclass
+class MenuImportRowError:
+    row: int
+    message: str
+
+
+@dataclass
+class MenuImportReport:
+    total_rows: int = 0
+    imported: int = 0
+    error_count: int = 0
+    errors: List[MenuImportRowError] = field(default_factory=list)
+    max_errors: int = 1000
+
+    def add_error(self, row: int, message: str) -> None:
+        # Only the first errors are kept so the report stays bounded
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(MenuImportRowError(row=row, message=message))
+
+
+def iter_csv_rows(file: IO[bytes]) -> Iterator[ImportRow]:
+    """Records of a CSV file with a header row, read incrementally"""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    number = 0
+    try:
+        for number, record in enumerate(csv.DictReader(text), start=1):
+            yield number, record, None
+    except (UnicodeDecodeError, csv.Error) as e:
+        # The rest of the file cannot be read reliably
+        yield number + 1, None, f"Invalid CSV: {e}"
+    finally:
+        # Leave the underlying file open for its owner
+        text.detach()
+
+
+def iter_ndjson_rows(file: IO[bytes]) -> Iterator[ImportRow]:
+    """Records of a newline-delimited JSON file, read line by line"""
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Expected a JSON object"
+            continue
+        yield number, record, None
+
+
+def iter_import_rows(
+    file: IO[bytes], import_format: MenuImportFormat
+) -> Iterator[ImportRow]:
+    if import_format == MenuImportFormat.CSV:
+        return iter_csv_rows(file)
+    return iter_ndjson_rows(file)
+
+
+class MenuImportService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = MenuItemRepository(session)
+        self.category_repository = CategoryRepository(session)
+
+    async def import_items(
+        self,
+        company_id: int,
+        rows: Iterator[ImportRow],
+        batch_size: int = 500,
+        dry_run: bool = False,
+        max_errors: int = 1000,
+    ) -> MenuImportReport:
+        """
+        Validates and inserts menu items a batch at a time, so memory use does
+        not depend on the size of the input. Invalid rows are reported and
+        skipped, the valid ones are imported.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
+        report = MenuImportReport(max_errors=max_errors)
+        category_ids: Dict[str, Optional[int]] = {}
+
+        while True:
+            # Reading and parsing block, keep them off the event loop
+            batch = await asyncio.to_thread(lambda: list(islice(rows, batch_size)))
+            if not batch:
+                break
+            report.total_rows += len(batch)
+
+            valid: List[Tuple[int, MenuItemCreate]] = []
+            for number, record, error in batch:
+                if error is not None:
+                    report.add_error(number, error)
+                    continue
+                try:
+                    valid.append(
+                        (number, MenuItemCreate.model_validate(_clean(record)))
+                    )
+                except ValidationError as e:
+                    report.add_error(number, _format_validation_error(e))
+
+            await self._resolve_categories(
+                category_ids, {item.category_slug for _, item in valid}
+            )
+
+            values = []
+            for number, item in valid:
+                category_id = category_ids[item.category_slug]
+                if category_id is None:
+                    report.add_error(
+                        number, f"Category with slug '{item.category_slug}' not found"
+                    )
+                    continue
+                values.append(
+                    {
+                        **item.model_dump(
+                            exclude={"category_slug", "company_subdomain"}
+                        ),
+                        "category_id": category_id,
+                        "owner_company_id": company_id,
+                        "is_template": False,
+                    }
+                )
+
+            if dry_run or not values:
+                report.imported += len(values)
+                continue
+
+            ids = await self.repository.reserve_ids(len(values))
+            for item_id, value in zip(ids, values):
+                value["id"] = item_id
+                value["slug"] = SlugService.build_slug(value["name"], item_id)
+            inserted = await self.repository.insert_many(values)
+            report.imported += len(inserted)
+
+        return report
+
+    async def _resolve_categories(
+        self, category_ids: Dict[str, Optional[int]], slugs: Set[str]
+    ) -> None:
+        """Looks up only slugs not seen in earlier batches"""
+        missing = slugs - category_ids.keys()
+        if not missing:
+            return
+        found = await self.category_repository.get_ids_by_slugs(missing)
+        for slug in missing:
+            category_ids[slug] = found.get(slug)
+
+
+def _clean(record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Strips strings and treats empty CSV cells as missing"""
+    cleaned: Dict[str, Any] = {}
+    for key, value in (record or {}).items():
+        if not isinstance(key, str):
+            continue
+        if isinstance(value, str):
+            value = value.strip() or None
+        cleaned[key.strip()] = value
+    return cleaned
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
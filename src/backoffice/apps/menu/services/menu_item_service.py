@@ -1,27 +1,46 @@
-from typing import List, Optional
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backoffice.apps.company.repositories import CompanyRepository
 from src.backoffice.apps.menu.models import MenuItem
-from src.backoffice.apps.menu.repositories import CategoryRepository, MenuItemRepository
+from src.backoffice.apps.menu.repositories import (
+    CategoryRepository,
+    CategoryRow,
+    MenuImageRepository,
+    MenuImageRow,
+    MenuItemListEntry,
+    MenuItemRepository,
+    MenuItemTombstoneRepository,
+)
 from src.backoffice.apps.menu.schemas import MenuItemCreate, MenuItemUpdate
 from src.backoffice.core.exceptions import NotFoundError
 from src.backoffice.core.services import SlugService
 
 
+@dataclass
+class ClonedMenuItem:
+    id: int
+    slug: str
+    name: str
+    template_id: int
+
+
 class MenuItemService:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.repository = MenuItemRepository(session)
         self.category_repository = CategoryRepository(session)
         self.company_repository = CompanyRepository(session)
+        self.tombstone_repository = MenuItemTombstoneRepository(session)
+        self.image_repository = MenuImageRepository(session)
 
     async def create(self, menu_item_data: MenuItemCreate) -> MenuItem:
         menu_item_data_dict = menu_item_data.model_dump(
             exclude={"category_slug", "company_subdomain"}
         )
-        menu_item_data_dict["slug"] = ""
 
         category = await self.category_repository.get_by_slug(
             menu_item_data.category_slug
@@ -41,12 +60,7 @@ class MenuItemService:
             )
         menu_item_data_dict["owner_company_id"] = company.id
 
-        menu_item = await self.repository.create(**menu_item_data_dict)
-
-        SlugService.set_slug(instance=menu_item, name=menu_item.name)
-        await self.session.flush()
-
-        return menu_item
+        return await self.repository.create_with_slug(**menu_item_data_dict)
 
     async def get_by_slug_or_raise(self, slug: str) -> MenuItem:
         menu_item = await self.repository.get_by_slug(slug)
@@ -74,11 +88,45 @@ class MenuItemService:
             category_slug=category_slug,
         )
 
-    async def list_by_company(
-        self,
-        company_id: int,
-    ) -> List[MenuItem]:
-        return await self.repository.list_by_company(company_id=company_id)
+    async def list_by_company(self, company_id: int) -> List[MenuItemListEntry]:
+        """
+        Company menu built from column rows: three narrow queries instead of
+        hydrating items, images and every category of the parent chain
+        """
+        items = await self.repository.list_rows_by_company(company_id=company_id)
+        if not items:
+            return []
+
+        images: Dict[int, List[MenuImageRow]] = defaultdict(list)
+        for image in await self.repository.list_image_rows([i.id for i in items]):
+            images[image.menu_item_id].append(image)
+        categories = {
+            category.id: category
+            for category in await self.category_repository.list_with_ancestors(
+                {item.category_id for item in items}
+            )
+        }
+
+        return [
+            MenuItemListEntry(
+                item=item,
+                breadcrumbs=self._breadcrumbs(item.category_id, categories),
+                images=images.get(item.id, []),
+            )
+            for item in items
+        ]
+
+    @staticmethod
+    def _breadcrumbs(
+        category_id: Optional[int], categories: Dict[int, CategoryRow]
+    ) -> List[Dict[str, str]]:
+        crumbs: List[Dict[str, str]] = []
+        while category_id is not None and category_id in categories:
+            category = categories[category_id]
+            crumbs.append({"name": category.name, "slug": category.slug})
+            category_id = category.parent_id
+        crumbs.reverse()
+        return crumbs
 
     async def update_by_slug_or_raise(
         self, menu_item_slug: str, update_data: MenuItemUpdate
@@ -107,6 +155,19 @@ class MenuItemService:
                 )
             update_dict["owner_company_id"] = company.id
 
+            # Moving an item to another company removes it from the old menu
+            menu_item = await self.repository.get_by_slug(menu_item_slug)
+            if menu_item and menu_item.owner_company_id != company.id:
+                await self._add_tombstone(menu_item)
+
+        if update_dict.get("name") is not None:
+            # The new slug goes out in the same UPDATE as the name
+            menu_item = await self.repository.get_by_slug(menu_item_slug)
+            if menu_item:
+                update_dict["slug"] = SlugService.build_slug(
+                    update_dict["name"], menu_item.id
+                )
+
         updated_item = await self.repository.update_by_slug(
             menu_item_slug, **update_dict
         )
@@ -114,16 +175,85 @@ class MenuItemService:
         if not updated_item:
             raise NotFoundError(f"Menu item with slug '{menu_item_slug}' not found")
 
-        if "name" in update_dict:
-            SlugService.set_slug(instance=updated_item, name=str(updated_item.name))
-            await self.session.flush()
-
         return updated_item
 
     async def delete_by_slug_or_raise(self, menu_item_slug: str) -> None:
-        result = await self.repository.delete_by_slug(menu_item_slug)
-        if not result:
+        menu_item = await self.repository.get_by_slug(menu_item_slug)
+        if not menu_item:
             raise NotFoundError(f"Menu item with slug '{menu_item_slug}' not found")
 
+        await self._add_tombstone(menu_item)
+        await self.repository.delete_by_slug(menu_item_slug)
+
     async def get_templates(self) -> List[MenuItem]:
         return await self.repository.get_templates()
+
+    async def clone_templates(
+        self,
+        company_id: int,
+        template_slugs: Sequence[str] = (),
+        category_slug: Optional[str] = None,
+    ) -> List[ClonedMenuItem]:
+        """
+        Copies templates into the company menu in bulk: one SELECT for the
+        templates, one INSERT for the items with their final slugs and one
+        INSERT ... SELECT for their images.
+        """
+        category_ids = None
+        if category_slug is not None:
+            category = await self.category_repository.get_by_slug(category_slug)
+            if not category:
+                raise NotFoundError(f"Category with slug '{category_slug}' not found")
+            category_ids = self.category_repository.subtree_ids_query(category.id)
+
+        templates = await self.repository.get_templates_to_clone(
+            company_id=company_id,
+            template_slugs=template_slugs,
+            category_ids=category_ids,
+        )
+        if not templates:
+            return []
+
+        ids = await self.repository.reserve_ids(len(templates))
+        cloned = [
+            ClonedMenuItem(
+                id=item_id,
+                slug=SlugService.build_slug(template.name, item_id),
+                name=template.name,
+                template_id=template.id,
+            )
+            for item_id, template in zip(ids, templates)
+        ]
+        await self.repository.insert_many(
+            [
+                {
+                    "id": item.id,
+                    "slug": item.slug,
+                    "name": template.name,
+                    "description": template.description,
+                    "category_id": template.category_id,
+                    "grams": template.grams,
+                    "kilocalories": template.kilocalories,
+                    "proteins": template.proteins,
+                    "fats": template.fats,
+                    "carbohydrated": template.carbohydrated,
+                    "is_template": False,
+                    "owner_company_id": company_id,
+                    "template_id": template.id,
+                }
+                for item, template in zip(cloned, templates)
+            ]
+        )
+        await self.image_repository.copy_from_templates([item.id for item in cloned])
+        return cloned
+
+    async def _add_tombstone(self, menu_item: MenuItem) -> None:
+        # Templates are not part of any company menu, nothing to sync
+        if menu_item.owner_company_id is None:
+            return
+
+        await self.tombstone_repository.create(
+            menu_item_id=menu_item.id,
+            slug=menu_item.slug,
+            owner_company_id=menu_item.owner_company_id,
+        )
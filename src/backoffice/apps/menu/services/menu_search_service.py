@@ -0,0 +1,58 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.repositories import MenuItemRepository
+
+MAX_SEARCH_TERMS = 8
+
+
+@dataclass
+class MenuSearchResult:
+    hits: List[Row] = field(default_factory=list)
+    facets: List[Row] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(facet.count for facet in self.facets)
+
+
+class MenuSearchService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = MenuItemRepository(session)
+
+    async def search(
+        self,
+        company_id: int,
+        query: str,
+        category_slug: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> MenuSearchResult:
+        terms = self.tokenize(query)
+        if not terms:
+            return MenuSearchResult()
+
+        rows = await self.repository.search(
+            company_id=company_id,
+            terms=terms,
+            category_slug=category_slug,
+            limit=limit,
+            offset=offset,
+        )
+        result = MenuSearchResult()
+        for row in rows:
+            (result.hits if row.kind == "hit" else result.facets).append(row)
+        # UNION ALL does not keep the order of its parts
+        result.hits.sort(key=lambda hit: (-hit.rank, hit.name, hit.id))
+        result.facets.sort(key=lambda facet: (-facet.count, facet.category_name))
+        return result
+
+    @staticmethod
+    def tokenize(query: str) -> List[str]:
+        """Word characters only, anything else would be tsquery syntax"""
+        return re.findall(r"\w+", query.lower())[:MAX_SEARCH_TERMS]
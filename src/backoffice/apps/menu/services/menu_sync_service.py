@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.models import (
+    CompanyBranchMenu,
+    MenuItem,
+    MenuItemTombstone,
+)
+from src.backoffice.apps.menu.repositories import (
+    MenuItemRepository,
+    MenuItemTombstoneRepository,
+)
+from src.backoffice.core.config import sync_settings
+
+
+@dataclass
+class MenuChangeSet:
+    items: List[MenuItem] = field(default_factory=list)
+    branch_menus: Dict[int, CompanyBranchMenu] = field(default_factory=dict)
+    tombstones: List[MenuItemTombstone] = field(default_factory=list)
+    watermark: Optional[datetime] = None
+
+
+class MenuSyncService:
+    def __init__(
+        self, session: AsyncSession, watermark_lag: Optional[timedelta] = None
+    ):
+        self.session = session
+        self.repository = MenuItemRepository(session)
+        self.tombstone_repository = MenuItemTombstoneRepository(session)
+        self.watermark_lag = (
+            timedelta(seconds=sync_settings.watermark_lag)
+            if watermark_lag is None
+            else watermark_lag
+        )
+
+    async def get_changes(
+        self,
+        company_id: int,
+        since: Optional[datetime] = None,
+        company_branch_id: Optional[int] = None,
+    ) -> MenuChangeSet:
+        """
+        Collects menu items changed after the `since` watermark together with
+        tombstones of removed items. Without a watermark a full snapshot is
+        returned and no tombstones are needed.
+        """
+        since = self._as_utc(since) if since is not None else None
+        read_at = datetime.now(timezone.utc)
+        change_set = MenuChangeSet()
+
+        if company_branch_id is None:
+            change_set.items = await self.repository.list_changed_since(
+                company_id, since
+            )
+        else:
+            rows = await self.repository.list_branch_changed_since(
+                company_branch_id, since
+            )
+            change_set.items = [menu_item for menu_item, _ in rows]
+            change_set.branch_menus = {
+                branch_menu.menu_item_id: branch_menu for _, branch_menu in rows
+            }
+
+        if since is not None:
+            # Branch menus lose items only when the items are deleted
+            change_set.tombstones = await self.tombstone_repository.list_since(
+                company_id, since
+            )
+
+        change_set.watermark = self._compute_watermark(change_set, since, read_at)
+        return change_set
+
+    def _compute_watermark(
+        self,
+        change_set: MenuChangeSet,
+        since: Optional[datetime],
+        read_at: datetime,
+    ) -> Optional[datetime]:
+        """
+        The newest change returned, but no later than `watermark_lag` before
+        the read: a transaction stamped earlier may still commit after it.
+        Changes within the lag are sent again by the next delta rather than
+        skipped for good; the watermark never moves back before `since`
+        """
+        timestamps = [] if since is None else [since]
+        for menu_item in change_set.items:
+            timestamps.append(menu_item.updated_at)
+            timestamps.extend(image.updated_at for image in menu_item.images)
+        timestamps.extend(
+            branch_menu.updated_at for branch_menu in change_set.branch_menus.values()
+        )
+        timestamps.extend(tombstone.deleted_at for tombstone in change_set.tombstones)
+
+        if not timestamps:
+            return None
+        newest = max(self._as_utc(timestamp) for timestamp in timestamps)
+        settled = read_at - self.watermark_lag
+        if since is not None:
+            settled = max(settled, since)
+        return min(newest, settled)
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        # SQLite drops tzinfo, stored values are always UTC
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
@@ -0,0 +1,100 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.company.services import CompanyService
+from src.backoffice.apps.search.schemas import (
+    BranchSearchHit,
+    BranchSearchResponse,
+    LocationKind,
+    LocationSearchHit,
+    LocationSearchResponse,
+    MenuItemSearchHit,
+    MenuItemSearchResponse,
+)
+from src.backoffice.apps.search.services import SearchService
+from src.backoffice.core.access.access_control import CompanyAccessControl
+from src.backoffice.core.access.permissions import (
+    MenuItemPermission,
+    check_menu_item_permission,
+)
+from src.backoffice.core.services.search_backend import SearchBackend
+
+
+class SearchApplication:
+    def __init__(self, session: AsyncSession, backend: SearchBackend):
+        self.session = session
+        self.search_service = SearchService(backend)
+        self.company_service = CompanyService(session)
+        self.access_control = CompanyAccessControl(session)
+
+    async def search_menu_items(
+        self,
+        company_subdomain: str,
+        user_id: int,
+        query: str,
+        category_slug: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> MenuItemSearchResponse:
+        company = await self.company_service.get_by_subdomain_or_raise(
+            company_subdomain
+        )
+        await self.access_control.check_company_permission(
+            company_id=company.id,
+            user_id=user_id,
+            permission=MenuItemPermission.READ,
+            permission_checker=check_menu_item_permission,
+        )
+        page = await self.search_service.search_menu_items(
+            company_id=company.id,
+            query=query,
+            category_slug=category_slug,
+            limit=limit,
+            offset=offset,
+        )
+        return MenuItemSearchResponse(
+            total=page.total,
+            hits=[
+                MenuItemSearchHit.model_validate({**hit, "score": hit["_score"]})
+                for hit in page.hits
+            ],
+        )
+
+    async def search_branches(
+        self,
+        query: str,
+        company_subdomain: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> BranchSearchResponse:
+        company_id = None
+        if company_subdomain is not None:
+            company = await self.company_service.get_by_subdomain_or_raise(
+                company_subdomain
+            )
+            company_id = company.id
+        page = await self.search_service.search_branches(
+            query=query, company_id=company_id, limit=limit, offset=offset
+        )
+        return BranchSearchResponse(
+            total=page.total,
+            hits=[
+                BranchSearchHit.model_validate({**hit, "score": hit["_score"]})
+                for hit in page.hits
+            ],
+        )
+
+    async def search_locations(
+        self, query: str, kind: Optional[LocationKind] = None, limit: int = 20
+    ) -> LocationSearchResponse:
+        page = await self.search_service.search_locations(
+            query=query, kind=kind.value if kind else None, limit=limit
+        )
+        return LocationSearchResponse(
+            total=page.total,
+            hits=[
+                LocationSearchHit.model_validate({**hit, "score": hit["_score"]})
+                for hit in page.hits
+            ],
+        )
@@ -0,0 +1,111 @@
+from typing import Any, Optional
+
+from sqlalchemy import Row
+
+from src.backoffice.core.services.search_backend import Document, SearchIndex
+
+_TEXT = {"type": "text", "analyzer": "standard"}
+_KEYWORD = {"type": "keyword"}
+
+MENU_ITEMS_INDEX = SearchIndex(
+    "menu_items",
+    {
+        "properties": {
+            "id": {"type": "integer"},
+            "company_id": {"type": "integer"},
+            "slug": _KEYWORD,
+            "name": _TEXT,
+            "description": _TEXT,
+            "category_slug": _KEYWORD,
+            "category_name": _TEXT,
+        }
+    },
+)
+
+BRANCHES_INDEX = SearchIndex(
+    "branches",
+    {
+        "properties": {
+            "id": {"type": "integer"},
+            "company_id": {"type": "integer"},
+            "company_name": _TEXT,
+            "company_subdomain": _KEYWORD,
+            "name": _TEXT,
+            "description": _TEXT,
+            "address": _TEXT,
+            "city": _TEXT,
+            "is_active": {"type": "boolean"},
+            "location": {"type": "geo_point"},
+        }
+    },
+)
+
+LOCATIONS_INDEX = SearchIndex(
+    "locations",
+    {
+        "properties": {
+            "id": _KEYWORD,
+            "kind": _KEYWORD,
+            "entity_id": {"type": "integer"},
+            "name": _TEXT,
+            "name_en": _TEXT,
+            "path": _TEXT,
+            "country_id": {"type": "integer"},
+            "region_id": {"type": "integer"},
+            "location": {"type": "geo_point"},
+        }
+    },
+)
+
+INDICES = {
+    index.name: index for index in (MENU_ITEMS_INDEX, BRANCHES_INDEX, LOCATIONS_INDEX)
+}
+
+
+def menu_item_document(row: Row) -> Document:
+    return {
+        "id": row.id,
+        "company_id": row.owner_company_id,
+        "slug": row.slug,
+        "name": row.name,
+        "description": row.description,
+        "category_slug": row.category_slug,
+        "category_name": row.category_name,
+    }
+
+
+def branch_document(row: Row) -> Document:
+    street = " ".join(filter(None, (row.street_name, row.house_number)))
+    return {
+        "id": row.id,
+        "company_id": row.company_id,
+        "company_name": row.company_name,
+        "company_subdomain": row.company_subdomain,
+        "name": row.name,
+        "description": row.description,
+        "address": ", ".join(filter(None, (street, row.city_name))),
+        "city": row.city_name,
+        "is_active": row.is_active,
+        "location": _geo_point(row.latitude, row.longitude),
+    }
+
+
+def location_document(row: Row) -> Document:
+    """Country, region or city with the names of its parents in `path`"""
+    return {
+        "id": f"{row.kind}:{row.id}",
+        "kind": row.kind,
+        "entity_id": row.id,
+        "name": row.name,
+        "name_en": row.name_en,
+        "path": ", ".join(filter(None, (row.name, row.region_name, row.country_name))),
+        "country_id": row.country_id,
+        "region_id": row.region_id,
+        "location": _geo_point(row.latitude, row.longitude),
+    }
+
+
+def _geo_point(latitude: Optional[float], longitude: Optional[float]) -> Any:
+    if latitude is None or longitude is None:
+        return None
+    return {"lat": latitude, "lon": longitude}
@@ -0,0 +1,3 @@
+from .search_source_repository import SearchSourceRepository
+
+__all__ = ("SearchSourceRepository",)
@@ -0,0 +1,127 @@
+from typing import AsyncIterator, Optional, Sequence
+
+from sqlalchemy import Float, Integer, Row, Select, cast, literal, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.company.models import Company, CompanyBranch
+from src.backoffice.apps.location.models import Address, City, Country, Region, Street
+from src.backoffice.apps.menu.models import Category, MenuItem
+
+
+class SearchSourceRepository:
+    """Rows the search documents are built from, read in chunks"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def stream_menu_items(
+        self,
+        ids: Optional[Sequence[int]] = None,
+        company_id: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        stmt = (
+            select(
+                MenuItem.id,
+                MenuItem.owner_company_id,
+                MenuItem.slug,
+                MenuItem.name,
+                MenuItem.description,
+                Category.slug.label("category_slug"),
+                Category.name.label("category_name"),
+            )
+            .join(Category, Category.id == MenuItem.category_id)
+            .where(MenuItem.is_template.is_(False))
+        )
+        if ids is not None:
+            stmt = stmt.where(MenuItem.id.in_(ids))
+        if company_id is not None:
+            stmt = stmt.where(MenuItem.owner_company_id == company_id)
+        return self._stream(stmt.order_by(MenuItem.id), chunk_size)
+
+    def stream_branches(
+        self, ids: Optional[Sequence[int]] = None, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        stmt = (
+            select(
+                CompanyBranch.id,
+                CompanyBranch.company_id,
+                Company.name.label("company_name"),
+                Company.subdomain.label("company_subdomain"),
+                CompanyBranch.name,
+                CompanyBranch.description,
+                CompanyBranch.is_active,
+                CompanyBranch.latitude,
+                CompanyBranch.longitude,
+                Street.name.label("street_name"),
+                Address.house_number,
+                City.name.label("city_name"),
+            )
+            .join(Company, Company.id == CompanyBranch.company_id)
+            .outerjoin(Address, Address.id == CompanyBranch.address_id)
+            .outerjoin(Street, Street.id == Address.street_id)
+            .outerjoin(City, City.id == Street.city_id)
+        )
+        if ids is not None:
+            stmt = stmt.where(CompanyBranch.id.in_(ids))
+        return self._stream(stmt.order_by(CompanyBranch.id), chunk_size)
+
+    async def stream_locations(
+        self, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Active countries, then regions, then cities"""
+        countries = select(
+            literal("country").label("kind"),
+            Country.id,
+            Country.name,
+            Country.name_en,
+            Country.id.label("country_id"),
+            cast(null(), Integer).label("region_id"),
+            null().label("country_name"),
+            null().label("region_name"),
+            cast(null(), Float).label("latitude"),
+            cast(null(), Float).label("longitude"),
+        ).where(Country.is_active.is_(True))
+        regions = (
+            select(
+                literal("region").label("kind"),
+                Region.id,
+                Region.name,
+                Region.name_en,
+                Region.country_id,
+                Region.id.label("region_id"),
+                Country.name.label("country_name"),
+                null().label("region_name"),
+                cast(null(), Float).label("latitude"),
+                cast(null(), Float).label("longitude"),
+            )
+            .join(Country, Country.id == Region.country_id)
+            .where(Region.is_active.is_(True))
+        )
+        cities = (
+            select(
+                literal("city").label("kind"),
+                City.id,
+                City.name,
+                City.name_en,
+                City.country_id,
+                City.region_id,
+                Country.name.label("country_name"),
+                Region.name.label("region_name"),
+                City.latitude,
+                City.longitude,
+            )
+            .join(Country, Country.id == City.country_id)
+            .outerjoin(Region, Region.id == City.region_id)
+            .where(City.is_active.is_(True))
+        )
+        for stmt in (countries, regions, cities):
+            async for partition in self._stream(stmt.order_by("id"), chunk_size):
+                yield partition
+
+    async def _stream(
+        self, stmt: Select, chunk_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        result = await self.session.stream(stmt.execution_options(yield_per=chunk_size))
+        async for partition in result.partitions():
+            yield partition
@@ -0,0 +1,19 @@
+from .search import (
+    BranchSearchHit,
+    BranchSearchResponse,
+    LocationKind,
+    LocationSearchHit,
+    LocationSearchResponse,
+    MenuItemSearchHit,
+    MenuItemSearchResponse,
+)
+
+__all__ = (
+    "LocationKind",
+    "MenuItemSearchHit",
+    "MenuItemSearchResponse",
+    "BranchSearchHit",
+    "BranchSearchResponse",
+    "LocationSearchHit",
+    "LocationSearchResponse",
+)
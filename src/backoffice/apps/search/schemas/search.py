@@ -0,0 +1,61 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class LocationKind(str, Enum):
+    COUNTRY = "country"
+    REGION = "region"
+    CITY = "city"
+
+
+class MenuItemSearchHit(BaseModel):
+    """Menu item search hit schema"""
+
+    id: int = Field(..., description="Menu item ID")
+    slug: str = Field(..., description="Slug")
+    name: str = Field(..., description="Name")
+    description: str = Field(..., description="Description")
+    category_slug: str = Field(..., description="Category slug")
+    category_name: str = Field(..., description="Category name")
+    score: float = Field(..., description="Relevance")
+
+
+class BranchSearchHit(BaseModel):
+    """Company branch search hit schema"""
+
+    id: int = Field(..., description="Company branch ID")
+    company_id: int = Field(..., description="Company ID")
+    company_name: str = Field(..., description="Company name")
+    company_subdomain: str = Field(..., description="Company subdomain")
+    name: str = Field(..., description="Branch name")
+    address: Optional[str] = Field(None, description="Street address and city")
+    city: Optional[str] = Field(None, description="City")
+    score: float = Field(..., description="Relevance")
+
+
+class LocationSearchHit(BaseModel):
+    """Country, region or city search hit schema"""
+
+    kind: LocationKind = Field(..., description="Location type")
+    entity_id: int = Field(..., description="Country, region or city ID")
+    name: str = Field(..., description="Name")
+    name_en: str = Field(..., description="Name in English")
+    path: str = Field(..., description="Name with the region and country")
+    score: float = Field(..., description="Relevance")
+
+
+class MenuItemSearchResponse(BaseModel):
+    total: int = Field(..., description="Total matches")
+    hits: List[MenuItemSearchHit] = Field(default_factory=list)
+
+
+class BranchSearchResponse(BaseModel):
+    total: int = Field(..., description="Total matches")
+    hits: List[BranchSearchHit] = Field(default_factory=list)
+
+
+class LocationSearchResponse(BaseModel):
+    total: int = Field(..., description="Total matches")
+    hits: List[LocationSearchHit] = Field(default_factory=list)
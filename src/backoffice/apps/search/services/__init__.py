@@ -0,0 +1,5 @@
+from .search_index_service import SearchIndexService
+from .search_indexing_hook import SearchIndexingHook
+from .search_service import SearchService
+
+__all__ = ("SearchIndexService", "SearchIndexingHook", "SearchService")
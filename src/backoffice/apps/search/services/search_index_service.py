@@ -0,0 +1,107 @@
+from typing import AsyncIterator, Callable, Iterable, List, Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.search.documents import (
+    BRANCHES_INDEX,
+    LOCATIONS_INDEX,
+    MENU_ITEMS_INDEX,
+    branch_document,
+    location_document,
+    menu_item_document,
+)
+from src.backoffice.apps.search.repositories import SearchSourceRepository
+from src.backoffice.core.services.search_backend import (
+    Document,
+    SearchBackend,
+    SearchIndex,
+)
+
+
+class SearchIndexService:
+    """Copies menu items, branches and locations into the search backend"""
+
+    def __init__(self, session: AsyncSession, backend: SearchBackend):
+        self.session = session
+        self.backend = backend
+        self.repository = SearchSourceRepository(session)
+
+    async def index_menu_items(self, ids: Sequence[int]) -> int:
+        """Reindex the items, ids that are gone or templates are removed"""
+        indexed = await self._index(
+            MENU_ITEMS_INDEX,
+            self.repository.stream_menu_items(ids=ids),
+            menu_item_document,
+        )
+        await self._delete_missing(MENU_ITEMS_INDEX, ids, indexed)
+        return len(indexed)
+
+    async def index_company_menu(self, company_id: int) -> int:
+        indexed = await self._index(
+            MENU_ITEMS_INDEX,
+            self.repository.stream_menu_items(company_id=company_id),
+            menu_item_document,
+        )
+        return len(indexed)
+
+    async def delete_menu_items(self, ids: Iterable[int]) -> None:
+        await self.backend.bulk_delete(MENU_ITEMS_INDEX, ids)
+
+    async def index_branches(self, ids: Sequence[int]) -> int:
+        indexed = await self._index(
+            BRANCHES_INDEX,
+            self.repository.stream_branches(ids=ids),
+            branch_document,
+        )
+        await self._delete_missing(BRANCHES_INDEX, ids, indexed)
+        return len(indexed)
+
+    async def delete_branches(self, ids: Iterable[int]) -> None:
+        await self.backend.bulk_delete(BRANCHES_INDEX, ids)
+
+    async def rebuild(self, index: SearchIndex, batch_size: int = 1000) -> int:
+        """Full reindex from the database, `batch_size` rows per bulk request"""
+        sources = {
+            MENU_ITEMS_INDEX.name: (
+                self.repository.stream_menu_items,
+                menu_item_document,
+            ),
+            BRANCHES_INDEX.name: (self.repository.stream_branches, branch_document),
+            LOCATIONS_INDEX.name: (
+                self.repository.stream_locations,
+                location_document,
+            ),
+        }
+        stream, to_document = sources[index.name]
+        return await self.backend.rebuild(
+            index,
+            self._documents(stream(chunk_size=batch_size), to_document),
+        )
+
+    async def _index(
+        self,
+        index: SearchIndex,
+        partitions: AsyncIterator[Sequence[Row]],
+        to_document: Callable[[Row], Document],
+    ) -> List[int]:
+        indexed: List[int] = []
+        async for batch in self._documents(partitions, to_document):
+            await self.backend.bulk_index(index, batch)
+            indexed.extend(document["id"] for document in batch)
+        return indexed
+
+    async def _delete_missing(
+        self, index: SearchIndex, ids: Sequence[int], indexed: List[int]
+    ) -> None:
+        missing = set(ids).difference(indexed)
+        if missing:
+            await self.backend.bulk_delete(index, sorted(missing))
+
+    @staticmethod
+    async def _documents(
+        partitions: AsyncIterator[Sequence[Row]],
+        to_document: Callable[[Row], Document],
+    ) -> AsyncIterator[List[Document]]:
+        async for partition in partitions:
+            yield [to_document(row) for row in partition]
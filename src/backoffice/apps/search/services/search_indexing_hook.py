@@ -0,0 +1,100 @@
+import asyncio
+from typing import Awaitable, Callable, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.backoffice.apps.company.events import CompanyEventType
+from src.backoffice.apps.menu.events import MenuEventType
+from src.backoffice.apps.search.documents import INDICES
+from src.backoffice.apps.search.services.search_index_service import SearchIndexService
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.event_bus import Event, EventBus
+from src.backoffice.core.services.search_backend import SearchBackend
+
+IndexingTask = Callable[[SearchIndexService], Awaitable[object]]
+
+
+class SearchIndexingHook:
+    """
+    Event bus publish hook keeping the search indices up to date.
+
+    Indexing runs in background tasks with its own session, so publishing
+    does not wait for the search backend.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        backend: SearchBackend,
+    ):
+        self.session_factory = session_factory
+        self.backend = backend
+        self._tasks: Set[asyncio.Task] = set()
+        self._logger = get_logger("search")
+
+    def register(self, bus: EventBus) -> None:
+        bus.add_publish_hook(self)
+
+    async def __call__(self, event: Event) -> None:
+        task = self.task_for(event)
+        if task is None:
+            return
+        background = asyncio.create_task(self._run(event, task))
+        self._tasks.add(background)
+        background.add_done_callback(self._tasks.discard)
+
+    async def handle(self, event: Event) -> None:
+        """Index the event right away"""
+        task = self.task_for(event)
+        if task is not None:
+            await self._run(event, task)
+
+    async def rebuild(self) -> None:
+        """Full reindex of every index from the database, failures are logged"""
+        try:
+            async with self.session_factory() as session:
+                service = SearchIndexService(session, self.backend)
+                for index in INDICES.values():
+                    await service.rebuild(index)
+        except Exception as e:
+            self._logger.warning("search_rebuild_failed", exc_info=e)
+
+    async def drain(self) -> None:
+        """Wait for the indexing started so far"""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @staticmethod
+    def task_for(event: Event) -> Optional[IndexingTask]:
+        data = event.data
+        if event.type in (
+            MenuEventType.ITEM_CREATED.value,
+            MenuEventType.ITEM_UPDATED.value,
+        ):
+            return lambda service: service.index_menu_items([data["id"]])
+        if event.type == MenuEventType.ITEM_DELETED.value:
+            return lambda service: service.delete_menu_items([data["id"]])
+        if event.type == MenuEventType.ITEMS_CLONED.value:
+            return lambda service: service.index_menu_items(data["ids"])
+        if event.type == MenuEventType.ITEMS_IMPORTED.value:
+            return lambda service: service.index_company_menu(data["company_id"])
+        if event.type in (
+            CompanyEventType.BRANCH_CREATED.value,
+            CompanyEventType.BRANCH_UPDATED.value,
+        ):
+            return lambda service: service.index_branches([data["id"]])
+        if event.type == CompanyEventType.BRANCH_DELETED.value:
+            return lambda service: service.delete_branches([data["id"]])
+        return None
+
+    async def _run(self, event: Event, task: IndexingTask) -> None:
+        try:
+            async with self.session_factory() as session:
+                await task(SearchIndexService(session, self.backend))
+        except Exception as e:
+            # The next full reindex repairs whatever was missed here
+            self._logger.warning(
+                "search_indexing_failed",
+                extra={"type": event.type, "event_id": event.id},
+                exc_info=e,
+            )
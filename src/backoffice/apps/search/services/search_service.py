@@ -0,0 +1,62 @@
+from typing import Any, Dict, Optional
+
+from src.backoffice.apps.search.documents import (
+    BRANCHES_INDEX,
+    LOCATIONS_INDEX,
+    MENU_ITEMS_INDEX,
+)
+from src.backoffice.core.services.search_backend import SearchBackend, SearchPage
+
+MENU_ITEM_FIELDS = {"name": 3.0, "category_name": 2.0, "description": 1.0}
+BRANCH_FIELDS = {
+    "name": 3.0,
+    "company_name": 3.0,
+    "city": 2.0,
+    "address": 1.0,
+    "description": 1.0,
+}
+LOCATION_FIELDS = {"name": 3.0, "name_en": 3.0, "path": 1.0}
+
+
+class SearchService:
+    """Queries the search backend only, never the primary database"""
+
+    def __init__(self, backend: SearchBackend):
+        self.backend = backend
+
+    async def search_menu_items(
+        self,
+        company_id: int,
+        query: str,
+        category_slug: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchPage:
+        filters: Dict[str, Any] = {"company_id": company_id}
+        if category_slug is not None:
+            filters["category_slug"] = category_slug
+        return await self.backend.search(
+            MENU_ITEMS_INDEX, query, MENU_ITEM_FIELDS, filters, limit, offset
+        )
+
+    async def search_branches(
+        self,
+        query: str,
+        company_id: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchPage:
+        filters: Dict[str, Any] = {"is_active": True}
+        if company_id is not None:
+            filters["company_id"] = company_id
+        return await self.backend.search(
+            BRANCHES_INDEX, query, BRANCH_FIELDS, filters, limit, offset
+        )
+
+    async def search_locations(
+        self, query: str, kind: Optional[str] = None, limit: int = 20
+    ) -> SearchPage:
+        filters = {"kind": kind} if kind else None
+        return await self.backend.search(
+            LOCATIONS_INDEX, query, LOCATION_FIELDS, filters, limit
+        )
@@ -0,0 +1,244 @@
+"""
+Backoffice management commands
+
+    python -m src.backoffice.cli import-menu --company <subdomain> --file menu.csv
+    python -m src.backoffice.cli reindex-search --index menu_items
+    python -m src.backoffice.cli image-worker
+    python -m src.backoffice.cli gc-images --dry-run
+"""
+
+import asyncio
+import json
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Optional, Tuple
+
+import click
+
+import src.backoffice.models.all  # noqa: F401
+from src.backoffice.apps.company.repositories import CompanyRepository
+from src.backoffice.apps.menu.events import MenuEventType, company_channel
+from src.backoffice.apps.menu.services import (
+    IMAGE_FOLDER,
+    MenuImageGCService,
+    MenuImageWorker,
+    MenuImportFormat,
+    MenuImportService,
+    iter_import_rows,
+)
+from src.backoffice.apps.search.documents import INDICES
+from src.backoffice.apps.search.services import SearchIndexingHook, SearchIndexService
+from src.backoffice.core.config import kafka_settings, search_settings
+from src.backoffice.core.dependencies.database import AsyncSessionLocal
+from src.backoffice.core.services.event_bus import event_bus
+from src.backoffice.core.services.kafka_client import message_broker
+from src.backoffice.core.services.s3_client import MAX_DELETE_KEYS, s3_client
+from src.backoffice.core.services.search_backend import search_backend
+
+
+async def import_menu(
+    company_subdomain: str,
+    path: str,
+    format_name: Optional[str],
+    batch_size: int,
+    dry_run: bool,
+) -> int:
+    import_format = (
+        MenuImportFormat(format_name)
+        if format_name
+        else MenuImportFormat.from_filename(path)
+    )
+    if import_format is None:
+        click.echo("Unsupported import format, pass --format csv|ndjson", err=True)
+        return 2
+
+    async with AsyncSessionLocal() as session:
+        company = await CompanyRepository(session).get_by_subdomain(company_subdomain)
+        if company is None:
+            click.echo(f"Company {company_subdomain} not found", err=True)
+            return 2
+        with open(path, "rb") as file:
+            report = await MenuImportService(session).import_items(
+                company_id=company.id,
+                rows=iter_import_rows(file, import_format),
+                batch_size=batch_size,
+                dry_run=dry_run,
+            )
+        if dry_run:
+            await session.rollback()
+        else:
+            await session.commit()
+
+    if report.imported and not dry_run:
+        event = await event_bus.publish(
+            company_channel(company.id),
+            MenuEventType.ITEMS_IMPORTED.value,
+            {"company_id": company.id, "count": report.imported},
+        )
+        await event_bus.stop()
+        if search_settings.elasticsearch_url:
+            # No indexing hook runs in this process, index the items here
+            await SearchIndexingHook(AsyncSessionLocal, search_backend).handle(event)
+            await search_backend.close()
+        else:
+            click.echo(
+                "ELASTICSEARCH_URL is not set, the API indexes the imported items "
+                "when it restarts",
+                err=True,
+            )
+
+    result = asdict(report)
+    result.pop("max_errors")
+    click.echo(json.dumps(result, ensure_ascii=False, indent=2))
+    return 1 if report.error_count else 0
+
+
+async def reindex_search(names: Tuple[str, ...], batch_size: int) -> int:
+    if not search_settings.elasticsearch_url:
+        click.echo(
+            "ELASTICSEARCH_URL is not set, the API fills its in-process index "
+            "when it starts",
+            err=True,
+        )
+        return 2
+    try:
+        async with AsyncSessionLocal() as session:
+            service = SearchIndexService(session, search_backend)
+            for name in names or INDICES:
+                count = await service.rebuild(INDICES[name], batch_size=batch_size)
+                click.echo(f"{name}: {count} documents")
+    finally:
+        await search_backend.close()
+    return 0
+
+
+async def image_worker() -> int:
+    if not kafka_settings.get_bootstrap_servers():
+        click.echo(
+            "KAFKA_BROKERS is not set, the API processes image jobs itself", err=True
+        )
+        return 2
+    worker = MenuImageWorker(AsyncSessionLocal, message_broker, event_bus)
+    try:
+        async with worker.run():
+            # Until interrupted
+            await asyncio.Event().wait()
+    finally:
+        await message_broker.stop()
+        await event_bus.stop()
+        s3_client.close()
+    return 0
+
+
+async def gc_images(
+    folder: str,
+    min_age_hours: float,
+    rate: Optional[float],
+    page_size: int,
+    dry_run: bool,
+) -> int:
+    try:
+        async with AsyncSessionLocal() as session:
+            report = await MenuImageGCService(
+                session,
+                folder=folder,
+                page_size=page_size,
+                min_age=timedelta(hours=min_age_hours),
+                rate=rate,
+                dry_run=dry_run,
+            ).collect()
+    finally:
+        s3_client.close()
+
+    click.echo(json.dumps(asdict(report), indent=2))
+    return 1 if report.failed else 0
+
+
+@click.group(context_settings={"help_option_names": ["-h", "--help"]})
+def cli() -> None:
+    """Backoffice management commands"""
+
+
+@cli.command("import-menu")
+@click.option("--company", "company_subdomain", required=True, help="Company subdomain")
+@click.option(
+    "--file",
+    "path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Path to the file",
+)
+@click.option(
+    "--format",
+    "format_name",
+    type=click.Choice([item.value for item in MenuImportFormat]),
+    help="File format, guessed from the extension when omitted",
+)
+@click.option(
+    "--batch-size", type=click.IntRange(min=1), default=500, show_default=True
+)
+@click.option("--dry-run", is_flag=True, help="Validate without creating items")
+@click.pass_context
+def import_menu_command(ctx: click.Context, **options) -> None:
+    """Import menu items from a CSV or NDJSON file"""
+    ctx.exit(asyncio.run(import_menu(**options)))
+
+
+@cli.command("reindex-search")
+@click.option(
+    "--index",
+    "names",
+    multiple=True,
+    type=click.Choice(list(INDICES)),
+    help="Index to rebuild, repeatable; all when omitted",
+)
+@click.option(
+    "--batch-size", type=click.IntRange(min=1), default=1000, show_default=True
+)
+@click.pass_context
+def reindex_search_command(ctx: click.Context, **options) -> None:
+    """
+    Rebuild search indices from the database.
+
+    Changes made while it runs reach the new index too, except that an item
+    deleted after its batch was read stays searchable until it changes again.
+    """
+    ctx.exit(asyncio.run(reindex_search(**options)))
+
+
+@cli.command("image-worker")
+@click.pass_context
+def image_worker_command(ctx: click.Context) -> None:
+    """Process background image uploads from Kafka"""
+    ctx.exit(asyncio.run(image_worker()))
+
+
+@cli.command("gc-images")
+@click.option("--folder", default=IMAGE_FOLDER, show_default=True, help="Bucket folder")
+@click.option(
+    "--min-age-hours",
+    type=click.FloatRange(min=0),
+    default=24,
+    show_default=True,
+    help="Leave newer objects alone, uploads may still be in progress",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Most S3 requests per second, unlimited if omitted",
+)
+@click.option(
+    "--page-size",
+    type=click.IntRange(min=1, max=MAX_DELETE_KEYS),
+    default=MAX_DELETE_KEYS,
+    show_default=True,
+)
+@click.option("--dry-run", is_flag=True, help="Report orphans without deleting them")
+@click.pass_context
+def gc_images_command(ctx: click.Context, **options) -> None:
+    """Delete stored image files no image refers to"""
+    ctx.exit(asyncio.run(gc_images(**options)))
+
+
+if __name__ == "__main__":
+    cli(prog_name="python -m src.backoffice.cli")
@@ -1,10 +1,15 @@
+from contextlib import asynccontextmanager, nullcontext
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 
 from src.backoffice.api.health import router as health_router
 from src.backoffice.api.v1 import api_router
-from src.backoffice.core.config import cors_settings, logging_settings
+from src.backoffice.apps.menu.services import MenuImageWorker
+from src.backoffice.apps.search.services import SearchIndexingHook
+from src.backoffice.core.config import cors_settings, logging_settings, search_settings
+from src.backoffice.core.dependencies.database import AsyncSessionLocal
 from src.backoffice.core.exceptions import (
     ForbiddenError,
     NotFoundError,
@@ -16,8 +21,40 @@ from src.backoffice.core.handlers import (
     subdomain_already_taken_handler,
     value_error_handler,
 )
-from src.backoffice.core.logging import configure_logging
+from src.backoffice.core.logging import configure_logging, get_logger
 from src.backoffice.core.middleware import AuthMiddleware, RequestContextMiddleware
+from src.backoffice.core.services.event_bus import event_bus
+from src.backoffice.core.services.kafka_client import InMemoryBroker, message_broker
+from src.backoffice.core.services.s3_client import s3_client
+from src.backoffice.core.services.search_backend import (
+    InMemorySearchBackend,
+    search_backend,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    indexing = SearchIndexingHook(AsyncSessionLocal, search_backend)
+    if search_settings.indexing_enabled:
+        indexing.register(event_bus)
+    if isinstance(search_backend, InMemorySearchBackend):
+        # Nothing else fills an in-process index, and it only follows the
+        # changes made by this process
+        get_logger("search").warning("search_index_in_process")
+        await indexing.rebuild()
+    # Without Kafka, image jobs never leave this process: process them here
+    image_worker = MenuImageWorker(AsyncSessionLocal, message_broker, event_bus)
+    async with (
+        image_worker.run()
+        if isinstance(message_broker, InMemoryBroker)
+        else nullcontext()
+    ):
+        yield
+    await message_broker.stop()
+    await indexing.drain()
+    await search_backend.close()
+    await event_bus.stop()
+    s3_client.close()
 
 
 def create_app() -> FastAPI:
@@ -27,6 +64,7 @@ def create_app() -> FastAPI:
         title="Backoffice API",
         description="API for backoffice management",
         version="0.1.0",
+        lifespan=lifespan,
     )
 
     def custom_openapi():
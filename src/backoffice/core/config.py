@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -167,12 +168,81 @@ class S3Settings:
             (600, 600),  # Large thumbnail
         ]
         self.max_image_dimensions = (2048, 2048)
+        # Every thumbnail size is stored in each of these formats (jpeg, webp,
+        # avif), JPEG always being one of them as the fallback
+        self.thumbnail_formats = [
+            name.strip().lower()
+            for name in os.environ.get("THUMBNAIL_FORMATS", "jpeg,webp").split(",")
+            if name.strip()
+        ]
+        # Encoder effort: higher quality means larger files, a higher WebP
+        # method or a lower AVIF speed means smaller files for more CPU
+        self.jpeg_quality = int(os.environ.get("THUMBNAIL_JPEG_QUALITY", "85"))
+        self.webp_quality = int(os.environ.get("THUMBNAIL_WEBP_QUALITY", "80"))
+        self.webp_method = int(os.environ.get("THUMBNAIL_WEBP_METHOD", "4"))
+        self.avif_quality = int(os.environ.get("THUMBNAIL_AVIF_QUALITY", "60"))
+        self.avif_speed = int(os.environ.get("THUMBNAIL_AVIF_SPEED", "6"))
+        # Widths the resizing endpoint serves on request
+        self.resize_widths = [
+            int(width)
+            for width in os.environ.get(
+                "RESIZE_WIDTHS", "150,300,480,600,800,1200"
+            ).split(",")
+        ]
+        # Resized images are kept on local disk up to this many bytes
+        self.resize_cache_dir = os.environ.get(
+            "RESIZE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "menu-images")
+        )
+        self.resize_cache_max_bytes = int(
+            os.environ.get("RESIZE_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+        )
+        # Uploads are streamed to S3 in parts of this size, 5MB at least
+        self.multipart_part_size = int(
+            os.environ.get("S3_MULTIPART_PART_SIZE", str(8 * 1024 * 1024))
+        )
+        # Thumbnails are rendered in this many worker processes, uploads beyond
+        # the workers and the queue wait for a free slot
+        self.image_workers = int(
+            os.environ.get("IMAGE_WORKERS", str(os.cpu_count() or 1))
+        )
+        self.image_queue_size = int(
+            os.environ.get("IMAGE_QUEUE_SIZE", str(self.image_workers * 2))
+        )
+        # Files per batch upload request, and how many of them are stored
+        # and rendered at the same time
+        self.batch_upload_max_files = int(
+            os.environ.get("BATCH_UPLOAD_MAX_FILES", "20")
+        )
+        self.batch_upload_concurrency = int(
+            os.environ.get("BATCH_UPLOAD_CONCURRENCY", "4")
+        )
+        # Attempts at a background image job failing on S3 outages, seconds
+        # before the second one, doubling after each
+        self.image_job_max_attempts = int(os.environ.get("IMAGE_JOB_MAX_ATTEMPTS", "3"))
+        self.image_job_retry_backoff = float(
+            os.environ.get("IMAGE_JOB_RETRY_BACKOFF", "5")
+        )
 
         # Security settings
         self.use_https = os.environ.get("MINIO_USE_HTTPS", "false").lower() == "true"
         self.presigned_url_expiry = int(
             os.environ.get("PRESIGNED_URL_EXPIRY", "3600")
         )  # 1 hour
+        # Public base URL (CDN) of the bucket: objects are uploaded public-read,
+        # so when set, image URLs are built from it without signing
+        self.cdn_base_url = os.environ.get("S3_CDN_BASE_URL", "").rstrip("/")
+        # Presigned URLs kept for reuse across requests
+        self.url_cache_size = int(os.environ.get("S3_URL_CACHE_SIZE", "10000"))
+
+        # Blocking boto3 calls run on a dedicated pool of this many threads,
+        # each holding one pooled connection
+        self.max_connections = int(os.environ.get("S3_MAX_CONNECTIONS", "10"))
+        self.connect_timeout = float(os.environ.get("S3_CONNECT_TIMEOUT", "5"))
+        self.read_timeout = float(os.environ.get("S3_READ_TIMEOUT", "30"))
+        # Deadline of one operation including queueing and retries, in seconds
+        self.operation_timeout = float(os.environ.get("S3_OPERATION_TIMEOUT", "60"))
+        self.max_attempts = int(os.environ.get("S3_MAX_ATTEMPTS", "3"))
+        self.retry_backoff = float(os.environ.get("S3_RETRY_BACKOFF", "0.2"))
 
 
 class KafkaSettings:
@@ -198,6 +268,45 @@ class KafkaSettings:
         return [b for b in self.brokers if b]
 
 
+class EventSettings:
+    def __init__(self):
+        # Redis used to fan out change events across workers (empty - local only)
+        self.redis_url = os.environ.get("REDIS_URL", "")
+        self.channel_prefix = os.environ.get("EVENTS_CHANNEL_PREFIX", "events:")
+        # Seconds between SSE heartbeat comments
+        self.heartbeat_interval = float(
+            os.environ.get("EVENTS_HEARTBEAT_INTERVAL", "15")
+        )
+        # Events kept per channel for Last-Event-ID resume
+        self.history_size = int(os.environ.get("EVENTS_HISTORY_SIZE", "500"))
+        # Pending events per subscriber before it is disconnected
+        self.subscriber_queue_size = int(
+            os.environ.get("EVENTS_SUBSCRIBER_QUEUE_SIZE", "256")
+        )
+
+
+class SyncSettings:
+    def __init__(self):
+        # Seconds a delta sync watermark stays behind the read: rows are stamped
+        # by the app clock and a transaction may commit after a later read
+        self.watermark_lag = float(os.environ.get("SYNC_WATERMARK_LAG", "30"))
+
+
+class SearchSettings:
+    def __init__(self):
+        # Elasticsearch URL (empty - in-process index filled on startup, for
+        # development and tests, it only follows changes made by its process)
+        self.elasticsearch_url = os.environ.get("ELASTICSEARCH_URL", "")
+        self.index_prefix = os.environ.get("SEARCH_INDEX_PREFIX", "backoffice-")
+        self.request_timeout = float(os.environ.get("SEARCH_REQUEST_TIMEOUT", "10"))
+        # Documents per bulk request
+        self.bulk_chunk_size = int(os.environ.get("SEARCH_BULK_CHUNK_SIZE", "500"))
+        # Keep indices in sync with change events published by this worker
+        self.indexing_enabled = (
+            os.environ.get("SEARCH_INDEXING_ENABLED", "true").lower() == "true"
+        )
+
+
 class LoggingSettings:
     def __init__(self):
         # Logging level: DEBUG/INFO/WARNING/ERROR
@@ -227,5 +336,8 @@ base_settings = BaseSettings()
 auth_settings = AuthSettings()
 s3_settings = S3Settings()
 kafka_settings = KafkaSettings()
+event_settings = EventSettings()
+sync_settings = SyncSettings()
+search_settings = SearchSettings()
 logging_settings = LoggingSettings()
 cors_settings = CorsSettings()
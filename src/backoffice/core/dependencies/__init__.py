@@ -1,5 +1,5 @@
-from .auth import AuthenticatedUserDep
-from .database import SessionDep, get_session
+from .auth import AuthenticatedUserDep, get_authenticated_user
+from .database import SessionDep, SessionFactoryDep, get_session, get_session_factory
 from .service_dependencies import (
     AccountApplicationDep,
     CompanyApplicationDep,
@@ -7,20 +7,27 @@ from .service_dependencies import (
     LocationSearchQueryDep,
     MenuApplicationDep,
     QRCodeApplicationDep,
+    SearchApplicationDep,
+    get_search_backend,
 )
 
 __all__ = [
     # Database
     "SessionDep",
     "get_session",
+    "SessionFactoryDep",
+    "get_session_factory",
     # Auth
     "AuthenticatedUserDep",
+    "get_authenticated_user",
     # Services
     "AccountApplicationDep",
     "CompanyApplicationDep",
     "LocationApplicationDep",
     "MenuApplicationDep",
     "QRCodeApplicationDep",
+    "SearchApplicationDep",
+    "get_search_backend",
     # Query parameters
     "LocationSearchQueryDep",
 ]
@@ -21,4 +21,15 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    For endpoints that must not hold a session for the whole request, such as
+    streams: they open short-lived sessions of their own
+    """
+    return AsyncSessionLocal
+
+
 SessionDep: TypeAlias = Annotated[AsyncSession, Depends(get_session)]
+SessionFactoryDep: TypeAlias = Annotated[
+    async_sessionmaker[AsyncSession], Depends(get_session_factory)
+]
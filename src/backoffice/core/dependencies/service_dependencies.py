@@ -10,7 +10,9 @@ from src.backoffice.apps.location.schemas.location_search_query import (
 )
 from src.backoffice.apps.menu.application import MenuApplication
 from src.backoffice.apps.qr_manager.application import QRCodeApplication
+from src.backoffice.apps.search.application import SearchApplication
 from src.backoffice.core.dependencies.database import SessionDep
+from src.backoffice.core.services.search_backend import SearchBackend, search_backend
 
 # ==================== SERVICE DEPENDENCIES ====================
 
@@ -35,6 +37,17 @@ async def get_qr_code_application(session: SessionDep) -> QRCodeApplication:
     return QRCodeApplication(session)
 
 
+def get_search_backend() -> SearchBackend:
+    return search_backend
+
+
+async def get_search_application(
+    session: SessionDep,
+    backend: Annotated[SearchBackend, Depends(get_search_backend)],
+) -> SearchApplication:
+    return SearchApplication(session, backend)
+
+
 # ==================== ANNOTATED TYPES ====================
 
 # Account Application
@@ -62,6 +75,11 @@ QRCodeApplicationDep: TypeAlias = Annotated[
     QRCodeApplication, Depends(get_qr_code_application)
 ]
 
+# Search Application
+SearchApplicationDep: TypeAlias = Annotated[
+    SearchApplication, Depends(get_search_application)
+]
+
 # ==================== QUERY PARAMETER DEPENDENCIES ====================
 
 # Location Search Query
@@ -1,13 +1,16 @@
 from abc import ABC
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
 
-from sqlalchemy import Select, delete, select, update
+from sqlalchemy import Insert, Select, delete, func, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.backoffice.core.services.slug_service import SlugService
 from src.backoffice.models import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
+RowType = TypeVar("RowType", bound=tuple)
 
 
 class BaseRepository(ABC, Generic[ModelType]):
@@ -22,6 +25,39 @@ class BaseRepository(ABC, Generic[ModelType]):
         await self.session.refresh(instance)
         return instance
 
+    async def create_with_slug(self, **kwargs: Any) -> ModelType:
+        """
+        Creates an object with its `{name}-{id}` slug in a single INSERT, the
+        id is taken from the sequence beforehand
+        """
+        (object_id,) = await self.reserve_ids(1)
+        slug = SlugService.build_slug(kwargs["name"], object_id)
+        return await self.create(**{**kwargs, "id": object_id, "slug": slug})
+
+    async def reserve_ids(self, count: int) -> List[int]:
+        """
+        Takes `count` ids from the primary key sequence in one round-trip, so
+        rows can be inserted with values derived from their ids.
+        """
+        if count <= 0:
+            return []
+        table = self.model.__table__  # type: ignore
+
+        if self.dialect_name == "postgresql":
+            sequence = func.pg_get_serial_sequence(literal(table.name), literal("id"))
+            result = await self.session.execute(
+                select(func.nextval(sequence)).select_from(
+                    func.generate_series(1, count)
+                )
+            )
+            return sorted(result.scalars().all())
+
+        # No sequences: ids after the current maximum, which holds as long as
+        # the caller inserts them before anyone else writes (SQLite, tests)
+        last_id = await self.session.scalar(select(func.max(table.c.id)))
+        start = (last_id or 0) + 1
+        return list(range(start, start + count))
+
     async def get_by_id(self, id: int) -> Optional[ModelType]:
         result = await self.session.execute(
             select(self.model).where(self.model.id == id)  # type: ignore
@@ -61,6 +97,30 @@ class BaseRepository(ABC, Generic[ModelType]):
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def get_rows(
+        self,
+        row_type: Type[RowType],
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+    ) -> List[RowType]:
+        """`get_all` selecting only the columns named by the `row_type` NamedTuple"""
+        query = select(*(getattr(self.model, name) for name in row_type._fields))  # type: ignore
+
+        if filters:
+            for field, value in filters.items():
+                if hasattr(self.model, field):
+                    query = query.where(getattr(self.model, field) == value)  # type: ignore
+
+        if order_by and hasattr(self.model, order_by):
+            query = query.order_by(getattr(self.model, order_by))
+
+        query = query.offset(skip).limit(limit)
+
+        result = await self.session.execute(query)
+        return [row_type._make(row) for row in result]  # type: ignore
+
     async def update(self, id: int, **kwargs: Any) -> Optional[ModelType]:
         update_data = {k: v for k, v in kwargs.items() if v is not None}
 
@@ -99,6 +159,18 @@ class BaseRepository(ABC, Generic[ModelType]):
         result = await self.session.execute(query)
         return len(result.scalars().all())
 
+    @property
+    def dialect_name(self) -> str:
+        return self.session.bind.dialect.name
+
+    def _upsert_statement(self) -> Insert:
+        """INSERT supporting `on_conflict_do_*` for the session dialect"""
+        if self.dialect_name == "postgresql":
+            return postgresql.insert(self.model)
+        if self.dialect_name == "sqlite":
+            return sqlite.insert(self.model)
+        raise NotImplementedError(f"Upsert is not supported on {self.dialect_name}")
+
     def _build_query(self) -> Select:
         return select(self.model)
 
@@ -0,0 +1,141 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from src.backoffice.core.services.metrics import MetricsRegistry, metrics
+
+T = TypeVar("T")
+
+
+class BlockingCallPool:
+    """
+    Dedicated, bounded thread pool for a blocking client library (boto3), so
+    its calls never run on the event loop and a slow backend can only tie up
+    its own `max_workers` threads.
+
+    Every call gets a deadline covering queueing, retries and I/O. Per
+    operation the registry counts calls, retries, timeouts and errors and
+    sums the seconds spent waiting for a thread apart from the seconds spent
+    in the call itself.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 10,
+        timeout: float = 60,
+        max_attempts: int = 1,
+        backoff: float = 0.2,
+        retry_on: Callable[[BaseException], bool] = lambda error: False,
+        registry: MetricsRegistry = metrics,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff = backoff
+        self.retry_on = retry_on
+        self.registry = registry
+        self.clock = clock
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Worker threads report timings too, the registry is not thread-safe
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+        registry.gauge(f"{name}_pool_waiting", lambda: self._waiting)
+        registry.gauge(f"{name}_pool_running", lambda: self._running)
+
+    async def run(
+        self,
+        operation: str,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """
+        `func(*args, **kwargs)` on the pool, retried with jittered exponential
+        backoff while `retry_on` accepts the error. Raises TimeoutError once
+        `timeout` seconds have passed; the thread itself cannot be
+        interrupted, the client's own socket timeouts bound it.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.timeout if timeout is None else timeout)
+        prefix = f"{self.name}_{operation}"
+        self._record(f"{prefix}_calls", 1)
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return await asyncio.wait_for(
+                    self._submit(loop, prefix, func, args, kwargs),
+                    deadline - loop.time(),
+                )
+            except asyncio.TimeoutError:
+                self._record(f"{prefix}_timeouts", 1)
+                raise
+            except Exception as e:
+                delay = self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1)
+                if (
+                    attempt == self.max_attempts
+                    or not self.retry_on(e)
+                    or loop.time() + delay >= deadline
+                ):
+                    self._record(f"{prefix}_errors", 1)
+                    raise
+                self._record(f"{prefix}_retries", 1)
+                await asyncio.sleep(delay)
+
+        raise AssertionError("unreachable")
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, loop, prefix, func, args, kwargs) -> "asyncio.Future[Any]":
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=self.name
+            )
+        submitted = self.clock()
+        # Guarded by the lock: a call abandoned by its caller before a thread
+        # picked it up is skipped instead of run for nobody
+        state = {"started": False, "abandoned": False}
+        with self._lock:
+            self._waiting += 1
+
+        def call():
+            started = self.clock()
+            with self._lock:
+                if state["abandoned"]:
+                    raise asyncio.CancelledError()
+                state["started"] = True
+                self._waiting -= 1
+                self._running += 1
+                self.registry.increment(f"{prefix}_queue_seconds", started - submitted)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self.registry.increment(
+                        f"{prefix}_io_seconds", self.clock() - started
+                    )
+
+        def on_done(future: "asyncio.Future[Any]") -> None:
+            with self._lock:
+                if future.cancelled() and not state["started"]:
+                    state["abandoned"] = True
+                    self._waiting -= 1
+
+        future = loop.run_in_executor(self._executor, call)
+        future.add_done_callback(on_done)
+        return future
+
+    def _record(self, name: str, value: float) -> None:
+        with self._lock:
+            self.registry.increment(name, value)
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Optional
+
+from src.backoffice.core.services.metrics import MetricsRegistry, metrics
+
+
+class DiskLRUCache:
+    """
+    Files under `directory`, at most `max_bytes` in total, the least recently
+    read evicted first.
+
+    Entries are written to a temporary file and renamed into place and read
+    through mmap, so a reader never sees a partial file and evicting an entry
+    does not disturb a response still streaming it. The index lives in
+    memory and is rebuilt from the directory on first use, oldest first.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        registry: MetricsRegistry = metrics,
+        metric_prefix: str = "disk_cache",
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.registry = registry
+        self.metric_prefix = metric_prefix
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._loaded = False
+        registry.gauge(f"{metric_prefix}_bytes", lambda: self._size)
+        registry.gauge(f"{metric_prefix}_entries", lambda: len(self._entries))
+
+    def open(self, key: str) -> Optional[mmap.mmap]:
+        """Read-only mapping of the entry, None on a miss; the caller closes it"""
+        self._load()
+        name = self._name(key)
+        if name in self._entries:
+            try:
+                with open(os.path.join(self.directory, name), "rb") as file:
+                    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):
+                self._size -= self._entries.pop(name)
+            else:
+                self._entries.move_to_end(name)
+                self.registry.increment(f"{self.metric_prefix}_hits")
+                return mapped
+        self.registry.increment(f"{self.metric_prefix}_misses")
+        return None
+
+    async def put(self, key: str, content: bytes) -> None:
+        self._load()
+        name = self._name(key)
+        await asyncio.to_thread(self._write, name, content)
+        self._size -= self._entries.pop(name, 0)
+        self._entries[name] = len(content)
+        self._size += len(content)
+        self._evict()
+
+    def clear(self) -> None:
+        self._load()
+        for name in list(self._entries):
+            self._remove(name)
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._entries)
+
+    def _write(self, name: str, content: bytes) -> None:
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(content)
+            os.replace(temp_path, os.path.join(self.directory, name))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            name = next(iter(self._entries))
+            self._remove(name)
+            self.registry.increment(f"{self.metric_prefix}_evictions")
+
+    def _remove(self, name: str) -> None:
+        self._size -= self._entries.pop(name)
+        try:
+            os.unlink(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith(".tmp"):
+                # Left over by a process that died mid-write
+                os.unlink(entry.path)
+                continue
+            stat = entry.stat()
+            files.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        self._loaded = True
+        self._evict()
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import json
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+)
+
+from src.backoffice.core.config import event_settings
+from src.backoffice.core.logging import get_logger
+
+EventHook = Callable[["Event"], Awaitable[None]]
+# Seconds before reconnecting to Redis after the pub/sub connection dropped,
+# doubling while reconnecting fails
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 30.0
+
+
+@dataclass(frozen=True)
+class Event:
+    id: str
+    channel: str
+    type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def sort_key(self) -> tuple:
+        return parse_event_id(self.id)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "Event":
+        return cls(**json.loads(raw))
+
+    def to_sse(self) -> str:
+        payload = json.dumps(self.data, default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+def parse_event_id(event_id: Optional[str]) -> tuple:
+    """Event ids look like `<ms>-<node>-<seq>` and sort as tuples"""
+    if not event_id:
+        return ()
+    try:
+        millis, node, seq = event_id.split("-", 2)
+        return int(millis), node, int(seq)
+    except ValueError:
+        return ()
+
+
+class Subscription:
+    def __init__(self, bus: "EventBus", channels: Iterable[str], queue_size: int):
+        self.bus = bus
+        self.channels = tuple(channels)
+        self.queue: asyncio.Queue[Optional[Event]] = asyncio.Queue(queue_size)
+        self.closed = False
+
+    def push(self, event: Event) -> None:
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow consumer must not hold up the others: drop it, the client
+            # reconnects with Last-Event-ID and catches up from the history
+            self.close()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.bus.unsubscribe(self)
+        with contextlib.suppress(asyncio.QueueFull):
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, None once closed; raises TimeoutError after `timeout`"""
+        if self.closed and self.queue.empty():
+            return None
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class EventBus:
+    """
+    Fan-out of change events to subscribers of this worker.
+
+    Every worker keeps one Redis pub/sub connection (when configured) and
+    dispatches incoming events to its local subscriber queues, so the number
+    of Redis connections does not grow with the number of clients. A dropped
+    connection is opened again with backoff; events other workers published
+    in between are missed.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "",
+        channel_prefix: str = "events:",
+        history_size: int = 500,
+        subscriber_queue_size: int = 256,
+    ):
+        self.redis_url = redis_url
+        self.channel_prefix = channel_prefix
+        self.history_size = history_size
+        self.subscriber_queue_size = subscriber_queue_size
+        self._node_id = uuid.uuid4().hex[:8]
+        self._sequence = itertools.count()
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._history: Dict[str, Deque[Event]] = defaultdict(
+            lambda: deque(maxlen=self.history_size)
+        )
+        self._publish_hooks: List[EventHook] = []
+        self._redis: Any = None
+        self._listener: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+        self._logger = get_logger("events")
+
+    def add_publish_hook(self, hook: EventHook) -> None:
+        """Called for every event published by this worker"""
+        self._publish_hooks.append(hook)
+
+    async def publish(
+        self, channel: str, event_type: str, data: Optional[Dict[str, Any]] = None
+    ) -> Event:
+        event = Event(
+            id=self._next_id(), channel=channel, type=event_type, data=data or {}
+        )
+        self._dispatch(event)
+
+        if self.redis_url:
+            try:
+                await self._ensure_started()
+                await self._redis.publish(
+                    f"{self.channel_prefix}{channel}", event.to_json()
+                )
+            except Exception as e:
+                self._logger.warning(
+                    "event_publish_failed", extra={"channel": channel}, exc_info=e
+                )
+
+        for hook in self._publish_hooks:
+            try:
+                await hook(event)
+            except Exception as e:
+                self._logger.warning(
+                    "event_hook_failed", extra={"type": event_type}, exc_info=e
+                )
+        return event
+
+    async def subscribe(
+        self, channels: Iterable[str], last_event_id: Optional[str] = None
+    ) -> Subscription:
+        if self.redis_url:
+            try:
+                await self._ensure_started()
+            except Exception as e:
+                self._logger.warning("event_listener_start_failed", exc_info=e)
+
+        channels = tuple(channels)
+        backlog = self.replay(channels, last_event_id) if last_event_id else []
+        subscription = Subscription(
+            self, channels, self.subscriber_queue_size + len(backlog)
+        )
+        for channel in subscription.channels:
+            self._subscribers[channel].add(subscription)
+        for event in backlog:
+            subscription.push(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for channel in subscription.channels:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[channel]
+
+    def replay(self, channels: Iterable[str], last_event_id: str) -> List[Event]:
+        """Buffered events newer than `last_event_id`, oldest first"""
+        last_key = parse_event_id(last_event_id)
+        events = [
+            event
+            for channel in channels
+            for event in self._history.get(channel, ())
+            if event.sort_key > last_key
+        ]
+        return sorted(events, key=lambda event: event.sort_key)
+
+    def subscriber_count(self, channel: Optional[str] = None) -> int:
+        if channel is not None:
+            return len(self._subscribers.get(channel, ()))
+        return len({s for subs in self._subscribers.values() for s in subs})
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _next_id(self) -> str:
+        return f"{int(time.time() * 1000)}-{self._node_id}-{next(self._sequence)}"
+
+    def _dispatch(self, event: Event) -> None:
+        self._history[event.channel].append(event)
+        for subscription in list(self._subscribers.get(event.channel, ())):
+            subscription.push(event)
+
+    async def _ensure_started(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            return
+        async with self._start_lock:
+            if self._listener is not None and not self._listener.done():
+                return
+            if self._redis is None:
+                from redis import asyncio as redis_asyncio
+
+                self._redis = redis_asyncio.from_url(self.redis_url)
+            pubsub = await self._connect()
+            self._listener = asyncio.create_task(self._listen(pubsub))
+            self._logger.info("event_listener_started")
+
+    async def _connect(self) -> Any:
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.psubscribe(f"{self.channel_prefix}*")
+        except BaseException:
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+            raise
+        return pubsub
+
+    async def _listen(self, pubsub: Any) -> None:
+        try:
+            while True:
+                try:
+                    await self._receive(pubsub)
+                except Exception as e:
+                    self._logger.warning("event_listener_failed", exc_info=e)
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+                pubsub = None
+                pubsub = await self._reconnect()
+        finally:
+            if pubsub is not None:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+            self._logger.info("event_listener_stopped")
+
+    async def _reconnect(self) -> Any:
+        for attempt in itertools.count():
+            await asyncio.sleep(min(RECONNECT_DELAY * 2**attempt, MAX_RECONNECT_DELAY))
+            try:
+                pubsub = await self._connect()
+            except Exception as e:
+                self._logger.warning(
+                    "event_listener_reconnect_failed",
+                    extra={"attempt": attempt + 1},
+                    exc_info=e,
+                )
+                continue
+            self._logger.info("event_listener_reconnected")
+            return pubsub
+
+    async def _receive(self, pubsub: Any) -> None:
+        async for message in pubsub.listen():
+            if message.get("type") != "pmessage":
+                continue
+            try:
+                event = Event.from_json(message["data"])
+            except (TypeError, ValueError) as e:
+                self._logger.warning("event_decode_failed", exc_info=e)
+                continue
+            # Events of this worker were already dispatched on publish
+            if event.sort_key[1:2] == (self._node_id,):
+                continue
+            self._dispatch(event)
+
+
+async def sse_stream(
+    subscription: Subscription,
+    heartbeat_interval: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """Server-sent events body for a subscription, with heartbeat comments"""
+    heartbeat_interval = heartbeat_interval or event_settings.heartbeat_interval
+    try:
+        # Reconnect delay hint for EventSource clients, in milliseconds
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await subscription.get(timeout=heartbeat_interval)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event is None:
+                break
+            yield event.to_sse()
+    finally:
+        subscription.close()
+
+
+event_bus = EventBus(
+    redis_url=event_settings.redis_url,
+    channel_prefix=event_settings.channel_prefix,
+    history_size=event_settings.history_size,
+    subscriber_queue_size=event_settings.subscriber_queue_size,
+)
@@ -0,0 +1,170 @@
+import io
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from PIL import Image
+
+ThumbnailSize = Tuple[str, Tuple[int, int]]
+# File contents, or the path of a file holding them
+ImageSource = Union[bytes, str]
+
+# Integer reduction (JPEG draft decoding) stops this many times above the
+# target size, LANCZOS does the rest; 2 is indistinguishable in practice
+REDUCING_GAP = 2.0
+
+
+@dataclass(frozen=True)
+class ImageFormat:
+    """How thumbnails are encoded: Pillow format name and its save options"""
+
+    name: str
+    mime_type: str
+    extension: str
+    options: Dict[str, Any] = field(default_factory=dict, hash=False)
+
+
+JPEG = ImageFormat("JPEG", "image/jpeg", ".jpg", {"quality": 85})
+# Best first when a client accepts several
+PREFERRED_MIME_TYPES = ("image/avif", "image/webp", JPEG.mime_type)
+
+
+@dataclass
+class RenderedThumbnail:
+    size: str
+    width: int
+    height: int
+    content: bytes
+    mime_type: str = JPEG.mime_type
+    extension: str = JPEG.extension
+
+
+@dataclass
+class RenderedImage:
+    width: Optional[int] = None
+    height: Optional[int] = None
+    thumbnails: List[RenderedThumbnail] = field(default_factory=list)
+
+
+def open_image(source: ImageSource) -> Image.Image:
+    return Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def read_dimensions(source: ImageSource) -> RenderedImage:
+    """Reads the header only, nothing is decoded"""
+    with open_image(source) as img:
+        return RenderedImage(width=img.width, height=img.height)
+
+
+def render_thumbnails(
+    source: ImageSource,
+    sizes: Sequence[ThumbnailSize],
+    formats: Sequence[ImageFormat] = (JPEG,),
+) -> RenderedImage:
+    """
+    Decodes an image once and encodes every one of `sizes` in every one of
+    `formats`. Runs in a worker process, so it only takes and returns plain
+    data; given a path, the file contents never pass through the pipe.
+
+    JPEGs are decoded straight at the smallest DCT scale still twice the
+    largest thumbnail, other formats are reduced by an integer factor
+    first. Each smaller variant is then resized from the previous one
+    instead of from the full image.
+    """
+    rendered_by_size: Dict[str, List[RenderedThumbnail]] = {}
+    buffer = io.BytesIO()
+
+    with open_image(source) as img:
+        # From the header, before draft() changes the size
+        rendered = RenderedImage(width=img.width, height=img.height)
+        # Palette images only resize with NEAREST, alpha makes resizing slower
+        image = img.convert("RGB") if img.mode in ("RGBA", "LA", "P") else img
+
+        largest_first = sorted(sizes, key=lambda size: size[1], reverse=True)
+        for index, (size_name, box) in enumerate(largest_first):
+            if index == 0:
+                image.thumbnail(box, Image.Resampling.LANCZOS, REDUCING_GAP)
+                thumbnail = image
+            else:
+                thumbnail = thumbnail.copy()
+                thumbnail.thumbnail(box, Image.Resampling.LANCZOS, REDUCING_GAP)
+
+            rendered_by_size[size_name] = []
+            for image_format in formats:
+                buffer.seek(0)
+                buffer.truncate()
+                thumbnail.save(buffer, format=image_format.name, **image_format.options)
+                rendered_by_size[size_name].append(
+                    RenderedThumbnail(
+                        size=size_name,
+                        width=thumbnail.width,
+                        height=thumbnail.height,
+                        content=buffer.getvalue(),
+                        mime_type=image_format.mime_type,
+                        extension=image_format.extension,
+                    )
+                )
+
+    rendered.thumbnails = [
+        thumbnail for size_name, _ in sizes for thumbnail in rendered_by_size[size_name]
+    ]
+    return rendered
+
+
+def resize_to_width(
+    source: ImageSource, width: int, image_format: ImageFormat = JPEG
+) -> RenderedThumbnail:
+    """One variant `width` pixels wide (narrower images keep their width)"""
+    buffer = io.BytesIO()
+    with open_image(source) as img:
+        height = max(round(img.height * width / img.width), 1)
+        image = img.convert("RGB") if img.mode in ("RGBA", "LA", "P") else img
+        image.thumbnail((width, height), Image.Resampling.LANCZOS, REDUCING_GAP)
+        image.save(buffer, format=image_format.name, **image_format.options)
+        return RenderedThumbnail(
+            size=f"w{image.width}",
+            width=image.width,
+            height=image.height,
+            content=buffer.getvalue(),
+            mime_type=image_format.mime_type,
+            extension=image_format.extension,
+        )
+
+
+def can_encode(image_format: ImageFormat) -> bool:
+    """Whether this Pillow build has an encoder for the format"""
+    # Plugins register their encoders on first use otherwise
+    Image.init()
+    if image_format.name == "AVIF" and "AVIF" not in Image.SAVE:
+        try:
+            # Optional plugin, Pillow only encodes AVIF itself from 11.2
+            import pillow_avif  # noqa: F401
+        except ImportError:
+            return False
+    return image_format.name in Image.SAVE
+
+
+def preferred_mime_type(accept: Optional[str], available: Iterable[str]) -> str:
+    """
+    The best of the `available` image types the Accept header names
+    explicitly, JPEG otherwise: wildcards do not count, as `*/*` is what
+    clients unaware of image formats send.
+    """
+    accepted = set()
+    for item in (accept or "").split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = next((param[2:] for param in params if param.startswith("q=")), "1")
+        try:
+            if float(quality) > 0:
+                accepted.add(media_type.lower())
+        except ValueError:
+            continue
+
+    available = set(available)
+    return next(
+        (
+            mime_type
+            for mime_type in PREFERRED_MIME_TYPES
+            if mime_type in available and mime_type in accepted
+        ),
+        JPEG.mime_type,
+    )
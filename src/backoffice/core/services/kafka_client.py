@@ -2,13 +2,27 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-from typing import Any, AsyncIterator, Callable, Optional
+from collections import defaultdict, deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
 
 from src.backoffice.core.config import kafka_settings
 from src.backoffice.core.logging import get_logger
 
+# Value and key of a message
+Message = Tuple[bytes, Optional[bytes]]
+
 
 class KafkaClient:
     def __init__(self):
@@ -58,6 +72,7 @@ class KafkaClient:
             },
         )
 
+    @contextlib.asynccontextmanager
     async def consume(
         self,
         topic: str,
@@ -111,4 +126,90 @@ class KafkaClient:
                 await task
 
 
+class InMemoryBroker:
+    """
+    Stand-in for Kafka within one process, for development and tests.
+
+    Every consumer group of a topic gets each message once, in order;
+    messages sent before the first group subscribes wait for it.
+    """
+
+    def __init__(self):
+        self._groups: Dict[str, Dict[str, Deque[Message]]] = defaultdict(dict)
+        self._unclaimed: Dict[str, Deque[Message]] = defaultdict(deque)
+        self._wakeups: Dict[str, Set[asyncio.Event]] = defaultdict(set)
+        self._handling = 0
+        self._logger = get_logger("kafka")
+
+    async def send(
+        self, topic: str, value: bytes, key: Optional[bytes] = None, **kwargs: Any
+    ):
+        queues = list(self._groups[topic].values()) or [self._unclaimed[topic]]
+        for queue in queues:
+            queue.append((value, key))
+        for wakeup in self._wakeups[topic]:
+            wakeup.set()
+
+    @contextlib.asynccontextmanager
+    async def consume(
+        self,
+        topic: str,
+        group_id: str,
+        handler: Callable[[bytes, Optional[bytes]], Any],
+        *,
+        auto_offset_reset: str = "earliest",
+    ) -> AsyncIterator[None]:
+        groups = self._groups[topic]
+        if group_id not in groups:
+            groups[group_id] = self._unclaimed.pop(topic, deque())
+        queue = groups[group_id]
+        wakeup = asyncio.Event()
+        self._wakeups[topic].add(wakeup)
+
+        async def _runner():
+            while True:
+                while queue:
+                    value, key = queue.popleft()
+                    self._handling += 1
+                    try:
+                        await handler(value, key)
+                    except Exception as e:
+                        self._logger.warning(
+                            "kafka_message_failed", extra={"topic": topic}, exc_info=e
+                        )
+                    finally:
+                        self._handling -= 1
+                wakeup.clear()
+                await wakeup.wait()
+
+        task = asyncio.create_task(_runner())
+        try:
+            yield None
+        finally:
+            self._wakeups[topic].discard(wakeup)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def drain(self) -> None:
+        """Wait until the running consumers have handled every message so far"""
+        while self._handling or any(
+            queue
+            for topic, groups in self._groups.items()
+            if self._wakeups[topic]
+            for queue in groups.values()
+        ):
+            await asyncio.sleep(0.01)
+
+    async def stop(self):
+        pass
+
+
+def create_message_broker() -> Union[KafkaClient, InMemoryBroker]:
+    if kafka_settings.get_bootstrap_servers():
+        return kafka_client
+    return InMemoryBroker()
+
+
 kafka_client = KafkaClient()
+message_broker = create_message_broker()
@@ -0,0 +1,33 @@
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class MetricsRegistry:
+    """In-process counters and gauges, exposed at /health/metrics"""
+
+    def __init__(self):
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        self._counters[name] += value
+
+    def gauge(self, name: str, callback: Callable[[], float]) -> None:
+        """Register a value read at snapshot time"""
+        self._gauges[name] = callback
+
+    def get(self, name: str) -> float:
+        if name in self._gauges:
+            return self._gauges[name]()
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        values = dict(self._counters)
+        values.update((name, callback()) for name, callback in self._gauges.items())
+        return dict(sorted(values.items()))
+
+    def reset(self) -> None:
+        self._counters.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,106 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+from src.backoffice.core.services.metrics import MetricsRegistry, metrics
+
+T = TypeVar("T")
+
+# Workers start from a clean single-threaded server process, not a fork of
+# the app: forking it while boto3 and to_thread workers hold locks (logging,
+# connection pools) can leave a worker deadlocked on one of them
+START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _timed_call(
+    func: Callable[..., T], args: Tuple[Any, ...]
+) -> Tuple[T, float, float]:
+    """Runs in the worker: the result, when it started and its CPU seconds"""
+    started = time.time()
+    cpu_started = time.process_time()
+    result = func(*args)
+    return result, started, time.process_time() - cpu_started
+
+
+class CpuTaskPool:
+    """
+    Process pool for CPU-bound work (image decoding and encoding) that would
+    otherwise hold the event loop and the GIL.
+
+    At most `max_workers + max_queue` tasks are submitted at a time; further
+    callers wait their turn on the loop, so a burst of uploads queues up in
+    asyncio instead of piling file contents into the executor. Per operation
+    the registry sums the seconds tasks waited, ran and spent on CPU.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        registry: MetricsRegistry = metrics,
+    ):
+        self.name = name
+        self.max_workers = max(max_workers, 1)
+        self.max_queue = max_queue
+        self.registry = registry
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._submitted = 0
+        self._waiting = 0
+        registry.gauge(f"{name}_pool_submitted", lambda: self._submitted)
+        registry.gauge(f"{name}_pool_waiting", lambda: self._waiting)
+
+    async def run(self, operation: str, func: Callable[..., T], *args: Any) -> T:
+        """`func(*args)` in a worker process; both must be picklable"""
+        prefix = f"{self.name}_{operation}"
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+
+        waited = time.time()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._submitted += 1
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                result, started, cpu_seconds = await loop.run_in_executor(
+                    self._get_executor(), _timed_call, func, args
+                )
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    # A worker died (OOM on a huge image), start over next time
+                    self.shutdown(wait=False)
+                self.registry.increment(f"{prefix}_errors")
+                raise
+        finally:
+            self._submitted -= 1
+            self._slots.release()
+
+        self.registry.increment(f"{prefix}_calls")
+        self.registry.increment(f"{prefix}_queue_seconds", started - waited)
+        self.registry.increment(f"{prefix}_run_seconds", time.time() - started)
+        self.registry.increment(f"{prefix}_cpu_seconds", cpu_seconds)
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(START_METHOD),
+            )
+        return self._executor
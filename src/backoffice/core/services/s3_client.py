@@ -1,15 +1,54 @@
-import io
+import asyncio
+import contextlib
+import hashlib
 import os
-import uuid
+import tempfile
 from datetime import datetime, timedelta, timezone
+from typing import IO, AsyncIterator, Dict, Iterable, List, Optional
 
 import boto3
 from botocore.config import Config
-from botocore.exceptions import ClientError, NoCredentialsError
+from botocore.exceptions import BotoCoreError, ClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
+from botocore.exceptions import HTTPClientError, NoCredentialsError
 from fastapi import HTTPException, UploadFile
-from PIL import Image
 
 from src.backoffice.core.config import s3_settings
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.blocking_pool import BlockingCallPool
+from src.backoffice.core.services.image_processing import (
+    ImageFormat,
+    ImageSource,
+    RenderedImage,
+    can_encode,
+    read_dimensions,
+    render_thumbnails,
+)
+from src.backoffice.core.services.process_pool import CpuTaskPool
+from src.backoffice.core.services.signed_url_cache import SignedUrlCache
+from src.backoffice.core.services.upload_stream import (
+    MIN_PART_SIZE,
+    READ_CHUNK_SIZE,
+    ReceivedUpload,
+    sniff_content_type,
+)
+
+THUMBNAIL_SIZE_NAMES = ("small", "medium", "large")
+logger = get_logger("s3")
+TRANSIENT_ERROR_CODES = {"RequestTimeout", "SlowDown", "Throttling", "InternalError"}
+# Most keys a single DeleteObjects request accepts
+MAX_DELETE_KEYS = 1000
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Failures worth retrying: lost connections, throttling and 5xx responses"""
+    if isinstance(error, (BotoConnectionError, HTTPClientError)):
+        return True
+    if isinstance(error, ClientError):
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        code = error.response.get("Error", {}).get("Code")
+        return status >= 500 or code in TRANSIENT_ERROR_CODES
+    return False
 
 
 class S3Client:
@@ -18,7 +57,12 @@ class S3Client:
             proxies={
                 "http": None,
                 "https": None,
-            }
+            },
+            max_pool_connections=s3_settings.max_connections,
+            connect_timeout=s3_settings.connect_timeout,
+            read_timeout=s3_settings.read_timeout,
+            # Retried by the pool, which knows the deadline of the operation
+            retries={"total_max_attempts": 1},
         )
         self.s3_client = boto3.client(
             "s3",
@@ -30,6 +74,23 @@ class S3Client:
             config=config,
         )
         self.bucket_name = s3_settings.bucket_name
+        self.pool = BlockingCallPool(
+            "s3",
+            max_workers=s3_settings.max_connections,
+            timeout=s3_settings.operation_timeout,
+            max_attempts=s3_settings.max_attempts,
+            backoff=s3_settings.retry_backoff,
+            retry_on=is_transient_error,
+        )
+        self.image_pool = CpuTaskPool(
+            "image",
+            max_workers=s3_settings.image_workers,
+            max_queue=s3_settings.image_queue_size,
+        )
+        self.thumbnail_formats = self._thumbnail_formats()
+        self.url_cache = SignedUrlCache(
+            self._sign_url, max_entries=s3_settings.url_cache_size
+        )
 
     async def upload_file(
         self,
@@ -37,41 +98,53 @@ class S3Client:
         folder: str = "menu-images",
         generate_thumbnails: bool = True,
     ) -> dict:
-        try:
-            await self._validate_file(file)
-
-            file_extension = self._get_file_extension(file.filename)
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = f"{folder}/{unique_filename}"
-
-            file_content = await file.read()
+        async with self.receive_upload(file) as received:
+            return await self.store_upload(received, folder, generate_thumbnails)
+
+    @contextlib.asynccontextmanager
+    async def receive_upload(self, file: UploadFile) -> AsyncIterator[ReceivedUpload]:
+        """
+        Reads the upload to a temporary file, checking its size and sniffed
+        content type and hashing it on the way; the file is removed on exit
+        """
+        with tempfile.NamedTemporaryFile() as spool:
+            try:
+                await self._validate_file(file)
+                received = await self._receive(file, spool)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=400, detail=f"Error uploading file: {str(e)}"
+                )
+            yield received
 
-            upload_result = await self._upload_to_s3(
-                file_path, file_content, file.content_type
-            )
+    async def store_upload(
+        self,
+        received: ReceivedUpload,
+        folder: str = "menu-images",
+        generate_thumbnails: bool = True,
+    ) -> dict:
+        """
+        Stores a received upload and its thumbnails. The key is the content
+        hash, so storing the same contents again overwrites the same objects
+        """
+        try:
+            filename = f"{received.content_hash}{received.extension}"
+            file_path = f"{folder}/{filename}"
+            await self._upload_received(received, file_path)
 
             result = {
-                "filename": unique_filename,
-                "original_filename": file.filename,
+                "filename": filename,
+                "original_filename": received.original_filename,
                 "file_path": file_path,
-                "file_size": len(file_content),
-                "mime_type": file.content_type,
-                "url": upload_result["url"],
+                "file_size": received.file_size,
+                "mime_type": received.mime_type,
+                "content_hash": received.content_hash,
+                "url": f"{s3_settings.endpoint_url}/{self.bucket_name}/{file_path}",
                 "thumbnails": [],
             }
 
-            if generate_thumbnails and self._is_image_file(file.content_type):
-                thumbnails = await self._generate_thumbnails(
-                    file_content, folder, unique_filename, file_extension
-                )
-                result["thumbnails"] = thumbnails
-
-                try:
-                    with Image.open(io.BytesIO(file_content)) as img:
-                        result["width"] = img.width
-                        result["height"] = img.height
-                except (OSError, ValueError):
-                    pass
+            if generate_thumbnails and self._is_image_file(received.mime_type):
+                result.update(await self.store_thumbnails(received.path, file_path))
 
             return result
 
@@ -80,14 +153,77 @@ class S3Client:
                 status_code=400, detail=f"Error uploading file: {str(e)}"
             )
 
+    async def store_thumbnails(
+        self, source: ImageSource, file_path: str, strict: bool = False
+    ) -> dict:
+        """
+        Renders and stores the thumbnails of the original stored at
+        `file_path`: `thumbnails`, and `width` and `height` when readable.
+        An unreadable image is stored without them unless `strict`, then
+        the render error is raised
+        """
+        rendered = await self._render_image(source, strict)
+        folder, filename = file_path.rsplit("/", 1)
+        result = {
+            "thumbnails": await self._upload_thumbnails(rendered, folder, filename)
+        }
+        if rendered.width is not None:
+            result["width"] = rendered.width
+            result["height"] = rendered.height
+        return result
+
     async def delete_file(self, file_path: str) -> bool:
         try:
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=file_path)
+            await self.pool.run(
+                "delete_object",
+                self.s3_client.delete_object,
+                Bucket=self.bucket_name,
+                Key=file_path,
+            )
             return True
-        except ClientError as e:
-            print(f"Error deleting file {file_path}: {e}")
+        except (BotoCoreError, ClientError, TimeoutError) as e:
+            logger.warning("delete_failed", extra={"file_path": file_path}, exc_info=e)
             return False
 
+    async def list_objects(
+        self, prefix: str, page_size: int = 1000
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Objects under `prefix` in key order, a page (Key, Size, LastModified)
+        per request; the next page is only requested once this one is consumed
+        """
+        params = {"Bucket": self.bucket_name, "Prefix": prefix, "MaxKeys": page_size}
+        while True:
+            response = await self.pool.run(
+                "list_objects", self.s3_client.list_objects_v2, **params
+            )
+            contents = response.get("Contents", [])
+            if contents:
+                yield contents
+            if not response.get("IsTruncated"):
+                return
+            params["ContinuationToken"] = response["NextContinuationToken"]
+
+    async def delete_files(self, file_paths: List[str]) -> List[str]:
+        """
+        Deletes up to MAX_DELETE_KEYS objects in one request, returning the
+        keys that could not be deleted
+        """
+        if not file_paths:
+            return []
+        if len(file_paths) > MAX_DELETE_KEYS:
+            raise ValueError(f"At most {MAX_DELETE_KEYS} keys per request")
+        response = await self.pool.run(
+            "delete_objects",
+            self.s3_client.delete_objects,
+            Bucket=self.bucket_name,
+            Delete={
+                "Objects": [{"Key": file_path} for file_path in file_paths],
+                "Quiet": True,
+            },
+        )
+        return [error["Key"] for error in response.get("Errors", [])]
+
     async def get_presigned_url(self, file_path: str, expiry_hours: int = 1) -> str:
         try:
             expiry = datetime.now(timezone.utc) + timedelta(hours=expiry_hours)
@@ -104,18 +240,126 @@ class S3Client:
                 status_code=400, detail=f"Error generating URL: {str(e)}"
             )
 
+    async def get_url(self, file_path: str, expiry_hours: int = 24) -> str:
+        return (await self.get_urls([file_path], expiry_hours))[file_path]
+
+    async def get_urls(
+        self, file_paths: Iterable[str], expiry_hours: int = 24
+    ) -> Dict[str, str]:
+        """
+        Display URLs of many objects at once: CDN URLs when configured,
+        otherwise presigned URLs valid for at least `expiry_hours`, reused
+        from the cache while they are
+        """
+        if s3_settings.cdn_base_url:
+            return {
+                file_path: f"{s3_settings.cdn_base_url}/{file_path}"
+                for file_path in file_paths
+            }
+        try:
+            return self.url_cache.get_many(file_paths, expiry_hours * 3600)
+        except ClientError as e:
+            raise HTTPException(
+                status_code=400, detail=f"Error generating URL: {str(e)}"
+            )
+
+    def _sign_url(self, file_path: str, expires_in: int) -> str:
+        return self.s3_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket_name, "Key": file_path},
+            ExpiresIn=expires_in,
+        )
+
+    async def get_object(self, file_path: str) -> Optional[bytes]:
+        """Contents of a small object, None when it does not exist"""
+
+        def read() -> bytes:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_path)
+            return response["Body"].read()
+
+        try:
+            return await self.pool.run("get_object", read)
+        except ClientError as e:
+            if self._is_not_found(e):
+                return None
+            raise
+
+    async def download_file(self, file_path: str, destination: str) -> bool:
+        """Streams an object to a local file, False when it does not exist"""
+        try:
+            await self.pool.run(
+                "download_file",
+                self.s3_client.download_file,
+                self.bucket_name,
+                file_path,
+                destination,
+            )
+            return True
+        except ClientError as e:
+            if self._is_not_found(e):
+                return False
+            raise
+
+    async def store_object(
+        self, file_path: str, content: bytes, content_type: str
+    ) -> bool:
+        try:
+            await self._put_object(file_path, content, content_type)
+            return True
+        except (BotoCoreError, ClientError, TimeoutError) as e:
+            logger.warning("store_failed", extra={"file_path": file_path}, exc_info=e)
+            return False
+
+    @staticmethod
+    def _is_not_found(error: ClientError) -> bool:
+        return error.response.get("Error", {}).get("Code") in (
+            "404",
+            "NoSuchKey",
+            "NotFound",
+        )
+
     async def file_exists(self, file_path: str) -> bool:
         try:
-            self.s3_client.head_object(Bucket=self.bucket_name, Key=file_path)
+            await self.pool.run(
+                "head_object",
+                self.s3_client.head_object,
+                Bucket=self.bucket_name,
+                Key=file_path,
+            )
             return True
         except ClientError:
             return False
 
+    async def get_last_modified(self, file_path: str) -> Optional[datetime]:
+        """When an object was last written, None when it does not exist"""
+        try:
+            response = await self.pool.run(
+                "head_object",
+                self.s3_client.head_object,
+                Bucket=self.bucket_name,
+                Key=file_path,
+            )
+        except ClientError as e:
+            if self._is_not_found(e):
+                return None
+            raise
+        return response["LastModified"]
+
+    async def head_bucket(self) -> None:
+        await self.pool.run(
+            "head_bucket", self.s3_client.head_bucket, Bucket=self.bucket_name
+        )
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False)
+        self.image_pool.shutdown(wait=False)
+
     async def _validate_file(self, file: UploadFile):
         if not file.filename:
             raise HTTPException(status_code=400, detail="File name not specified")
 
-        if hasattr(file, "size") and file.size > s3_settings.max_file_size:
+        # The declared size fails early, the streamed size is checked anyway
+        if file.size is not None and file.size > s3_settings.max_file_size:
             raise HTTPException(
                 status_code=400,
                 detail=f"The file size exceeds the maximum allowed ({s3_settings.max_file_size} byte)",
@@ -138,6 +382,53 @@ class S3Client:
                 detail=f"Invalid file type. Allowed: {', '.join(s3_settings.allowed_mime_types)}",
             )
 
+    @staticmethod
+    def thumbnail_path(
+        file_path: str, size_name: str, extension: Optional[str] = None
+    ) -> str:
+        """
+        Where the `size_name` thumbnail of an uploaded file is stored, with the
+        extension of the original unless another is given
+        """
+        folder, _, filename = file_path.rpartition("/")
+        stem, original_extension = os.path.splitext(filename)
+        return (
+            f"{folder}/thumbnails/{stem}_{size_name}{extension or original_extension}"
+        )
+
+    @staticmethod
+    def _thumbnail_formats() -> List[ImageFormat]:
+        available = {
+            "jpeg": ImageFormat(
+                "JPEG", "image/jpeg", ".jpg", {"quality": s3_settings.jpeg_quality}
+            ),
+            "webp": ImageFormat(
+                "WEBP",
+                "image/webp",
+                ".webp",
+                {
+                    "quality": s3_settings.webp_quality,
+                    "method": s3_settings.webp_method,
+                },
+            ),
+            "avif": ImageFormat(
+                "AVIF",
+                "image/avif",
+                ".avif",
+                {"quality": s3_settings.avif_quality, "speed": s3_settings.avif_speed},
+            ),
+        }
+        formats = [available["jpeg"]]
+        for name in s3_settings.thumbnail_formats:
+            image_format = available.get(name)
+            if image_format is None or image_format in formats:
+                continue
+            if not can_encode(image_format):
+                logger.warning("thumbnail_format_unavailable", extra={"format": name})
+                continue
+            formats.append(image_format)
+        return formats
+
     @staticmethod
     def _get_file_extension(filename: str) -> str:
         return os.path.splitext(filename)[1]
@@ -146,77 +437,206 @@ class S3Client:
     def _is_image_file(content_type: str) -> bool:
         return content_type.startswith("image/")
 
-    async def _upload_to_s3(
-        self, file_path: str, file_content: bytes, content_type: str
-    ) -> dict:
-        try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_path,
-                Body=file_content,
-                ContentType=content_type,
-                ACL="public-read",
-            )
+    async def _receive(self, file: UploadFile, spool: IO[bytes]) -> ReceivedUpload:
+        """
+        Copies the upload to `spool` chunk by chunk, at most one in memory;
+        disk writes run off the event loop
+        """
+        digest = hashlib.sha256()
+        file_size = 0
+        mime_type: Optional[str] = None
+
+        while chunk := await file.read(READ_CHUNK_SIZE):
+            if mime_type is None:
+                mime_type = sniff_content_type(chunk)
+                if mime_type not in s3_settings.allowed_mime_types:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="File content is not an allowed image type",
+                    )
+            file_size += len(chunk)
+            if file_size > s3_settings.max_file_size:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"The file size exceeds the maximum allowed ({s3_settings.max_file_size} byte)",
+                )
+            digest.update(chunk)
+            await asyncio.to_thread(spool.write, chunk)
+
+        if mime_type is None:
+            raise HTTPException(status_code=400, detail="File is empty")
+        await asyncio.to_thread(spool.flush)
+
+        return ReceivedUpload(
+            original_filename=file.filename,
+            extension=self._get_file_extension(file.filename).lower(),
+            path=spool.name,
+            file_size=file_size,
+            content_hash=digest.hexdigest(),
+            mime_type=mime_type,
+        )
 
-            url = f"{s3_settings.endpoint_url}/{self.bucket_name}/{file_path}"
+    async def _upload_received(self, received: ReceivedUpload, file_path: str) -> None:
+        """
+        Sends the received file to S3, in multipart parts when larger than
+        one, so at most one part is held in memory
+        """
+        part_size = max(s3_settings.multipart_part_size, MIN_PART_SIZE)
+        upload_id: Optional[str] = None
+        parts: List[dict] = []
 
-            return {"url": url, "file_path": file_path}
+        try:
+            with open(received.path, "rb") as source:
+                if received.file_size <= part_size:
+                    await self._put_object(
+                        file_path,
+                        await asyncio.to_thread(source.read),
+                        received.mime_type,
+                    )
+                    return
+
+                upload_id = await self._create_multipart_upload(
+                    file_path, received.mime_type
+                )
+                while part := await asyncio.to_thread(source.read, part_size):
+                    parts.append(
+                        await self._upload_part(
+                            file_path, upload_id, len(parts) + 1, part
+                        )
+                    )
+                await self.pool.run(
+                    "complete_multipart_upload",
+                    self.s3_client.complete_multipart_upload,
+                    Bucket=self.bucket_name,
+                    Key=file_path,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
         except NoCredentialsError:
+            await self._abort_multipart_upload(file_path, upload_id)
             raise HTTPException(status_code=500, detail="S3 authentication error")
-        except ClientError as e:
+        except (BotoCoreError, ClientError, TimeoutError) as e:
+            await self._abort_multipart_upload(file_path, upload_id)
             raise HTTPException(
                 status_code=500, detail=f"Error uploading to S3: {str(e)}"
             )
+        except BaseException:
+            await self._abort_multipart_upload(file_path, upload_id)
+            raise
+
+    async def _create_multipart_upload(self, file_path: str, content_type: str) -> str:
+        response = await self.pool.run(
+            "create_multipart_upload",
+            self.s3_client.create_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=file_path,
+            ContentType=content_type,
+            ACL="public-read",
+        )
+        return response["UploadId"]
 
-    async def _generate_thumbnails(
-        self, file_content: bytes, folder: str, base_filename: str, file_extension: str
-    ) -> list:
-        if not s3_settings.generate_thumbnails:
-            return []
-
-        thumbnails = []
+    async def _upload_part(
+        self, file_path: str, upload_id: str, part_number: int, body: bytes
+    ) -> dict:
+        response = await self.pool.run(
+            "upload_part",
+            self.s3_client.upload_part,
+            Bucket=self.bucket_name,
+            Key=file_path,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
 
+    async def _abort_multipart_upload(
+        self, file_path: str, upload_id: Optional[str]
+    ) -> None:
+        if upload_id is None:
+            return
         try:
-            with Image.open(io.BytesIO(file_content)) as img:
-                if img.mode in ("RGBA", "LA", "P"):
-                    img = img.convert("RGB")
-
-                for size_name, (width, height) in [
-                    ("small", s3_settings.thumbnail_sizes[0]),
-                    ("medium", s3_settings.thumbnail_sizes[1]),
-                    ("large", s3_settings.thumbnail_sizes[2]),
-                ]:
-                    thumbnail = img.copy()
-                    thumbnail.thumbnail((width, height), Image.Resampling.LANCZOS)
-
-                    thumbnail_buffer = io.BytesIO()
-                    thumbnail.save(thumbnail_buffer, format="JPEG", quality=85)
-                    thumbnail_buffer.seek(0)
-
-                    thumbnail_filename = f"{os.path.splitext(base_filename)[0]}_{size_name}{file_extension}"
-                    thumbnail_path = f"{folder}/thumbnails/{thumbnail_filename}"
-
-                    self.s3_client.put_object(
-                        Bucket=self.bucket_name,
-                        Key=thumbnail_path,
-                        Body=thumbnail_buffer.getvalue(),
-                        ContentType="image/jpeg",
-                        ACL="public-read",
-                    )
+            await self.pool.run(
+                "abort_multipart_upload",
+                self.s3_client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=file_path,
+                UploadId=upload_id,
+            )
+        except (BotoCoreError, ClientError, TimeoutError) as e:
+            logger.warning(
+                "multipart_abort_failed", extra={"file_path": file_path}, exc_info=e
+            )
 
-                    thumbnails.append(
-                        {
-                            "size": size_name,
-                            "width": thumbnail.width,
-                            "height": thumbnail.height,
-                            "file_path": thumbnail_path,
-                            "url": f"{s3_settings.endpoint_url}/{self.bucket_name}/{thumbnail_path}",
-                        }
-                    )
+    async def _put_object(
+        self, file_path: str, file_content: bytes, content_type: str
+    ) -> None:
+        await self.pool.run(
+            "put_object",
+            self.s3_client.put_object,
+            Bucket=self.bucket_name,
+            Key=file_path,
+            Body=file_content,
+            ContentType=content_type,
+            ACL="public-read",
+        )
 
+    async def _render_image(
+        self, source: ImageSource, strict: bool = False
+    ) -> RenderedImage:
+        """Dimensions and encoded thumbnails, decoded in the image worker pool"""
+        try:
+            if not s3_settings.generate_thumbnails:
+                return read_dimensions(source)
+            return await self.image_pool.run(
+                "thumbnails",
+                render_thumbnails,
+                source,
+                list(zip(THUMBNAIL_SIZE_NAMES, s3_settings.thumbnail_sizes)),
+                self.thumbnail_formats,
+            )
         except Exception as e:
-            print(f"Error generating thumbnails: {e}")
+            if strict:
+                raise
+            logger.warning("thumbnails_failed", exc_info=e)
+            return RenderedImage()
 
+    async def _upload_thumbnails(
+        self, rendered: RenderedImage, folder: str, base_filename: str
+    ) -> list:
+        paths = [
+            self.thumbnail_path(
+                f"{folder}/{base_filename}", thumbnail.size, thumbnail.extension
+            )
+            for thumbnail in rendered.thumbnails
+        ]
+        results = await asyncio.gather(
+            *(
+                self._put_object(path, thumbnail.content, thumbnail.mime_type)
+                for path, thumbnail in zip(paths, rendered.thumbnails)
+            ),
+            return_exceptions=True,
+        )
+
+        thumbnails = []
+        for path, thumbnail, result in zip(paths, rendered.thumbnails, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "thumbnail_upload_failed",
+                    extra={"file_path": path},
+                    exc_info=result,
+                )
+                continue
+            thumbnails.append(
+                {
+                    "size": thumbnail.size,
+                    "width": thumbnail.width,
+                    "height": thumbnail.height,
+                    "file_path": path,
+                    "file_size": len(thumbnail.content),
+                    "mime_type": thumbnail.mime_type,
+                    "url": f"{s3_settings.endpoint_url}/{self.bucket_name}/{path}",
+                }
+            )
         return thumbnails
 
 
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import abc
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Dict, Iterable, List, Mapping, Optional
+
+from src.backoffice.core.config import search_settings
+from src.backoffice.core.logging import get_logger
+
+Document = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """Logical index: documents keyed by their `id` field"""
+
+    name: str
+    mappings: Dict[str, Any] = field(default_factory=dict, hash=False)
+
+
+@dataclass
+class SearchPage:
+    total: int = 0
+    hits: List[Document] = field(default_factory=list)
+
+
+class SearchBackend(abc.ABC):
+    """Storage for search documents, kept apart from the primary database"""
+
+    @abc.abstractmethod
+    async def bulk_index(self, index: SearchIndex, documents: Iterable[Document]):
+        """Insert or replace documents"""
+
+    @abc.abstractmethod
+    async def bulk_delete(self, index: SearchIndex, ids: Iterable[Any]):
+        """Remove documents, missing ids are ignored"""
+
+    @abc.abstractmethod
+    async def rebuild(
+        self, index: SearchIndex, batches: AsyncIterable[List[Document]]
+    ) -> int:
+        """
+        Replace the whole index with `batches`, returns the document count.
+        Writes made meanwhile go to the new index too and win over the
+        batches; a document deleted after its batch was read comes back
+        until the next write to it.
+        """
+
+    @abc.abstractmethod
+    async def search(
+        self,
+        index: SearchIndex,
+        query: str,
+        fields: Mapping[str, float],
+        filters: Optional[Mapping[str, Any]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchPage:
+        """
+        Documents where every query word is a prefix of a word in `fields`,
+        scored by the field boosts; `filters` are exact matches
+        """
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemorySearchBackend(SearchBackend):
+    """Per-process index for development and tests"""
+
+    def __init__(self):
+        self._indices: Dict[str, Dict[str, Document]] = {}
+        # Indices being rebuilt, by name
+        self._rebuilding: Dict[str, Dict[str, Document]] = {}
+
+    async def bulk_index(self, index: SearchIndex, documents: Iterable[Document]):
+        targets = self._write_targets(index)
+        for document in documents:
+            for documents_by_id in targets:
+                documents_by_id[str(document["id"])] = dict(document)
+
+    async def bulk_delete(self, index: SearchIndex, ids: Iterable[Any]):
+        targets = self._write_targets(index)
+        for document_id in ids:
+            for documents_by_id in targets:
+                documents_by_id.pop(str(document_id), None)
+
+    async def rebuild(
+        self, index: SearchIndex, batches: AsyncIterable[List[Document]]
+    ) -> int:
+        documents_by_id = self._rebuilding[index.name] = {}
+        try:
+            async for batch in batches:
+                for document in batch:
+                    documents_by_id.setdefault(str(document["id"]), dict(document))
+        finally:
+            del self._rebuilding[index.name]
+        self._indices[index.name] = documents_by_id
+        return len(documents_by_id)
+
+    async def search(
+        self,
+        index: SearchIndex,
+        query: str,
+        fields: Mapping[str, float],
+        filters: Optional[Mapping[str, Any]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchPage:
+        terms = tokenize(query)
+        scored = []
+        for document in self._indices.get(index.name, {}).values():
+            if filters and any(document.get(k) != v for k, v in filters.items()):
+                continue
+            score = self._score(document, terms, fields)
+            if score:
+                scored.append((score, document))
+
+        scored.sort(key=lambda item: (-item[0], str(item[1]["id"])))
+        return SearchPage(
+            total=len(scored),
+            hits=[
+                {**document, "_score": score}
+                for score, document in scored[offset : offset + limit]
+            ],
+        )
+
+    def get(self, index: SearchIndex, document_id: Any) -> Optional[Document]:
+        return self._indices.get(index.name, {}).get(str(document_id))
+
+    def clear(self) -> None:
+        self._indices.clear()
+
+    def _write_targets(self, index: SearchIndex) -> List[Dict[str, Document]]:
+        targets = [self._indices.setdefault(index.name, {})]
+        if index.name in self._rebuilding:
+            targets.append(self._rebuilding[index.name])
+        return targets
+
+    @staticmethod
+    def _score(
+        document: Document, terms: List[str], fields: Mapping[str, float]
+    ) -> float:
+        if not terms:
+            return 0.0
+        words = {name: tokenize(document.get(name) or "") for name in fields}
+        score = 0.0
+        for term in terms:
+            boost = max(
+                (
+                    fields[name]
+                    for name, field_words in words.items()
+                    if any(word.startswith(term) for word in field_words)
+                ),
+                default=0.0,
+            )
+            if not boost:
+                return 0.0
+            score += boost
+        return score
+
+
+class ElasticsearchBackend(SearchBackend):
+    """
+    Indices are read and written through an alias `<prefix><name>`, a rebuild
+    fills a fresh index and swaps the alias so searches never see it half-done.
+    While it fills, a second alias `<prefix><name>-rebuild` points at the
+    fresh index and writes go to both, from whichever process they come.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        index_prefix: str = "",
+        chunk_size: int = 500,
+        request_timeout: float = 10,
+    ):
+        from elasticsearch import AsyncElasticsearch
+
+        self.index_prefix = index_prefix
+        self.chunk_size = chunk_size
+        self._client = AsyncElasticsearch(url, request_timeout=request_timeout)
+        self._ready: set[str] = set()
+        self._logger = get_logger("search")
+
+    def alias(self, index: SearchIndex) -> str:
+        return f"{self.index_prefix}{index.name}"
+
+    def rebuild_alias(self, index: SearchIndex) -> str:
+        return f"{self.alias(index)}-rebuild"
+
+    async def bulk_index(self, index: SearchIndex, documents: Iterable[Document]):
+        documents = list(documents)
+        for target in await self._write_targets(index):
+            await self._bulk(
+                {"_index": target, "_id": str(document["id"]), "_source": document}
+                for document in documents
+            )
+
+    async def bulk_delete(self, index: SearchIndex, ids: Iterable[Any]):
+        ids = list(ids)
+        for target in await self._write_targets(index):
+            await self._bulk(
+                {"_op_type": "delete", "_index": target, "_id": str(document_id)}
+                for document_id in ids
+            )
+
+    async def rebuild(
+        self, index: SearchIndex, batches: AsyncIterable[List[Document]]
+    ) -> int:
+        alias = self.alias(index)
+        rebuild_alias = self.rebuild_alias(index)
+        target = await self._create_index(index)
+        count = 0
+        try:
+            # Before reading the database: whatever changes after the read
+            # started is written to the fresh index as well
+            await self._client.indices.put_alias(index=target, name=rebuild_alias)
+            async for batch in batches:
+                # Created only, a concurrent write is newer than the batch
+                await self._bulk(
+                    {
+                        "_op_type": "create",
+                        "_index": target,
+                        "_id": str(document["id"]),
+                        "_source": document,
+                    }
+                    for document in batch
+                )
+                count += len(batch)
+            await self._client.indices.refresh(index=target)
+        except BaseException:
+            await self._client.indices.delete(index=target, ignore_unavailable=True)
+            raise
+
+        previous = await self._alias_targets(alias)
+        actions: List[Dict[str, Any]] = [
+            {"remove": {"index": name, "alias": alias}} for name in previous
+        ]
+        actions.append({"add": {"index": target, "alias": alias}})
+        actions.append({"remove": {"index": target, "alias": rebuild_alias}})
+        await self._client.indices.update_aliases(actions=actions)
+        for name in previous:
+            await self._client.indices.delete(index=name, ignore_unavailable=True)
+        self._ready.add(alias)
+        self._logger.info(
+            "search_index_rebuilt", extra={"index": target, "documents": count}
+        )
+        return count
+
+    async def search(
+        self,
+        index: SearchIndex,
+        query: str,
+        fields: Mapping[str, float],
+        filters: Optional[Mapping[str, Any]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchPage:
+        response = await self._client.search(
+            index=self.alias(index),
+            query={
+                "bool": {
+                    "must": {
+                        "multi_match": {
+                            "query": query,
+                            "type": "bool_prefix",
+                            "operator": "and",
+                            "fields": [
+                                f"{name}^{boost}" for name, boost in fields.items()
+                            ],
+                        }
+                    },
+                    "filter": [
+                        {"term": {name: value}}
+                        for name, value in (filters or {}).items()
+                    ],
+                }
+            },
+            from_=offset,
+            size=limit,
+            track_total_hits=True,
+            ignore_unavailable=True,
+        )
+        hits = response["hits"]
+        return SearchPage(
+            total=hits["total"]["value"],
+            hits=[{**hit["_source"], "_score": hit["_score"]} for hit in hits["hits"]],
+        )
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    async def _bulk(self, actions: Iterable[Dict[str, Any]]) -> None:
+        from elasticsearch.helpers import async_bulk
+
+        _, errors = await async_bulk(
+            self._client,
+            actions,
+            chunk_size=self.chunk_size,
+            raise_on_error=False,
+        )
+        # Deleting a document that was never indexed is fine, and so is a
+        # rebuild finding a document already written since
+        errors = [
+            error
+            for error in errors
+            if error.get("delete", {}).get("status") != 404
+            and error.get("create", {}).get("status") != 409
+        ]
+        if errors:
+            self._logger.warning(
+                "search_bulk_failed",
+                extra={"errors": len(errors), "first_error": errors[0]},
+            )
+
+    async def _write_targets(self, index: SearchIndex) -> List[str]:
+        targets = [await self._ensure_index(index)]
+        rebuild_alias = self.rebuild_alias(index)
+        if await self._client.indices.exists_alias(name=rebuild_alias):
+            targets.append(rebuild_alias)
+        return targets
+
+    async def _ensure_index(self, index: SearchIndex) -> str:
+        """Create the index on first write so it never gets dynamic mappings"""
+        alias = self.alias(index)
+        if alias in self._ready:
+            return alias
+        if not await self._client.indices.exists_alias(name=alias):
+            target = await self._create_index(index)
+            await self._client.indices.put_alias(index=target, name=alias)
+        self._ready.add(alias)
+        return alias
+
+    async def _create_index(self, index: SearchIndex) -> str:
+        name = f"{self.alias(index)}-{int(time.time() * 1000)}"
+        await self._client.indices.create(index=name, mappings=index.mappings)
+        return name
+
+    async def _alias_targets(self, alias: str) -> List[str]:
+        if not await self._client.indices.exists_alias(name=alias):
+            return []
+        response = await self._client.indices.get_alias(name=alias)
+        return list(response.keys())
+
+
+def tokenize(text: str) -> List[str]:
+    return re.findall(r"\w+", str(text).lower())
+
+
+def create_search_backend() -> SearchBackend:
+    if search_settings.elasticsearch_url:
+        return ElasticsearchBackend(
+            search_settings.elasticsearch_url,
+            index_prefix=search_settings.index_prefix,
+            chunk_size=search_settings.bulk_chunk_size,
+            request_timeout=search_settings.request_timeout,
+        )
+    return InMemorySearchBackend()
+
+
+search_backend = create_search_backend()
@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Tuple
+
+from src.backoffice.core.services.metrics import MetricsRegistry, metrics
+
+# Longest lifetime of a SigV4 presigned URL
+MAX_EXPIRES_IN = 7 * 24 * 3600
+
+
+class SignedUrlCache:
+    """
+    Presigned URLs reused across requests.
+
+    A URL for `expires_in` seconds is signed for a quarter longer and handed
+    out again until less than `expires_in` is left, so callers always get at
+    least the validity they asked for while one signature serves the whole
+    refresh window.
+    """
+
+    def __init__(
+        self,
+        sign: Callable[[str, int], str],
+        max_entries: int = 10000,
+        refresh_fraction: float = 0.25,
+        registry: MetricsRegistry = metrics,
+        clock: Callable[[], float] = time.time,
+        metric_prefix: str = "s3_url_cache",
+    ):
+        self.sign = sign
+        self.max_entries = max_entries
+        self.refresh_fraction = refresh_fraction
+        self.registry = registry
+        self.clock = clock
+        self.metric_prefix = metric_prefix
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[str, float]]" = OrderedDict()
+        registry.gauge(f"{metric_prefix}_hit_rate", self.hit_rate)
+        registry.gauge(f"{metric_prefix}_size", lambda: len(self._entries))
+
+    def get(self, file_path: str, expires_in: int) -> str:
+        return self.get_many([file_path], expires_in)[file_path]
+
+    def get_many(self, file_paths: Iterable[str], expires_in: int) -> Dict[str, str]:
+        now = self.clock()
+        urls: Dict[str, str] = {}
+        hits = 0
+        for file_path in file_paths:
+            if file_path in urls:
+                continue
+            key = (file_path, expires_in)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] - now >= expires_in:
+                self._entries.move_to_end(key)
+                urls[file_path] = entry[0]
+                hits += 1
+                continue
+
+            signed_for = min(
+                int(expires_in * (1 + self.refresh_fraction)), MAX_EXPIRES_IN
+            )
+            url = self.sign(file_path, signed_for)
+            self._entries[key] = (url, now + signed_for)
+            self._entries.move_to_end(key)
+            urls[file_path] = url
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        self.registry.increment(f"{self.metric_prefix}_hits", hits)
+        self.registry.increment(f"{self.metric_prefix}_misses", len(urls) - hits)
+        return urls
+
+    def hit_rate(self) -> float:
+        hits = self.registry.get(f"{self.metric_prefix}_hits")
+        total = hits + self.registry.get(f"{self.metric_prefix}_misses")
+        return round(hits / total, 4) if total else 0.0
+
+    def clear(self) -> None:
+        self._entries.clear()
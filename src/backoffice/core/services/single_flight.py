@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+from src.backoffice.core.services.metrics import MetricsRegistry, metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Concurrent calls for the same key share one execution: callers arriving
+    while it runs wait for its result (or exception) instead of starting
+    their own. A caller giving up does not cancel it for the others.
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry = metrics, metric_prefix: str = "single_flight"
+    ):
+        self.registry = registry
+        self.metric_prefix = metric_prefix
+        self._calls: Dict[Hashable, "asyncio.Future[T]"] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+            self.registry.increment(f"{self.metric_prefix}_calls")
+        else:
+            self.registry.increment(f"{self.metric_prefix}_shared")
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: "asyncio.Future[T]") -> None:
+        self._calls.pop(key, None)
+        if not future.cancelled():
+            # Retrieved here in case every caller gave up waiting
+            future.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import Optional
+
+# Uploads are read, hashed and spooled this many bytes at a time
+READ_CHUNK_SIZE = 1024 * 1024
+# Smallest part S3 accepts in a multipart upload, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+MAGIC_NUMBERS = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+)
+
+
+@dataclass
+class ReceivedUpload:
+    """An upload read to a local file, not yet stored"""
+
+    original_filename: str
+    extension: str
+    path: str
+    file_size: int
+    # SHA-256 of the contents, hex
+    content_hash: str
+    mime_type: str
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Content type from the first bytes of a file, None when not recognised"""
+    for magic, mime_type in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return mime_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    text = head.lstrip().lower()
+    if text.startswith((b"<?xml", b"<svg")) and b"<svg" in text:
+        return "image/svg+xml"
+    return None
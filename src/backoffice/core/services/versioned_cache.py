@@ -0,0 +1,35 @@
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class VersionedCache(Generic[T]):
+    """
+    Per-process cache holding one value per key, valid while the version the
+    caller reads from the database still matches the version it was stored
+    with. Least recently used keys are evicted past `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, T]]" = OrderedDict()
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[T]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, version: Hashable, value: T) -> None:
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -5,7 +5,8 @@ from src.backoffice.apps.location.models import (Address, City, Country,
                                                  GeocodingResult, Region,
                                                  Street)
 from src.backoffice.apps.menu.models import (Category, CompanyBranchMenu,
-                                             MenuImage, MenuItem)
+                                             MenuImage, MenuItem,
+                                             MenuItemTombstone)
 from src.backoffice.apps.qr_manager.models import QRCode
 from src.backoffice.apps.site.models import Site
 from src.backoffice.apps.site_configuration.models import SiteConfiguration
@@ -35,6 +36,7 @@ __all__ = (
     "CompanyBranchMenu",
     "MenuImage",
     "MenuItem",
+    "MenuItemTombstone",
     # Site
     "Site",
     # Site Configuration
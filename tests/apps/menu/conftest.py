@@ -0,0 +1,8 @@
+from tests.fixtures.auth import test_user  # noqa: F401
+from tests.fixtures.companies import company_with_member, test_company  # noqa: F401
+from tests.fixtures.menu import (  # noqa: F401
+    branch_menu_service,
+    menu_item_service,
+    menu_sync_service,
+    test_category,
+)
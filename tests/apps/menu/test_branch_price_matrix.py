@@ -0,0 +1,156 @@
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.schemas import PriceMatrixCell
+from tests.fixtures.factories import (
+    CompanyBranchFactory,
+    CompanyBranchMenuFactory,
+    CompanyFactory,
+    MenuItemFactory,
+)
+from tests.utils.auth import create_basic_auth_header
+
+
+@pytest.mark.asyncio
+async def test_set_prices_upserts_and_reports_invalid_cells(
+    branch_menu_service, test_session: AsyncSession, test_company, test_category
+):
+    branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=test_company.id
+    )
+    soup = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Soup",
+    )
+    salad = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Salad",
+    )
+    await CompanyBranchMenuFactory.create(
+        session=test_session,
+        company_branch_id=branch.id,
+        menu_item_id=soup.id,
+        price=Decimal("100.00"),
+    )
+
+    applied, errors = await branch_menu_service.set_prices(
+        company_id=test_company.id,
+        company_branch_ids={branch.id},
+        cells=[
+            PriceMatrixCell(
+                company_branch_id=branch.id, menu_item_id=soup.id, price=Decimal("1")
+            ),
+            PriceMatrixCell(
+                company_branch_id=branch.id, menu_item_id=soup.id, price=Decimal("120")
+            ),
+            PriceMatrixCell(
+                company_branch_id=branch.id, menu_item_id=salad.id, price=Decimal("80")
+            ),
+            PriceMatrixCell(
+                company_branch_id=branch.id, menu_item_id=salad.id, price=Decimal("-1")
+            ),
+            PriceMatrixCell(
+                company_branch_id=branch.id,
+                menu_item_id=salad.id,
+                price=Decimal("1.005"),
+            ),
+            PriceMatrixCell(
+                company_branch_id=branch.id + 1000,
+                menu_item_id=salad.id,
+                price=Decimal("80"),
+            ),
+        ],
+    )
+    await test_session.commit()
+
+    assert len(applied) == 2
+    assert [error.index for error in errors] == [3, 4, 5]
+
+    rows = await branch_menu_service.get_price_matrix(test_company.id, [branch.id])
+    assert {row.slug: row.prices for row in rows} == {
+        soup.slug: {branch.id: Decimal("120.00")},
+        salad.slug: {branch.id: Decimal("80.00")},
+    }
+
+
+@pytest.mark.asyncio
+async def test_price_matrix_endpoints(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    other_company = await CompanyFactory.create(
+        session=test_session, name="Other", subdomain="other"
+    )
+    first = await CompanyBranchFactory.create(
+        session=test_session, company_id=company.id, name="First"
+    )
+    second = await CompanyBranchFactory.create(
+        session=test_session, company_id=company.id, name="Second"
+    )
+    foreign = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=other_company.id,
+        name="Soup",
+    )
+    soup = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Soup",
+    )
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+
+    response = await client.put(
+        "/api/v1/menu/price-matrix",
+        json={
+            "company_subdomain": company.subdomain,
+            "cells": [
+                {
+                    "company_branch_id": first.id,
+                    "menu_item_id": soup.id,
+                    "price": "150.50",
+                },
+                {
+                    "company_branch_id": first.id,
+                    "menu_item_id": foreign.id,
+                    "price": "10",
+                },
+            ],
+        },
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["applied"] == 1
+    assert [error["menu_item_id"] for error in data["errors"]] == [foreign.id]
+
+    response = await client.get(
+        "/api/v1/menu/price-matrix",
+        params={"company_subdomain": company.subdomain},
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 200
+    matrix = response.json()
+    assert [branch["id"] for branch in matrix["branches"]] == [first.id, second.id]
+    assert matrix["rows"] == [
+        {
+            "menu_item_id": soup.id,
+            "slug": soup.slug,
+            "name": "Soup",
+            "prices": {str(first.id): "150.50"},
+        }
+    ]
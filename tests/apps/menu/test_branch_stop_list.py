@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.events import MenuEventType, branch_channel
+from src.backoffice.apps.menu.schemas import StopListToggle
+from src.backoffice.core.services.event_bus import event_bus
+from tests.fixtures.factories import (
+    CompanyBranchFactory,
+    CompanyBranchMenuFactory,
+    MenuItemFactory,
+)
+from tests.utils.auth import create_basic_auth_header
+
+
+async def _create_branch_menu(session, company, category, names):
+    branch = await CompanyBranchFactory.create(session=session, company_id=company.id)
+    items = []
+    for name in names:
+        item = await MenuItemFactory.create(
+            session=session,
+            category_id=category.id,
+            owner_company_id=company.id,
+            name=name,
+        )
+        await CompanyBranchMenuFactory.create(
+            session=session, company_branch_id=branch.id, menu_item_id=item.id
+        )
+        items.append(item)
+    return branch, items
+
+
+def test_coalesce_toggles_keeps_latest_per_item(branch_menu_service):
+    base = datetime.now(timezone.utc) - timedelta(minutes=5)
+
+    changes = branch_menu_service.coalesce_toggles(
+        [
+            StopListToggle(menu_item_id=1, available=False, changed_at=base),
+            StopListToggle(
+                menu_item_id=1, available=True, changed_at=base + timedelta(seconds=1)
+            ),
+            StopListToggle(
+                menu_item_id=2, available=False, changed_at=base + timedelta(seconds=2)
+            ),
+            StopListToggle(menu_item_id=2, available=True, changed_at=base),
+            StopListToggle(
+                menu_item_id=3,
+                available=False,
+                changed_at=datetime.now(timezone.utc) + timedelta(days=1),
+            ),
+        ]
+    )
+
+    assert {key: value[0] for key, value in changes.items()} == {
+        1: True,
+        2: False,
+        3: False,
+    }
+    assert changes[3][1] <= datetime.now(timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_stale_toggle_does_not_override_newer_one(
+    branch_menu_service, test_session: AsyncSession, test_company, test_category
+):
+    branch, (soup, salad) = await _create_branch_menu(
+        test_session, test_company, test_category, ["Soup", "Salad"]
+    )
+    now = datetime.now(timezone.utc)
+
+    await branch_menu_service.apply_stop_list(
+        branch.id,
+        [StopListToggle(menu_item_id=soup.id, available=False, changed_at=now)],
+    )
+    # Delayed batch from another device, made before the toggle above
+    states = await branch_menu_service.apply_stop_list(
+        branch.id,
+        [
+            StopListToggle(
+                menu_item_id=soup.id,
+                available=True,
+                changed_at=now - timedelta(seconds=30),
+            ),
+            StopListToggle(
+                menu_item_id=salad.id,
+                available=False,
+                changed_at=now - timedelta(seconds=30),
+            ),
+        ],
+    )
+    await test_session.commit()
+
+    assert {state.menu_item_id: state.available for state in states} == {
+        soup.id: False,
+        salad.id: False,
+    }
+    stop_list = await branch_menu_service.get_stop_list(branch.id)
+    assert [state.menu_item_id for state in stop_list] == [soup.id, salad.id]
+
+
+@pytest.mark.asyncio
+async def test_update_stop_list_publishes_single_event(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    branch, (soup, salad) = await _create_branch_menu(
+        test_session, company, test_category, ["Soup", "Salad"]
+    )
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+    subscription = await event_bus.subscribe([branch_channel(branch.id)])
+
+    try:
+        response = await client.patch(
+            f"/api/v1/menu/branches/{branch.id}/stop-list",
+            json={
+                "toggles": [
+                    {"menu_item_id": soup.id, "available": False},
+                    {"menu_item_id": salad.id, "available": False},
+                    {"menu_item_id": salad.id, "available": True},
+                    {"menu_item_id": 999999, "available": False},
+                ]
+            },
+            headers={"Authorization": auth_header},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert {item["menu_item_id"]: item["available"] for item in data["items"]} == {
+            soup.id: False,
+            salad.id: True,
+        }
+        assert data["missing_menu_item_ids"] == [999999]
+
+        event = await subscription.get(timeout=1)
+        assert event.type == MenuEventType.STOP_LIST_UPDATED.value
+        assert len(event.data["items"]) == 2
+        assert subscription.queue.empty()
+    finally:
+        subscription.close()
+
+    response = await client.get(
+        f"/api/v1/menu/branches/{branch.id}/stop-list",
+        headers={"Authorization": auth_header},
+    )
+    assert response.status_code == 200
+    assert [item["menu_item_id"] for item in response.json()["items"]] == [soup.id]
@@ -0,0 +1,117 @@
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.services import MenuAnalyticsService
+from src.backoffice.apps.menu.services.menu_analytics_service import (
+    menu_analytics_cache,
+)
+from src.backoffice.core.services.versioned_cache import VersionedCache
+from tests.fixtures.factories import (
+    CategoryFactory,
+    CompanyBranchFactory,
+    MenuItemFactory,
+)
+from tests.utils.auth import create_basic_auth_header
+
+
+async def create_menu(session: AsyncSession, company_id: int, category_id: int):
+    drinks = await CategoryFactory.create(session=session, name="Drinks", slug="drinks")
+    dishes = [
+        ("Soup", category_id, 300, 150),
+        ("Stew", category_id, 250, 300),
+        ("Pilaf", category_id, 200, 260),
+        ("Lard", category_id, 100, 900),
+        ("Tea", drinks.id, 200, None),
+    ]
+    return [
+        await MenuItemFactory.create(
+            session=session,
+            category_id=category,
+            owner_company_id=company_id,
+            name=name,
+            grams=grams,
+            kilocalories=kilocalories,
+        )
+        for name, category, grams, kilocalories in dishes
+    ]
+
+
+@pytest.mark.asyncio
+async def test_analytics_aggregates_and_outliers(
+    test_session: AsyncSession, company_with_member, test_category
+):
+    company, _ = company_with_member
+    await create_menu(test_session, company.id, test_category.id)
+
+    service = MenuAnalyticsService(test_session, cache=VersionedCache())
+    analytics = await service.get_analytics(company.id)
+
+    assert analytics.item_count == 5
+    kilocalories = analytics.distributions["kilocalories"]
+    assert (kilocalories.count, kilocalories.missing) == (4, 1)
+    assert (kilocalories.min, kilocalories.max, kilocalories.median) == (150, 900, 280)
+    assert analytics.per_100g["kilocalories"].min == 50
+    assert [(c.category_slug, c.item_count) for c in analytics.categories] == [
+        ("hot-dishes", 4),
+        ("drinks", 1),
+    ]
+    assert analytics.categories[0].mean["grams"] == 212.5
+    assert analytics.categories[1].mean["kilocalories"] is None
+    assert [(o.name, o.metric) for o in analytics.outliers] == [
+        ("Lard", "kilocalories")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_analytics_cached_until_menu_changes(
+    test_session: AsyncSession, company_with_member, test_category
+):
+    company, _ = company_with_member
+    soup, *_ = await create_menu(test_session, company.id, test_category.id)
+    branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=company.id
+    )
+    service = MenuAnalyticsService(test_session, cache=VersionedCache())
+
+    first = await service.get_analytics(company.id)
+    assert await service.get_analytics(company.id) is first
+    branch_analytics = await service.get_analytics(company.id, branch.id)
+    assert branch_analytics.item_count == 0
+
+    soup.kilocalories = 120
+    await test_session.commit()
+
+    second = await service.get_analytics(company.id)
+    assert second is not first
+    assert second.version != first.version
+    assert second.distributions["kilocalories"].min == 120
+
+
+@pytest.mark.asyncio
+async def test_get_menu_analytics_router(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    await create_menu(test_session, company.id, test_category.id)
+    menu_analytics_cache.clear()
+
+    response = await client.get(
+        "/api/v1/menu/analytics",
+        params={"company_subdomain": company.subdomain},
+        headers={
+            "Authorization": create_basic_auth_header(
+                test_user.email, "test_password_123"
+            )
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["item_count"] == 5
+    assert data["distributions"]["grams"]["max"] == 300
+    assert data["outliers"][0]["name"] == "Lard"
@@ -0,0 +1,80 @@
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.application import MenuApplication
+from src.backoffice.apps.menu.schemas import MenuItemCreate
+from src.backoffice.core.exceptions import ForbiddenError
+from tests.fixtures.factories import CompanyBranchFactory, CompanyFactory
+from tests.utils.auth import create_basic_auth_header
+
+
+@pytest.mark.asyncio
+async def test_branch_stream_receives_company_menu_changes(
+    test_session: AsyncSession, test_user, company_with_member, test_category
+):
+    company, _ = company_with_member
+    branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=company.id
+    )
+    application = MenuApplication(test_session)
+
+    stream = await application.stream_branch_events(branch.id, test_user.id)
+    assert await stream.__anext__() == "retry: 3000\n\n"
+
+    menu_item = await application.create_menu_item(
+        MenuItemCreate(
+            name="Soup",
+            description="Hot soup",
+            grams=300,
+            category_slug=test_category.slug,
+            company_subdomain=company.subdomain,
+        ),
+        test_user.id,
+    )
+
+    chunk = await stream.__anext__()
+    assert "event: menu_item.created" in chunk
+    assert f'"slug": "{menu_item.slug}"' in chunk
+
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_branch_stream_requires_membership(test_session: AsyncSession, test_user):
+    company = await CompanyFactory.create(
+        session=test_session, name="Other", subdomain="other"
+    )
+    branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=company.id
+    )
+
+    with pytest.raises(ForbiddenError):
+        await MenuApplication(test_session).stream_branch_events(
+            branch.id, test_user.id
+        )
+
+
+@pytest.mark.asyncio
+async def test_branch_stream_endpoint_checks_access_before_streaming(
+    client: httpx.AsyncClient, test_session: AsyncSession, test_user
+):
+    company = await CompanyFactory.create(
+        session=test_session, name="Other", subdomain="other"
+    )
+    branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=company.id
+    )
+
+    response = await client.get(
+        f"/api/v1/menu/branches/{branch.id}/events",
+        headers={
+            "Authorization": create_basic_auth_header(
+                test_user.email, "test_password_123"
+            )
+        },
+    )
+    assert response.status_code == 403
+
+    response = await client.get(f"/api/v1/menu/branches/{branch.id}/events")
+    assert response.status_code == 401
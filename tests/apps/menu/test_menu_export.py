@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.fixtures.factories import MenuImageFactory, MenuItemFactory
+from tests.utils.auth import create_basic_auth_header
+
+
+@pytest.mark.asyncio
+async def test_export_menu_csv_and_ndjson(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    soup = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Soup",
+        kilocalories=120,
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Salad",
+    )
+    await MenuImageFactory.create(
+        session=test_session,
+        menu_item_id=soup.id,
+        file_path="menu-images/soup.jpg",
+        is_primary=True,
+    )
+    await MenuImageFactory.create(
+        session=test_session, menu_item_id=soup.id, file_path="menu-images/side.jpg"
+    )
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+
+    response = await client.get(
+        "/api/v1/menu/export",
+        params={"company_subdomain": company.subdomain},
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["name"], row["image_file_path"]) for row in rows] == [
+        ("Soup", "menu-images/soup.jpg"),
+        ("Salad", ""),
+    ]
+    assert rows[0]["category_slug"] == test_category.slug
+
+    response = await client.get(
+        "/api/v1/menu/export",
+        params={"company_subdomain": company.subdomain, "format": "ndjson"},
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 200
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["slug"] for item in items] == [soup.slug, f"salad-{company.id}"]
+    assert items[0]["kilocalories"] == 120
@@ -0,0 +1,116 @@
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.services import MenuFacet, MenuFacetService
+from src.backoffice.core.services.versioned_cache import VersionedCache
+from tests.fixtures.factories import CategoryFactory, MenuImageFactory, MenuItemFactory
+from tests.utils.auth import create_basic_auth_header
+
+
+async def create_menu(session: AsyncSession, company_id: int, category_id: int):
+    drinks = await CategoryFactory.create(session=session, name="Drinks", slug="drinks")
+    dishes = [
+        ("Soup", category_id, 150),
+        ("Stew", category_id, 450),
+        ("Pilaf", category_id, 480),
+        ("Tea", drinks.id, None),
+    ]
+    items = [
+        await MenuItemFactory.create(
+            session=session,
+            category_id=category,
+            owner_company_id=company_id,
+            name=name,
+            kilocalories=kilocalories,
+        )
+        for name, category, kilocalories in dishes
+    ]
+    await MenuImageFactory.create(session=session, menu_item_id=items[1].id)
+    return items
+
+
+def counts(result, facet: str):
+    return {row.value: row.count for row in result.facets[facet]}
+
+
+@pytest.mark.asyncio
+async def test_facets_ignore_their_own_filter(
+    test_session: AsyncSession, company_with_member, test_category
+):
+    company, _ = company_with_member
+    await create_menu(test_session, company.id, test_category.id)
+    service = MenuFacetService(test_session, cache=VersionedCache())
+
+    result = await service.get_facets(company.id)
+    assert result.total == 4
+    assert counts(result, "category") == {"hot-dishes": 3, "drinks": 1}
+    assert result.facets["category"][0].label == "Hot dishes"
+    assert counts(result, "calories") == {"0-199": 1, "400-599": 2, "unknown": 1}
+    assert counts(result, "has_image") == {True: 1, False: 3}
+
+    result = await service.get_facets(
+        company.id, category_slug="hot-dishes", calories="400-599"
+    )
+    assert result.total == 2
+    assert counts(result, "category") == {"hot-dishes": 2}
+    assert counts(result, "calories") == {"0-199": 1, "400-599": 2}
+    assert counts(result, "has_image") == {True: 1, False: 1}
+
+    result = await service.get_facets(company.id, facets=[MenuFacet.HAS_IMAGE])
+    assert list(result.facets) == ["has_image"]
+    assert result.total == 4
+
+
+@pytest.mark.asyncio
+async def test_facets_cached_until_images_change(
+    test_session: AsyncSession, company_with_member, test_category
+):
+    company, _ = company_with_member
+    soup, *_ = await create_menu(test_session, company.id, test_category.id)
+    service = MenuFacetService(test_session, cache=VersionedCache())
+
+    first = await service.get_facets(company.id)
+    assert await service.get_facets(company.id) is first
+
+    await MenuImageFactory.create(session=test_session, menu_item_id=soup.id)
+
+    second = await service.get_facets(company.id)
+    assert second is not first
+    assert counts(second, "has_image") == {True: 2, False: 2}
+
+
+@pytest.mark.asyncio
+async def test_get_menu_facets_router(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    await create_menu(test_session, company.id, test_category.id)
+    headers = {
+        "Authorization": create_basic_auth_header(test_user.email, "test_password_123")
+    }
+
+    response = await client.get(
+        "/api/v1/menu/facets",
+        params={"company_subdomain": company.subdomain, "facet": "calories"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 4
+    assert data["facets"]["calories"][0] == {
+        "value": "400-599",
+        "label": None,
+        "count": 2,
+    }
+
+    response = await client.get(
+        "/api/v1/menu/facets",
+        params={"company_subdomain": company.subdomain, "calories": "lots"},
+        headers=headers,
+    )
+    assert response.status_code == 400
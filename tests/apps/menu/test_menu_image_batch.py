@@ -0,0 +1,117 @@
+from typing import List
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.core.config import s3_settings
+from src.backoffice.core.services.s3_client import s3_client
+from tests.fixtures.factories import MenuImageFactory, MenuItemFactory
+from tests.utils.auth import create_basic_auth_header
+from tests.utils.images import make_image
+from tests.utils.s3 import FakeBucket
+
+
+@pytest.fixture
+def bucket(monkeypatch) -> FakeBucket:
+    fake = FakeBucket()
+    monkeypatch.setattr(s3_client, "s3_client", fake)
+    s3_client.url_cache.clear()
+    return fake
+
+
+@pytest.fixture
+def image_inserts(test_session: AsyncSession) -> List[str]:
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO menu_images"):
+            statements.append(statement)
+
+    engine = test_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_inserts_all_images_at_once(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+    bucket,
+    image_inserts,
+):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session, category_id=test_category.id, owner_company_id=company.id
+    )
+    old_primary = await MenuImageFactory.create(
+        session=test_session, menu_item_id=menu_item.id, is_primary=True
+    )
+    soup, salad = make_image(800, 400), make_image(400, 800)
+    image_inserts.clear()
+
+    response = await client.post(
+        f"/api/v1/menu/{menu_item.slug}/images/batch",
+        files=[
+            ("files", ("soup.png", soup, "image/png")),
+            ("files", ("salad.png", salad, "image/png")),
+            ("files", ("soup-again.png", soup, "image/png")),
+        ],
+        data={
+            "alt_texts": ["Soup", "Salad", "Soup again"],
+            "primary_index": "1",
+            "display_order": "1",
+        },
+        headers={
+            "Authorization": create_basic_auth_header(
+                test_user.email, "test_password_123"
+            )
+        },
+    )
+
+    assert response.status_code == 200
+    images = response.json()["images"]
+    assert [image["display_order"] for image in images] == [0, 1, 2, 3]
+    assert [image["is_primary"] for image in images] == [False, False, True, False]
+    assert images[1]["url"] == images[3]["url"]
+    await test_session.refresh(old_primary)
+    assert old_primary.is_primary is False
+    # Two distinct contents: two originals with six thumbnails each
+    assert len(bucket.objects) == 14
+    assert len(image_inserts) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_limits_file_count(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+    bucket,
+    monkeypatch,
+):
+    monkeypatch.setattr(s3_settings, "batch_upload_max_files", 1)
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session, category_id=test_category.id, owner_company_id=company.id
+    )
+    content = make_image(200, 200)
+
+    response = await client.post(
+        f"/api/v1/menu/{menu_item.slug}/images/batch",
+        files=[("files", (f"{index}.png", content, "image/png")) for index in range(2)],
+        headers={
+            "Authorization": create_basic_auth_header(
+                test_user.email, "test_password_123"
+            )
+        },
+    )
+
+    assert response.status_code == 400
+    assert bucket.objects == {}
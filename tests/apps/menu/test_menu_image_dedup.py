@@ -0,0 +1,173 @@
+import hashlib
+import io
+from typing import List, Tuple
+
+import pytest
+import pytest_asyncio
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers
+
+from src.backoffice.apps.menu.repositories import MenuImageRepository
+from src.backoffice.apps.menu.services import MenuImageService
+from src.backoffice.core.services.s3_client import s3_client
+from tests.fixtures.factories import MenuItemFactory
+from tests.utils.images import make_image
+
+
+class RecordingS3:
+    def __init__(self):
+        self.calls: List[Tuple[str, str]] = []
+
+    def __getattr__(self, operation):
+        def call(**kwargs):
+            self.calls.append((operation, kwargs["Key"]))
+            return {}
+
+        return call
+
+    def keys(self, operation: str) -> List[str]:
+        return [key for called, key in self.calls if called == operation]
+
+
+@pytest.fixture
+def recording_s3(monkeypatch) -> RecordingS3:
+    recording = RecordingS3()
+
+    async def get_urls(file_paths, expiry_hours=24):
+        return {path: f"https://cdn/{path}" for path in file_paths}
+
+    monkeypatch.setattr(s3_client, "s3_client", recording)
+    monkeypatch.setattr(s3_client, "get_urls", get_urls)
+    return recording
+
+
+def upload(content: bytes, filename: str) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        size=len(content),
+        filename=filename,
+        headers=Headers({"content-type": "image/png"}),
+    )
+
+
+@pytest_asyncio.fixture
+async def menu_items(test_session: AsyncSession, company_with_member, test_category):
+    company, _ = company_with_member
+    return [
+        await MenuItemFactory.create(
+            session=test_session,
+            category_id=test_category.id,
+            owner_company_id=company.id,
+            name=name,
+        )
+        for name in ("Soup", "Salad")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_same_contents_reuse_stored_files(
+    test_session: AsyncSession, recording_s3, menu_items
+):
+    content = make_image(800, 400)
+    service = MenuImageService(test_session)
+
+    first = await service.upload_image(menu_items[0].id, upload(content, "soup.png"))
+    puts = len(recording_s3.keys("put_object"))
+    second = await service.upload_image(menu_items[1].id, upload(content, "copy.png"))
+
+    assert len(recording_s3.keys("put_object")) == puts
+    assert first.content_hash == hashlib.sha256(content).hexdigest()
+    assert second.content_hash == first.content_hash
+    assert second.file_path == first.file_path
+    assert second.variants == first.variants
+    assert (second.width, second.height) == (800, 400)
+    assert second.original_filename == "copy.png"
+
+
+@pytest.mark.asyncio
+async def test_files_deleted_with_the_last_image_using_them(
+    test_session: AsyncSession, recording_s3, menu_items
+):
+    content = make_image(800, 400)
+    service = MenuImageService(test_session)
+    first = await service.upload_image(menu_items[0].id, upload(content, "soup.png"))
+    second = await service.upload_image(menu_items[1].id, upload(content, "soup.png"))
+
+    assert await service.delete_image(first.id) is True
+    assert recording_s3.keys("delete_object") == []
+
+    assert await service.delete_image(second.id) is True
+    assert sorted(recording_s3.keys("delete_object")) == sorted(
+        recording_s3.keys("put_object")
+    )
+
+
+@pytest.mark.asyncio
+async def test_different_contents_stored_separately(
+    test_session: AsyncSession, recording_s3, menu_items
+):
+    service = MenuImageService(test_session)
+
+    first = await service.upload_image(
+        menu_items[0].id, upload(make_image(800, 400), "soup.png")
+    )
+    second = await service.upload_image(
+        menu_items[1].id, upload(make_image(400, 800), "soup.png")
+    )
+
+    assert second.file_path != first.file_path
+    assert second.content_hash != first.content_hash
+
+
+def run_while_locking(monkeypatch, meanwhile):
+    """The next `lock_contents` waits for `meanwhile`, a concurrent commit"""
+    lock_contents = MenuImageRepository.lock_contents
+
+    async def wait_for_concurrent(repository, content_hashes):
+        monkeypatch.setattr(MenuImageRepository, "lock_contents", lock_contents)
+        await meanwhile()
+        await lock_contents(repository, content_hashes)
+
+    monkeypatch.setattr(MenuImageRepository, "lock_contents", wait_for_concurrent)
+
+
+@pytest.mark.asyncio
+async def test_delete_waiting_for_a_reuse_keeps_the_files(
+    test_session: AsyncSession, recording_s3, menu_items, monkeypatch
+):
+    content = make_image(800, 400)
+    service = MenuImageService(test_session)
+    first = await service.upload_image(menu_items[0].id, upload(content, "soup.png"))
+    reused = []
+
+    async def reuse():
+        reused.append(
+            await service.upload_image(menu_items[1].id, upload(content, "copy.png"))
+        )
+
+    run_while_locking(monkeypatch, reuse)
+    assert await service.delete_image(first.id) is True
+
+    assert reused[0].file_path == first.file_path
+    assert recording_s3.keys("delete_object") == []
+
+
+@pytest.mark.asyncio
+async def test_upload_waiting_for_a_delete_stores_the_files_again(
+    test_session: AsyncSession, recording_s3, menu_items, monkeypatch
+):
+    content = make_image(800, 400)
+    service = MenuImageService(test_session)
+    first = await service.upload_image(menu_items[0].id, upload(content, "soup.png"))
+    stored = recording_s3.keys("put_object")
+
+    async def delete():
+        assert await service.delete_image(first.id) is True
+
+    run_while_locking(monkeypatch, delete)
+    second = await service.upload_image(menu_items[1].id, upload(content, "copy.png"))
+
+    assert second.file_path == first.file_path
+    assert sorted(recording_s3.keys("delete_object")) == sorted(stored)
+    assert sorted(recording_s3.keys("put_object")) == sorted(stored + stored)
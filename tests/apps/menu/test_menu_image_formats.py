@@ -0,0 +1,53 @@
+import pytest
+
+from src.backoffice.apps.menu.models import MenuImage
+from src.backoffice.apps.menu.services import MenuImageService
+from src.backoffice.core.services.image_processing import preferred_mime_type
+from src.backoffice.core.services.s3_client import s3_client
+
+
+def test_preferred_mime_type_needs_explicit_image_types():
+    available = {"image/jpeg", "image/webp", "image/avif"}
+
+    assert preferred_mime_type("image/avif,image/webp,*/*", available) == "image/avif"
+    assert preferred_mime_type("image/avif;q=0, image/webp", available) == (
+        "image/webp"
+    )
+    assert preferred_mime_type("image/avif", {"image/jpeg"}) == "image/jpeg"
+    assert preferred_mime_type("*/*", available) == "image/jpeg"
+    assert preferred_mime_type(None, available) == "image/jpeg"
+
+
+@pytest.mark.asyncio
+async def test_image_urls_offer_a_source_per_format(monkeypatch):
+    async def get_urls(file_paths, expiry_hours=24):
+        return {path: f"https://cdn/{path}" for path in file_paths}
+
+    monkeypatch.setattr(s3_client, "get_urls", get_urls)
+    image = MenuImage(
+        file_path="menu-images/dish.png",
+        mime_type="image/png",
+        width=1200,
+        variants=[
+            {"size": "small", "width": 150, "file_path": "t/dish_small.png"},
+            {
+                "size": "small",
+                "width": 150,
+                "file_path": "t/dish_small.webp",
+                "mime_type": "image/webp",
+            },
+        ],
+    )
+
+    await MenuImageService.add_urls([image], accept="image/webp,image/*;q=0.8")
+
+    assert image.srcset == (
+        "https://cdn/t/dish_small.webp 150w, https://cdn/menu-images/dish.png 1200w"
+    )
+    assert [source["type"] for source in image.sources] == [
+        "image/webp",
+        "image/jpeg",
+    ]
+    assert image.sources[0]["srcset"] == "https://cdn/t/dish_small.webp 150w"
+    assert image.sources[1]["srcset"] == "https://cdn/t/dish_small.png 150w"
+    assert image.thumbnails[0]["mime_type"] == "image/jpeg"
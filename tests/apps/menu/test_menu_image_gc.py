@@ -0,0 +1,158 @@
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers
+
+from src.backoffice.apps.menu.services import (
+    MenuImageGCService,
+    MenuImageService,
+    menu_image_gc_service,
+)
+from src.backoffice.core.services.s3_client import s3_client
+from tests.fixtures.factories import MenuItemFactory
+from tests.utils.images import make_image
+from tests.utils.s3 import FakeBucket
+
+
+@pytest.fixture
+def bucket(monkeypatch) -> FakeBucket:
+    fake = FakeBucket()
+    monkeypatch.setattr(s3_client, "s3_client", fake)
+    s3_client.url_cache.clear()
+    return fake
+
+
+def upload(content: bytes) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        size=len(content),
+        filename="dish.png",
+        headers=Headers({"content-type": "image/png"}),
+    )
+
+
+def age(bucket: FakeBucket, hours: float) -> None:
+    for key in bucket.objects:
+        bucket.modified[key] = datetime.now(timezone.utc) - timedelta(hours=hours)
+
+
+@pytest_asyncio.fixture
+async def images(test_session: AsyncSession, company_with_member, test_category):
+    """A kept image and a deleted one, with their thumbnails"""
+    company, _ = company_with_member
+    service = MenuImageService(test_session)
+    images = []
+    for name, width in (("Soup", 800), ("Salad", 400)):
+        menu_item = await MenuItemFactory.create(
+            session=test_session,
+            category_id=test_category.id,
+            owner_company_id=company.id,
+            name=name,
+        )
+        images.append(
+            await service.upload_image(menu_item.id, upload(make_image(width, 300)))
+        )
+    await test_session.delete(images[1])
+    await test_session.flush()
+    return images
+
+
+def stored_files(bucket: FakeBucket, file_path: str):
+    stem = file_path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    return {key for key in bucket.objects if f"/{stem}" in key}
+
+
+@pytest.mark.asyncio
+async def test_orphans_deleted_in_batches(
+    test_session: AsyncSession, bucket, images, monkeypatch
+):
+    kept, deleted = images
+    bucket.put_object(Key="menu-images/thumbnails/legacy_small.jpg", Body=b"x" * 10)
+    bucket.put_object(Key="menu-images/imports/menu.csv", Body=b"name")
+    kept_files = stored_files(bucket, kept.file_path)
+    orphans = stored_files(bucket, deleted.file_path) | {
+        "menu-images/thumbnails/legacy_small.jpg"
+    }
+    orphan_bytes = sum(len(bucket.objects[key]) for key in orphans)
+    age(bucket, 48)
+    bucket.put_object(Key="menu-images/uploading.png", Body=b"x")
+
+    monkeypatch.setattr(menu_image_gc_service, "MAX_DELETE_KEYS", 3)
+    delete_calls = []
+    delete_objects = bucket.delete_objects
+    monkeypatch.setattr(
+        bucket,
+        "delete_objects",
+        lambda **kwargs: delete_calls.append(kwargs) or delete_objects(**kwargs),
+    )
+
+    report = await MenuImageGCService(test_session, page_size=2).collect()
+
+    assert report.scanned == len(kept_files) + len(orphans) + 2
+    assert report.skipped_recent == 1
+    assert report.skipped_unknown == 1
+    assert report.orphaned == report.deleted == len(orphans)
+    assert report.reclaimed_bytes == report.orphaned_bytes == orphan_bytes
+    assert report.failed == 0
+    assert all(len(call["Delete"]["Objects"]) <= 3 for call in delete_calls)
+    assert len(delete_calls) == -(-len(orphans) // 3)
+    assert set(bucket.objects) == kept_files | {
+        "menu-images/imports/menu.csv",
+        "menu-images/uploading.png",
+    }
+
+
+@pytest.mark.asyncio
+async def test_dry_run_deletes_nothing(test_session: AsyncSession, bucket, images):
+    orphans = stored_files(bucket, images[1].file_path)
+    age(bucket, 48)
+    stored = set(bucket.objects)
+
+    report = await MenuImageGCService(test_session, dry_run=True).collect()
+
+    assert report.dry_run is True
+    assert report.orphaned == len(orphans)
+    assert report.deleted == report.reclaimed_bytes == 0
+    assert set(bucket.objects) == stored
+
+
+@pytest.mark.asyncio
+async def test_objects_within_grace_period_kept(
+    test_session: AsyncSession, bucket, images
+):
+    stored = set(bucket.objects)
+
+    report = await MenuImageGCService(test_session).collect()
+
+    assert report.skipped_recent == len(stored)
+    assert report.orphaned == 0
+    assert set(bucket.objects) == stored
+
+
+@pytest.mark.asyncio
+async def test_objects_written_again_after_listing_kept(
+    test_session: AsyncSession, bucket, images, monkeypatch
+):
+    deleted = images[1]
+    orphans = stored_files(bucket, deleted.file_path)
+    age(bucket, 48)
+    list_objects_v2 = bucket.list_objects_v2
+
+    def list_then_upload(**kwargs):
+        response = list_objects_v2(**kwargs)
+        # Same contents uploaded again, its row not committed yet
+        bucket.put_object(Key=deleted.file_path, Body=b"again")
+        return response
+
+    monkeypatch.setattr(bucket, "list_objects_v2", list_then_upload)
+
+    report = await MenuImageGCService(test_session).collect()
+
+    assert report.orphaned == len(orphans)
+    assert report.skipped_recent == 1
+    assert report.deleted == len(orphans) - 1
+    assert bucket.objects[deleted.file_path] == b"again"
@@ -0,0 +1,235 @@
+import contextlib
+
+import httpx
+import pytest
+from botocore.exceptions import ClientError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu import application as menu_application
+from src.backoffice.apps.menu.events import company_channel
+from src.backoffice.apps.menu.services import MenuImageJob, MenuImageWorker
+from src.backoffice.core.config import s3_settings
+from src.backoffice.core.services.event_bus import EventBus
+from src.backoffice.core.services.kafka_client import InMemoryBroker
+from src.backoffice.core.services.s3_client import s3_client
+from tests.fixtures.factories import MenuItemFactory
+from tests.utils.auth import create_basic_auth_header
+from tests.utils.images import make_image
+from tests.utils.s3 import FakeBucket
+
+
+@pytest.fixture
+def bucket(monkeypatch) -> FakeBucket:
+    fake = FakeBucket()
+    monkeypatch.setattr(s3_client, "s3_client", fake)
+    s3_client.url_cache.clear()
+    return fake
+
+
+@pytest.fixture
+def broker(monkeypatch) -> InMemoryBroker:
+    fake = InMemoryBroker()
+    monkeypatch.setattr(menu_application, "message_broker", fake)
+    return fake
+
+
+async def upload_in_background(client, test_user, slug: str, content: bytes):
+    return await client.post(
+        f"/api/v1/menu/{slug}/images",
+        files={"file": ("dish.png", content, "image/png")},
+        data={
+            "alt_text": "Dish",
+            "is_primary": "true",
+            "display_order": "0",
+            "background": "true",
+        },
+        headers={
+            "Authorization": create_basic_auth_header(
+                test_user.email, "test_password_123"
+            )
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_background_upload_processed_by_worker(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+    bucket,
+    broker,
+):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session, category_id=test_category.id, owner_company_id=company.id
+    )
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+
+    response = await upload_in_background(
+        client, test_user, menu_item.slug, make_image(800, 400)
+    )
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "processing"
+    assert job["menu_item_slug"] == menu_item.slug
+    assert response.headers["location"].endswith(
+        f"/api/v1/menu/images/jobs/{job['job_id']}"
+    )
+    # Only the original so far
+    assert len(bucket.objects) == 1
+
+    bus = EventBus()
+    subscription = await bus.subscribe([company_channel(company.id)])
+    worker = MenuImageWorker(lambda: contextlib.nullcontext(test_session), broker, bus)
+    async with worker.run():
+        await broker.drain()
+
+    event = await subscription.get(timeout=1)
+    assert event.type == "menu_image.processed"
+    assert event.data["job_id"] == job["job_id"]
+    assert event.data["status"] == "ready"
+
+    response = await client.get(
+        f"/api/v1/menu/images/jobs/{job['job_id']}",
+        headers={"Authorization": auth_header},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+    response = await client.get(
+        f"/api/v1/menu/{menu_item.slug}", headers={"Authorization": auth_header}
+    )
+    image = response.json()["images"][0]
+    assert image["srcset"].count("w, ") == 3
+    assert len(bucket.objects) == 7
+
+
+@pytest.mark.asyncio
+async def test_job_for_missing_original_fails(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+    bucket,
+    broker,
+):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session, category_id=test_category.id, owner_company_id=company.id
+    )
+    job = (
+        await upload_in_background(
+            client, test_user, menu_item.slug, make_image(400, 400)
+        )
+    ).json()
+    bucket.objects.clear()
+
+    bus = EventBus()
+    subscription = await bus.subscribe([company_channel(company.id)])
+    worker = MenuImageWorker(lambda: contextlib.nullcontext(test_session), broker, bus)
+    async with worker.run():
+        await broker.drain()
+        # Delivered again: nothing left to do
+        await worker.handle(
+            MenuImageJob(job_id=job["job_id"], image_id=job["image_id"]).to_json()
+        )
+
+    event = await subscription.get(timeout=1)
+    assert event.data["status"] == "failed"
+    assert subscription.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_job_for_corrupt_upload_fails(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+    bucket,
+    broker,
+):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session, category_id=test_category.id, owner_company_id=company.id
+    )
+    job = (
+        await upload_in_background(
+            client, test_user, menu_item.slug, make_image(400, 400)[:100]
+        )
+    ).json()
+
+    bus = EventBus()
+    subscription = await bus.subscribe([company_channel(company.id)])
+    worker = MenuImageWorker(lambda: contextlib.nullcontext(test_session), broker, bus)
+    async with worker.run():
+        await broker.drain()
+
+    event = await subscription.get(timeout=1)
+    assert event.data["status"] == "failed"
+    # Only the original, no variants rendered from it
+    assert len(bucket.objects) == 1
+
+
+def outage() -> ClientError:
+    return ClientError(
+        {
+            "Error": {"Code": "ServiceUnavailable", "Message": "Slow down"},
+            "ResponseMetadata": {"HTTPStatusCode": 503},
+        },
+        "GetObject",
+    )
+
+
+@pytest.mark.parametrize("outages, status", [(2, "ready"), (3, "failed")])
+@pytest.mark.asyncio
+async def test_job_run_again_after_storage_outage(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+    bucket,
+    broker,
+    monkeypatch,
+    outages,
+    status,
+):
+    monkeypatch.setattr(s3_settings, "image_job_max_attempts", 3)
+    monkeypatch.setattr(s3_settings, "image_job_retry_backoff", 0)
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session, category_id=test_category.id, owner_company_id=company.id
+    )
+    job = (
+        await upload_in_background(
+            client, test_user, menu_item.slug, make_image(400, 400)
+        )
+    ).json()
+
+    downloads = []
+    download_file = s3_client.download_file
+
+    async def flaky_download(file_path, destination):
+        downloads.append(file_path)
+        if len(downloads) <= outages:
+            raise outage()
+        return await download_file(file_path, destination)
+
+    monkeypatch.setattr(s3_client, "download_file", flaky_download)
+
+    bus = EventBus()
+    subscription = await bus.subscribe([company_channel(company.id)])
+    worker = MenuImageWorker(lambda: contextlib.nullcontext(test_session), broker, bus)
+    async with worker.run():
+        await broker.drain()
+
+    event = await subscription.get(timeout=1)
+    assert event.data["job_id"] == job["job_id"]
+    assert event.data["status"] == status
+    assert len(downloads) == 3
+    assert subscription.queue.empty()
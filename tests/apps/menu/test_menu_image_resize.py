@@ -0,0 +1,106 @@
+import asyncio
+import io
+from typing import List
+
+import pytest
+import pytest_asyncio
+from PIL import Image
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.services import MenuImageResizeService
+from src.backoffice.core.services.disk_cache import DiskLRUCache
+from src.backoffice.core.services.metrics import MetricsRegistry
+from src.backoffice.core.services.s3_client import s3_client
+from src.backoffice.core.services.single_flight import SingleFlight
+from tests.fixtures.factories import MenuImageFactory, MenuItemFactory
+from tests.utils.images import make_image
+
+
+@pytest.fixture
+def fake_s3(monkeypatch) -> List[str]:
+    calls: List[str] = []
+
+    async def get_object(file_path):
+        calls.append(f"get {file_path}")
+        return None
+
+    async def download_file(file_path, destination):
+        calls.append(f"download {file_path}")
+        await asyncio.sleep(0.01)
+        with open(destination, "wb") as file:
+            file.write(make_image(1200, 800, "JPEG", "RGB"))
+        return True
+
+    async def store_object(file_path, content, content_type):
+        calls.append(f"store {file_path} {content_type}")
+        return True
+
+    monkeypatch.setattr(s3_client, "get_object", get_object)
+    monkeypatch.setattr(s3_client, "download_file", download_file)
+    monkeypatch.setattr(s3_client, "store_object", store_object)
+    return calls
+
+
+@pytest_asyncio.fixture
+async def menu_image(test_session: AsyncSession, company_with_member, test_category):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session, category_id=test_category.id, owner_company_id=company.id
+    )
+    return await MenuImageFactory.create(
+        session=test_session, menu_item_id=menu_item.id, filename="dish.jpg", width=1200
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_resize_then_hit_disk(
+    test_session: AsyncSession, fake_s3, menu_image, tmp_path
+):
+    registry = MetricsRegistry()
+    service = MenuImageResizeService(
+        test_session,
+        cache=DiskLRUCache(str(tmp_path), 10**6, registry=registry),
+        flights=SingleFlight(registry=registry),
+    )
+
+    results = await asyncio.gather(
+        *(service.get_resized(menu_image.id, 300, "webp") for _ in range(3))
+    )
+
+    assert fake_s3 == [
+        "get menu-images/thumbnails/dish_w300.webp",
+        "download menu-images/dish.jpg",
+        "store menu-images/thumbnails/dish_w300.webp image/webp",
+    ]
+    assert registry.get("single_flight_shared") == 2
+    assert Image.open(io.BytesIO(results[0].content)).size == (300, 200)
+
+    cached = await service.get_resized(menu_image.id, 300, "webp")
+    assert bytes(cached.content) == results[0].content
+    assert len(fake_s3) == 3
+    assert b"".join(cached.chunks(chunk_size=100)) == results[0].content
+    assert cached.content.closed
+
+
+@pytest.mark.asyncio
+async def test_resize_endpoint_whitelists_widths_and_negotiates_format(
+    client, fake_s3, menu_image, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(
+        "src.backoffice.apps.menu.services.menu_image_resize_service."
+        "resized_image_cache",
+        DiskLRUCache(str(tmp_path), 10**6, registry=MetricsRegistry()),
+    )
+
+    response = await client.get(f"/api/v1/menu/images/{menu_image.id}?width=301")
+    assert response.status_code == 400
+
+    response = await client.get(
+        f"/api/v1/menu/images/{menu_image.id}?width=150",
+        headers={"Accept": "image/webp,*/*"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["vary"] == "Accept"
+    assert "immutable" in response.headers["cache-control"]
+    assert Image.open(io.BytesIO(response.content)).size == (150, 100)
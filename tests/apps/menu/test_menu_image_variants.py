@@ -0,0 +1,121 @@
+import contextlib
+from typing import List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.services import MenuImageService
+from src.backoffice.core.services.s3_client import s3_client
+from src.backoffice.core.services.upload_stream import ReceivedUpload
+from tests.fixtures.factories import MenuImageFactory, MenuItemFactory
+
+
+@pytest.fixture
+def s3_calls(monkeypatch) -> List[str]:
+    deleted: List[str] = []
+
+    @contextlib.asynccontextmanager
+    async def receive_upload(file):
+        yield ReceivedUpload(
+            original_filename="dish.png",
+            extension=".png",
+            path="/tmp/dish.png",
+            file_size=90000,
+            content_hash="0" * 64,
+            mime_type="image/png",
+        )
+
+    async def store_upload(received, folder="menu-images", generate_thumbnails=True):
+        return {
+            "filename": "dish.png",
+            "original_filename": "dish.png",
+            "file_path": "menu-images/dish.png",
+            "file_size": 90000,
+            "mime_type": "image/png",
+            "width": 1200,
+            "height": 800,
+            "url": "http://s3/menu-images/dish.png",
+            "thumbnails": [
+                {
+                    "size": size,
+                    "width": width,
+                    "height": width * 2 // 3,
+                    "file_path": f"menu-images/thumbnails/dish_{size}.png",
+                    "file_size": width * 10,
+                    "mime_type": "image/jpeg",
+                    "url": f"http://s3/menu-images/thumbnails/dish_{size}.png",
+                }
+                for size, width in (("small", 150), ("medium", 300), ("large", 600))
+            ],
+        }
+
+    async def delete_file(file_path: str) -> bool:
+        deleted.append(file_path)
+        return True
+
+    async def get_urls(file_paths, expiry_hours=24):
+        return {path: f"https://cdn/{path}" for path in file_paths}
+
+    monkeypatch.setattr(s3_client, "receive_upload", receive_upload)
+    monkeypatch.setattr(s3_client, "store_upload", store_upload)
+    monkeypatch.setattr(s3_client, "delete_file", delete_file)
+    monkeypatch.setattr(s3_client, "get_urls", get_urls)
+    return deleted
+
+
+@pytest.mark.asyncio
+async def test_upload_persists_variants_and_builds_srcset(
+    test_session: AsyncSession, s3_calls, company_with_member, test_category
+):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session, category_id=test_category.id, owner_company_id=company.id
+    )
+    service = MenuImageService(test_session)
+
+    image = await service.upload_image(menu_item.id, file=None)
+
+    assert [variant["size"] for variant in image.variants] == [
+        "small",
+        "medium",
+        "large",
+    ]
+    assert "url" not in image.variants[0]
+    assert image.srcset == (
+        "https://cdn/menu-images/thumbnails/dish_small.png 150w, "
+        "https://cdn/menu-images/thumbnails/dish_medium.png 300w, "
+        "https://cdn/menu-images/thumbnails/dish_large.png 600w, "
+        "https://cdn/menu-images/dish.png 1200w"
+    )
+    assert image.thumbnails[0]["url"] == (
+        "https://cdn/menu-images/thumbnails/dish_small.png"
+    )
+
+    assert await service.delete_image(image.id) is True
+    assert s3_calls == [
+        "menu-images/dish.png",
+        "menu-images/thumbnails/dish_small.png",
+        "menu-images/thumbnails/dish_medium.png",
+        "menu-images/thumbnails/dish_large.png",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_delete_image_without_variants_removes_generated_thumbnails(
+    test_session: AsyncSession, s3_calls, company_with_member, test_category
+):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session, category_id=test_category.id, owner_company_id=company.id
+    )
+    image = await MenuImageFactory.create(
+        session=test_session, menu_item_id=menu_item.id, filename="old.jpg"
+    )
+
+    assert await MenuImageService(test_session).delete_image(image.id) is True
+    assert s3_calls == [
+        "menu-images/old.jpg",
+        "menu-images/thumbnails/old_small.jpg",
+        "menu-images/thumbnails/old_medium.jpg",
+        "menu-images/thumbnails/old_large.jpg",
+    ]
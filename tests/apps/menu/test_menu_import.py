@@ -0,0 +1,132 @@
+import io
+import json
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.models import MenuItem
+from src.backoffice.apps.menu.services import (
+    MenuImportFormat,
+    MenuImportService,
+    iter_import_rows,
+)
+from tests.utils.auth import create_basic_auth_header
+
+CSV_CONTENT = (
+    "name,description,category_slug,grams,kilocalories\n"
+    "Borscht,Beet soup,hot-dishes,300,\n"
+    "Pilaf,Rice with lamb,hot-dishes,0,650\n"
+    "Tea,Black tea,drinks,200,\n"
+    "Pelmeni,Dumplings,hot-dishes,250,540\n"
+)
+
+
+@pytest.mark.asyncio
+async def test_import_csv_in_batches(
+    test_session: AsyncSession, test_company, test_category
+):
+    service = MenuImportService(test_session)
+
+    report = await service.import_items(
+        company_id=test_company.id,
+        rows=iter_import_rows(io.BytesIO(CSV_CONTENT.encode()), MenuImportFormat.CSV),
+        batch_size=2,
+    )
+    await test_session.commit()
+
+    assert (report.total_rows, report.imported, report.error_count) == (4, 2, 2)
+    assert [error.row for error in report.errors] == [2, 3]
+    assert "grams" in report.errors[0].message
+    assert "drinks" in report.errors[1].message
+
+    items = (
+        (
+            await test_session.execute(
+                select(MenuItem).where(MenuItem.owner_company_id == test_company.id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert sorted(item.name for item in items) == ["Borscht", "Pelmeni"]
+    assert all(item.slug == f"{item.name.lower()}-{item.id}" for item in items)
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_endpoint_reports_bad_lines(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    lines = [
+        json.dumps(
+            {
+                "name": "Borscht",
+                "description": "Beet soup",
+                "category_slug": "hot-dishes",
+                "grams": 300,
+            }
+        ),
+        "{not json",
+        "",
+        json.dumps(["not", "an", "object"]),
+    ]
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+
+    response = await client.post(
+        "/api/v1/menu/import",
+        data={"company_subdomain": company.subdomain},
+        files={"file": ("menu.ndjson", "\n".join(lines).encode(), "text/plain")},
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 1
+    assert [error["row"] for error in data["errors"]] == [2, 4]
+
+    response = await client.post(
+        "/api/v1/menu/import",
+        data={"company_subdomain": company.subdomain},
+        files={"file": ("menu.xlsx", b"", "application/octet-stream")},
+        headers={"Authorization": auth_header},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_rows_failing_database_checks(
+    test_session: AsyncSession, test_company, test_category
+):
+    rows = [
+        {"name": "Water", "kilocalories": 0},
+        {"name": "Broth", "proteins": 0, "fats": 0},
+        {"name": "Feast", "grams": 2**31},
+        {"name": "Borscht", "kilocalories": 120},
+    ]
+    content = "\n".join(
+        json.dumps(
+            {
+                "description": "Dish",
+                "category_slug": "hot-dishes",
+                "grams": 300,
+                **row,
+            }
+        )
+        for row in rows
+    )
+
+    report = await MenuImportService(test_session).import_items(
+        company_id=test_company.id,
+        rows=iter_import_rows(io.BytesIO(content.encode()), MenuImportFormat.NDJSON),
+    )
+
+    assert (report.imported, report.error_count) == (1, 3)
+    assert [error.row for error in report.errors] == [1, 2, 3]
+    assert "kilocalories" in report.errors[0].message
+    assert "proteins" in report.errors[1].message
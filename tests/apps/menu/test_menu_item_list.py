@@ -0,0 +1,99 @@
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.services import MenuItemService
+from tests.fixtures.factories import CategoryFactory, MenuImageFactory, MenuItemFactory
+from tests.utils.auth import create_basic_auth_header
+
+
+@pytest.mark.asyncio
+async def test_list_rows_match_orm_list(
+    test_session: AsyncSession,
+    menu_item_service: MenuItemService,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    soups = await CategoryFactory.create(
+        session=test_session, name="Soups", slug="soups", parent_id=test_category.id
+    )
+    borscht = await MenuItemFactory.create(
+        session=test_session,
+        category_id=soups.id,
+        owner_company_id=company.id,
+        name="Borscht",
+        kilocalories=320,
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Stew",
+    )
+    for order in (1, 0):
+        await MenuImageFactory.create(
+            session=test_session,
+            menu_item_id=borscht.id,
+            filename=f"borscht-{order}.jpg",
+            display_order=order,
+            is_primary=order == 0,
+        )
+
+    company_id = company.id
+    entries = await menu_item_service.list_by_company(company_id)
+    test_session.expire_all()
+    menu_items = await menu_item_service.repository.list_by_company(company_id)
+
+    assert [entry.item.slug for entry in entries] == [i.slug for i in menu_items]
+    for entry, menu_item in zip(entries, menu_items):
+        assert entry.item.kilocalories == menu_item.kilocalories
+        assert entry.breadcrumbs == menu_item.breadcrumbs
+        assert [
+            (image.file_path, image.display_order, image.is_primary)
+            for image in entry.images
+        ] == [
+            (image.file_path, image.display_order, image.is_primary)
+            for image in menu_item.images
+        ]
+    assert entries[-1].breadcrumbs == [
+        {"name": "Hot dishes", "slug": "hot-dishes"},
+        {"name": "Soups", "slug": "soups"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_company_menu_items(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Soup",
+    )
+    await MenuImageFactory.create(
+        session=test_session, menu_item_id=menu_item.id, is_primary=True
+    )
+
+    response = await client.get(
+        "/api/v1/menu/",
+        params={"company_subdomain": company.subdomain},
+        headers={
+            "Authorization": create_basic_auth_header(
+                test_user.email, "test_password_123"
+            )
+        },
+    )
+
+    assert response.status_code == 200
+    [item] = response.json()
+    assert item["slug"] == menu_item.slug
+    assert item["breadcrumbs"] == [{"name": "Hot dishes", "slug": "hot-dishes"}]
+    assert item["images"][0]["is_primary"] is True
+    assert "menu-images/image.jpg" in item["images"][0]["url"]
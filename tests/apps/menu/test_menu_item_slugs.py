@@ -0,0 +1,80 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.schemas import MenuItemCreate, MenuItemUpdate
+from src.backoffice.apps.menu.services import MenuItemService
+from tests.fixtures.factories import MenuItemFactory
+
+
+@contextmanager
+def capture_writes(session: AsyncSession) -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def before_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE")):
+            statements.append(statement.split()[0].upper())
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+
+
+@pytest.mark.asyncio
+async def test_create_writes_slug_in_the_insert(
+    test_session: AsyncSession,
+    menu_item_service: MenuItemService,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    existing = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+    )
+
+    with capture_writes(test_session) as writes:
+        menu_item = await menu_item_service.create(
+            MenuItemCreate(
+                name="Borscht with Sour Cream",
+                description="Beet soup",
+                grams=300,
+                category_slug=test_category.slug,
+                company_subdomain=company.subdomain,
+            )
+        )
+
+    assert writes == ["INSERT"]
+    assert menu_item.id == existing.id + 1
+    assert menu_item.slug == f"borscht-with-sour-cream-{menu_item.id}"
+
+
+@pytest.mark.asyncio
+async def test_rename_updates_slug_in_the_same_statement(
+    test_session: AsyncSession,
+    menu_item_service: MenuItemService,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Soup",
+    )
+
+    with capture_writes(test_session) as writes:
+        updated = await menu_item_service.update_by_slug_or_raise(
+            menu_item.slug, MenuItemUpdate(name="Fish soup")
+        )
+
+    assert writes == ["UPDATE"]
+    assert updated.slug == f"fish-soup-{menu_item.id}"
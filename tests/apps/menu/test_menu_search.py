@@ -0,0 +1,100 @@
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.fixtures.factories import CategoryFactory, MenuItemFactory
+from tests.utils.auth import create_basic_auth_header
+
+
+@pytest.mark.asyncio
+async def test_search_menu_items_ranks_name_matches_and_counts_facets(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    desserts = await CategoryFactory.create(
+        session=test_session, name="Desserts", slug="desserts"
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Bread basket",
+        description="Served with tomato soup",
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Tomato soup",
+        description="Hot",
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=desserts.id,
+        owner_company_id=company.id,
+        name="Tomato sorbet",
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Mushroom cream",
+    )
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+
+    # Unfinished last word still matches as a prefix
+    response = await client.get(
+        "/api/v1/menu/search",
+        params={"company_subdomain": company.subdomain, "q": "tomato so"},
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [hit["name"] for hit in data["hits"]] == [
+        "Tomato sorbet",
+        "Tomato soup",
+        "Bread basket",
+    ]
+    assert data["total"] == 3
+    assert {facet["category_slug"]: facet["count"] for facet in data["facets"]} == {
+        test_category.slug: 2,
+        "desserts": 1,
+    }
+
+    response = await client.get(
+        "/api/v1/menu/search",
+        params={
+            "company_subdomain": company.subdomain,
+            "q": "tomato",
+            "category_slug": "desserts",
+        },
+        headers={"Authorization": auth_header},
+    )
+
+    data = response.json()
+    assert [hit["name"] for hit in data["hits"]] == ["Tomato sorbet"]
+    assert data["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_search_menu_items_without_words_returns_nothing(
+    client: httpx.AsyncClient,
+    test_user,
+    company_with_member,
+):
+    company, _ = company_with_member
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+
+    response = await client.get(
+        "/api/v1/menu/search",
+        params={"company_subdomain": company.subdomain, "q": "&|!"},
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"hits": [], "facets": [], "total": 0}
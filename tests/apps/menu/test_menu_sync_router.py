@@ -0,0 +1,92 @@
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.fixtures.factories import (
+    CompanyBranchFactory,
+    CompanyFactory,
+    MenuItemFactory,
+)
+from tests.utils.auth import create_basic_auth_header
+
+
+@pytest.mark.asyncio
+async def test_get_menu_changes_full_snapshot_then_delta(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    menu_item = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Soup",
+    )
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+
+    response = await client.get(
+        "/api/v1/menu/changes",
+        params={"company_subdomain": company.subdomain},
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["is_full_snapshot"] is True
+    assert [item["slug"] for item in data["upserted"]] == [menu_item.slug]
+    assert data["deleted"] == []
+    assert data["watermark"] is not None
+
+    await client.delete(
+        f"/api/v1/menu/{menu_item.slug}", headers={"Authorization": auth_header}
+    )
+
+    response = await client.get(
+        "/api/v1/menu/changes",
+        params={"company_subdomain": company.subdomain, "since": data["watermark"]},
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 200
+    delta = response.json()
+    assert delta["is_full_snapshot"] is False
+    assert delta["upserted"] == []
+    assert [tombstone["slug"] for tombstone in delta["deleted"]] == [menu_item.slug]
+
+
+@pytest.mark.asyncio
+async def test_get_menu_changes_foreign_branch_not_found(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+):
+    company, _ = company_with_member
+    other_company = await CompanyFactory.create(
+        session=test_session, name="Other", subdomain="other"
+    )
+    other_branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=other_company.id
+    )
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+
+    response = await client.get(
+        "/api/v1/menu/changes",
+        params={"company_subdomain": company.subdomain, "branch_id": other_branch.id},
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_menu_changes_unauthorized(client: httpx.AsyncClient, test_company):
+    response = await client.get(
+        "/api/v1/menu/changes",
+        params={"company_subdomain": test_company.subdomain},
+    )
+
+    assert response.status_code == 401
@@ -0,0 +1,172 @@
+from datetime import timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.schemas import MenuItemUpdate
+from src.backoffice.apps.menu.services import MenuSyncService
+from tests.fixtures.factories import (
+    CompanyBranchFactory,
+    CompanyBranchMenuFactory,
+    MenuImageFactory,
+    MenuItemFactory,
+)
+
+
+@pytest.mark.asyncio
+async def test_full_snapshot_without_watermark(
+    menu_sync_service, test_session: AsyncSession, test_company, test_category
+):
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Soup",
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Salad",
+    )
+
+    change_set = await menu_sync_service.get_changes(test_company.id)
+
+    assert {item.name for item in change_set.items} == {"Soup", "Salad"}
+    assert change_set.tombstones == []
+    assert change_set.watermark is not None
+
+
+@pytest.mark.asyncio
+async def test_changes_since_watermark_return_only_delta(
+    menu_sync_service,
+    menu_item_service,
+    test_session: AsyncSession,
+    test_company,
+    test_category,
+):
+    soup = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Soup",
+    )
+    salad = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Salad",
+    )
+    snapshot = await menu_sync_service.get_changes(test_company.id)
+
+    await menu_item_service.update_by_slug_or_raise(
+        soup.slug, MenuItemUpdate(description="Hot soup")
+    )
+    await menu_item_service.delete_by_slug_or_raise(salad.slug)
+    await test_session.commit()
+
+    delta = await menu_sync_service.get_changes(
+        test_company.id, since=snapshot.watermark
+    )
+
+    assert [item.id for item in delta.items] == [soup.id]
+    assert [tombstone.menu_item_id for tombstone in delta.tombstones] == [salad.id]
+    assert delta.watermark > snapshot.watermark
+
+    empty = await menu_sync_service.get_changes(test_company.id, since=delta.watermark)
+    assert empty.items == []
+    assert empty.tombstones == []
+    assert empty.watermark == delta.watermark
+
+
+@pytest.mark.asyncio
+async def test_image_change_marks_item_as_changed(
+    menu_sync_service, test_session: AsyncSession, test_company, test_category
+):
+    menu_item = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+    )
+    snapshot = await menu_sync_service.get_changes(test_company.id)
+
+    await MenuImageFactory.create(session=test_session, menu_item_id=menu_item.id)
+
+    delta = await menu_sync_service.get_changes(
+        test_company.id, since=snapshot.watermark
+    )
+
+    assert [item.id for item in delta.items] == [menu_item.id]
+
+
+@pytest.mark.asyncio
+async def test_branch_changes_include_price_and_availability(
+    menu_sync_service, test_session: AsyncSession, test_company, test_category
+):
+    branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=test_company.id
+    )
+    in_branch = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Soup",
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Not in branch",
+    )
+    branch_menu = await CompanyBranchMenuFactory.create(
+        session=test_session,
+        company_branch_id=branch.id,
+        menu_item_id=in_branch.id,
+        price=Decimal("350.00"),
+    )
+
+    snapshot = await menu_sync_service.get_changes(
+        test_company.id, company_branch_id=branch.id
+    )
+    assert [item.id for item in snapshot.items] == [in_branch.id]
+    assert snapshot.branch_menus[in_branch.id].price == Decimal("350.00")
+
+    branch_menu.available = False
+    await test_session.commit()
+
+    delta = await menu_sync_service.get_changes(
+        test_company.id, since=snapshot.watermark, company_branch_id=branch.id
+    )
+    assert [item.id for item in delta.items] == [in_branch.id]
+    assert delta.branch_menus[in_branch.id].available is False
+
+
+@pytest.mark.asyncio
+async def test_watermark_lags_behind_the_read(
+    test_session: AsyncSession, test_company, test_category
+):
+    service = MenuSyncService(test_session, watermark_lag=timedelta(minutes=5))
+    soup = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Soup",
+    )
+    snapshot = await service.get_changes(test_company.id)
+    stamped_at = soup.updated_at.replace(tzinfo=timezone.utc)
+    assert snapshot.watermark < stamped_at
+
+    # Stamped before the snapshot's read, committed after it
+    salad = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=test_company.id,
+        name="Salad",
+    )
+    salad.updated_at = soup.updated_at
+    await test_session.flush()
+    delta = await service.get_changes(test_company.id, since=snapshot.watermark)
+
+    assert {item.id for item in delta.items} == {soup.id, salad.id}
+    assert snapshot.watermark <= delta.watermark < stamped_at
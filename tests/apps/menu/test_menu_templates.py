@@ -0,0 +1,133 @@
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.models import CompanyBranchMenu, MenuImage
+from tests.fixtures.factories import (
+    CategoryFactory,
+    CompanyBranchFactory,
+    MenuImageFactory,
+    MenuItemFactory,
+)
+from tests.utils.auth import create_basic_auth_header
+
+
+@pytest.mark.asyncio
+async def test_clone_category_subtree(
+    menu_item_service, test_session: AsyncSession, test_company, test_category
+):
+    soups = await CategoryFactory.create(
+        session=test_session, name="Soups", slug="soups", parent_id=test_category.id
+    )
+    drinks = await CategoryFactory.create(
+        session=test_session, name="Drinks", slug="drinks"
+    )
+    borscht = await MenuItemFactory.create(
+        session=test_session,
+        category_id=soups.id,
+        name="Borscht",
+        slug="borscht-template",
+        is_template=True,
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        name="Pilaf",
+        slug="pilaf-template",
+        is_template=True,
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=drinks.id,
+        name="Tea",
+        slug="tea-template",
+        is_template=True,
+    )
+    await MenuImageFactory.create(
+        session=test_session, menu_item_id=borscht.id, file_path="menu-images/b.jpg"
+    )
+
+    cloned = await menu_item_service.clone_templates(
+        company_id=test_company.id, category_slug=test_category.slug
+    )
+    await test_session.commit()
+
+    assert sorted(item.name for item in cloned) == ["Borscht", "Pilaf"]
+    assert {item.slug for item in cloned} == {
+        f"borscht-{item.id}" if item.name == "Borscht" else f"pilaf-{item.id}"
+        for item in cloned
+    }
+    borscht_copy = next(item for item in cloned if item.name == "Borscht")
+    images = (
+        await test_session.execute(
+            select(MenuImage.file_path).where(MenuImage.menu_item_id == borscht_copy.id)
+        )
+    ).all()
+    assert [image.file_path for image in images] == ["menu-images/b.jpg"]
+
+    # Templates already cloned into the company are skipped
+    again = await menu_item_service.clone_templates(
+        company_id=test_company.id,
+        template_slugs=["borscht-template", "tea-template"],
+    )
+    assert [item.name for item in again] == ["Tea"]
+
+
+@pytest.mark.asyncio
+async def test_clone_templates_endpoint_assigns_branches(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+):
+    company, _ = company_with_member
+    branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=company.id
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        name="Pilaf",
+        slug="pilaf-template",
+        is_template=True,
+    )
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+
+    response = await client.post(
+        "/api/v1/menu/templates/clone",
+        json={
+            "company_subdomain": company.subdomain,
+            "template_slugs": ["pilaf-template"],
+            "branch_ids": [branch.id],
+            "price": "350.00",
+        },
+        headers={"Authorization": auth_header},
+    )
+
+    assert response.status_code == 201
+    [item] = response.json()["items"]
+    assert item["slug"] == f"pilaf-{item['id']}"
+
+    branch_menus = (
+        (
+            await test_session.execute(
+                select(CompanyBranchMenu).where(
+                    CompanyBranchMenu.company_branch_id == branch.id
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert [(row.menu_item_id, str(row.price)) for row in branch_menus] == [
+        (item["id"], "350.00")
+    ]
+
+    response = await client.post(
+        "/api/v1/menu/templates/clone",
+        json={"company_subdomain": company.subdomain},
+        headers={"Authorization": auth_header},
+    )
+    assert response.status_code == 422
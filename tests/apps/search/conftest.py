@@ -0,0 +1,15 @@
+import pytest_asyncio
+from fastapi import FastAPI
+
+from src.backoffice.core.dependencies import get_search_backend
+from src.backoffice.core.services.search_backend import InMemorySearchBackend
+from tests.fixtures.auth import test_user  # noqa: F401
+from tests.fixtures.companies import company_with_member, test_company  # noqa: F401
+from tests.fixtures.menu import test_category  # noqa: F401
+
+
+@pytest_asyncio.fixture
+async def search_backend(test_app: FastAPI) -> InMemorySearchBackend:
+    backend = InMemorySearchBackend()
+    test_app.dependency_overrides[get_search_backend] = lambda: backend
+    return backend
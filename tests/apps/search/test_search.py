@@ -0,0 +1,179 @@
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.backoffice.apps.company.events import CompanyEventType
+from src.backoffice.apps.location.models import Address, City, Country, Region, Street
+from src.backoffice.apps.menu.events import MenuEventType
+from src.backoffice.apps.search.documents import (
+    BRANCHES_INDEX,
+    INDICES,
+    MENU_ITEMS_INDEX,
+)
+from src.backoffice.apps.search.services import SearchIndexingHook, SearchIndexService
+from src.backoffice.core.services.event_bus import Event
+from tests.fixtures.factories import CompanyBranchFactory, MenuItemFactory
+from tests.utils.auth import create_basic_auth_header
+
+
+async def create_moscow_address(session: AsyncSession) -> Address:
+    country = Country(name="Россия", name_en="Russia", code="RUS", code_alpha2="RU")
+    session.add(country)
+    await session.flush()
+    region = Region(name="Москва", name_en="Moscow", country_id=country.id)
+    session.add(region)
+    await session.flush()
+    city = City(
+        name="Москва", name_en="Moscow", country_id=country.id, region_id=region.id
+    )
+    session.add(city)
+    await session.flush()
+    street = Street(name="Тверская", name_en="Tverskaya", city_id=city.id)
+    session.add(street)
+    await session.flush()
+    address = Address(street_id=street.id, house_number="7")
+    session.add(address)
+    await session.commit()
+    return address
+
+
+@pytest.mark.asyncio
+async def test_rebuild_indices_and_search(
+    client: httpx.AsyncClient,
+    test_user,
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+    search_backend,
+):
+    company, _ = company_with_member
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Tomato soup",
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Bread",
+        description="Goes well with tomato soup",
+    )
+    await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        name="Tomato salad",
+        is_template=True,
+    )
+    address = await create_moscow_address(test_session)
+    await CompanyBranchFactory.create(
+        session=test_session,
+        company_id=company.id,
+        name="Downtown",
+        address_id=address.id,
+    )
+
+    service = SearchIndexService(test_session, search_backend)
+    counts = {
+        name: await service.rebuild(index, batch_size=1)
+        for name, index in INDICES.items()
+    }
+    assert counts == {"menu_items": 2, "branches": 1, "locations": 3}
+
+    auth_header = create_basic_auth_header(test_user.email, "test_password_123")
+    response = await client.get(
+        "/api/v1/search/menu",
+        params={"company_subdomain": company.subdomain, "q": "tomato so"},
+        headers={"Authorization": auth_header},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert [hit["name"] for hit in data["hits"]] == ["Tomato soup", "Bread"]
+
+    response = await client.get(
+        "/api/v1/search/branches",
+        params={"q": "тверс"},
+        headers={"Authorization": auth_header},
+    )
+    hits = response.json()["hits"]
+    assert [(hit["name"], hit["address"]) for hit in hits] == [
+        ("Downtown", "Тверская 7, Москва")
+    ]
+
+    response = await client.get(
+        "/api/v1/search/locations",
+        params={"q": "mosc", "kind": "city"},
+        headers={"Authorization": auth_header},
+    )
+    hits = response.json()["hits"]
+    assert [(hit["kind"], hit["path"]) for hit in hits] == [
+        ("city", "Москва, Москва, Россия")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_indexing_hook_follows_change_events(
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+    search_backend,
+):
+    company, _ = company_with_member
+    soup = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Soup",
+    )
+    branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=company.id
+    )
+    hook = SearchIndexingHook(
+        async_sessionmaker(test_session.bind, expire_on_commit=False), search_backend
+    )
+
+    await hook(
+        Event("1", "company:1", MenuEventType.ITEM_CREATED.value, {"id": soup.id})
+    )
+    await hook(
+        Event(
+            "2", "company:1", CompanyEventType.BRANCH_CREATED.value, {"id": branch.id}
+        )
+    )
+    await hook.drain()
+    assert search_backend.get(MENU_ITEMS_INDEX, soup.id)["name"] == "Soup"
+    assert search_backend.get(BRANCHES_INDEX, branch.id)["company_id"] == company.id
+
+    await hook.handle(
+        Event("3", "company:1", MenuEventType.ITEM_DELETED.value, {"id": soup.id})
+    )
+    assert search_backend.get(MENU_ITEMS_INDEX, soup.id) is None
+
+
+@pytest.mark.asyncio
+async def test_indexing_hook_rebuilds_every_index(
+    test_session: AsyncSession,
+    company_with_member,
+    test_category,
+    search_backend,
+):
+    company, _ = company_with_member
+    soup = await MenuItemFactory.create(
+        session=test_session,
+        category_id=test_category.id,
+        owner_company_id=company.id,
+        name="Soup",
+    )
+    branch = await CompanyBranchFactory.create(
+        session=test_session, company_id=company.id
+    )
+    hook = SearchIndexingHook(
+        async_sessionmaker(test_session.bind, expire_on_commit=False), search_backend
+    )
+
+    await hook.rebuild()
+
+    assert search_backend.get(MENU_ITEMS_INDEX, soup.id)["name"] == "Soup"
+    assert search_backend.get(BRANCHES_INDEX, branch.id)["company_id"] == company.id
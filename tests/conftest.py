@@ -1,23 +1,34 @@
+import contextlib
 from typing import AsyncGenerator
 
 import httpx
 import pytest_asyncio
 from fastapi import FastAPI
-from sqlalchemy import JSON, DateTime, Table
-from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
+from sqlalchemy import JSON, DateTime, Table, Text
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
 from src.backoffice.core.app import create_app
-from src.backoffice.core.dependencies.database import get_session
+from src.backoffice.core.dependencies.database import get_session, get_session_factory
 from src.backoffice.models.all import (
+    Address,
+    Category,
+    City,
     Company,
     CompanyBranch,
+    CompanyBranchMenu,
     CompanyMember,
+    Country,
+    MenuImage,
+    MenuItem,
+    MenuItemTombstone,
     OAuthAccount,
     QRCode,
     RefreshToken,
+    Region,
     Site,
+    Street,
     User,
 )
 
@@ -29,6 +40,12 @@ def adapt_table_for_sqlite(table: Table) -> None:
             column.type = JSON()
         elif isinstance(column.type, TIMESTAMP):
             column.type = DateTime()
+        elif isinstance(column.type, TSVECTOR):
+            # Generated from PostgreSQL text search functions, left empty here
+            column.type = Text()
+            column.computed = None
+            column.server_default = None
+            column.server_onupdate = None
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -43,11 +60,21 @@ async def test_session() -> AsyncGenerator[AsyncSession, None]:
         User.__table__,
         OAuthAccount.__table__,
         RefreshToken.__table__,
+        Country.__table__,
+        Region.__table__,
+        City.__table__,
+        Street.__table__,
+        Address.__table__,
         Company.__table__,
         CompanyBranch.__table__,
         CompanyMember.__table__,
         QRCode.__table__,
         Site.__table__,
+        Category.__table__,
+        MenuItem.__table__,
+        MenuImage.__table__,
+        CompanyBranchMenu.__table__,
+        MenuItemTombstone.__table__,
     ]
 
     async with engine.begin() as conn:
@@ -77,6 +104,9 @@ async def test_app(test_session: AsyncSession) -> AsyncGenerator[FastAPI, None]:
         yield test_session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_session_factory] = lambda: (
+        lambda: contextlib.nullcontext(test_session)
+    )
 
     yield app
 
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.backoffice.core.services.blocking_pool import BlockingCallPool
+from src.backoffice.core.services.metrics import MetricsRegistry
+
+
+@pytest.mark.asyncio
+async def test_calls_run_off_the_loop_and_record_queue_and_io_time():
+    registry = MetricsRegistry()
+    pool = BlockingCallPool("s3", max_workers=1, registry=registry)
+    threads = []
+
+    def slow_call(value):
+        threads.append(threading.get_ident())
+        time.sleep(0.05)
+        return value
+
+    try:
+        results = await asyncio.gather(
+            pool.run("get_object", slow_call, 1), pool.run("get_object", slow_call, 2)
+        )
+    finally:
+        pool.shutdown()
+
+    assert results == [1, 2]
+    assert threading.get_ident() not in threads
+    assert registry.get("s3_get_object_calls") == 2
+    assert registry.get("s3_get_object_io_seconds") >= 0.1
+    # The second call waited for the only thread
+    assert registry.get("s3_get_object_queue_seconds") >= 0.04
+    assert registry.get("s3_pool_waiting") == registry.get("s3_pool_running") == 0
+
+
+@pytest.mark.asyncio
+async def test_only_transient_errors_are_retried():
+    registry = MetricsRegistry()
+    pool = BlockingCallPool(
+        "s3",
+        max_attempts=3,
+        backoff=0.001,
+        retry_on=lambda error: isinstance(error, ConnectionResetError),
+        registry=registry,
+    )
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionResetError()
+        return "ok"
+
+    def broken():
+        raise PermissionError()
+
+    try:
+        assert await pool.run("put_object", flaky) == "ok"
+        with pytest.raises(PermissionError):
+            await pool.run("delete_object", broken)
+    finally:
+        pool.shutdown()
+
+    assert registry.get("s3_put_object_retries") == 2
+    assert registry.get("s3_put_object_errors") == 0
+    assert registry.get("s3_delete_object_retries") == 0
+    assert registry.get("s3_delete_object_errors") == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_out_call_waiting_for_a_thread_never_runs():
+    registry = MetricsRegistry()
+    pool = BlockingCallPool("s3", max_workers=1, registry=registry)
+    ran = []
+
+    try:
+        blocker = asyncio.create_task(pool.run("head_object", time.sleep, 0.1))
+        await asyncio.sleep(0.01)
+        with pytest.raises(TimeoutError):
+            await pool.run("head_object", ran.append, 1, timeout=0.02)
+        await blocker
+        await asyncio.sleep(0.01)
+    finally:
+        pool.shutdown()
+
+    assert ran == []
+    assert registry.get("s3_head_object_timeouts") == 1
+    assert registry.get("s3_pool_waiting") == 0
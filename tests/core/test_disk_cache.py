@@ -0,0 +1,39 @@
+import pytest
+
+from src.backoffice.core.services.disk_cache import DiskLRUCache
+from src.backoffice.core.services.metrics import MetricsRegistry
+
+
+@pytest.mark.asyncio
+async def test_least_recently_read_entries_evicted_past_max_bytes(tmp_path):
+    registry = MetricsRegistry()
+    cache = DiskLRUCache(str(tmp_path), max_bytes=250, registry=registry)
+    await cache.put("a", b"a" * 100)
+    await cache.put("b", b"b" * 100)
+    cache.open("a").close()
+
+    await cache.put("c", b"c" * 100)
+
+    assert cache.open("b") is None
+    mapped = cache.open("a")
+    assert mapped[:3] == b"aaa"
+    assert registry.get("disk_cache_evictions") == 1
+    assert registry.get("disk_cache_bytes") == 200
+
+    # A mapping stays readable after its entry is evicted
+    await cache.put("d", b"d" * 200)
+    assert cache.open("a") is None
+    assert mapped[-1:] == b"a"
+    mapped.close()
+
+
+@pytest.mark.asyncio
+async def test_index_rebuilt_from_directory(tmp_path):
+    await DiskLRUCache(str(tmp_path), max_bytes=1000).put("menu/a.webp", b"webp")
+    (tmp_path / "partial.tmp").write_bytes(b"x")
+
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1000, registry=MetricsRegistry())
+
+    assert len(cache) == 1
+    assert cache.open("menu/a.webp").read() == b"webp"
+    assert not (tmp_path / "partial.tmp").exists()
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from src.backoffice.core.services import event_bus
+from src.backoffice.core.services.event_bus import Event, EventBus, sse_stream
+
+
+@pytest.mark.asyncio
+async def test_publish_fans_out_to_channel_subscribers():
+    bus = EventBus()
+    first = await bus.subscribe(["branch:1"])
+    second = await bus.subscribe(["branch:1", "company:1"])
+    other = await bus.subscribe(["branch:2"])
+
+    event = await bus.publish("branch:1", "menu_item.updated", {"id": 10})
+
+    assert await first.get(timeout=1) == event
+    assert await second.get(timeout=1) == event
+    with pytest.raises(asyncio.TimeoutError):
+        await other.get(timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_subscribe_resumes_after_last_event_id():
+    bus = EventBus()
+    first = await bus.publish("branch:1", "menu_item.created", {"id": 1})
+    second = await bus.publish("company:1", "menu_item.updated", {"id": 2})
+    third = await bus.publish("branch:1", "menu_item.deleted", {"id": 1})
+
+    subscription = await bus.subscribe(
+        ["branch:1", "company:1"], last_event_id=first.id
+    )
+
+    assert await subscription.get(timeout=1) == second
+    assert await subscription.get(timeout=1) == third
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_disconnected():
+    bus = EventBus(subscriber_queue_size=2)
+    slow = await bus.subscribe(["branch:1"])
+
+    for index in range(3):
+        await bus.publish("branch:1", "menu_item.updated", {"id": index})
+
+    assert slow.closed is True
+    assert bus.subscriber_count("branch:1") == 0
+    assert (await slow.get(timeout=1)).data == {"id": 0}
+    assert (await slow.get(timeout=1)).data == {"id": 1}
+    assert await slow.get(timeout=1) is None
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_sends_heartbeats_and_events():
+    bus = EventBus()
+    subscription = await bus.subscribe(["branch:1"])
+    stream = sse_stream(subscription, heartbeat_interval=0.01)
+
+    assert await stream.__anext__() == "retry: 3000\n\n"
+    assert await stream.__anext__() == ": heartbeat\n\n"
+
+    event = await bus.publish("branch:1", "menu_item.created", {"id": 5})
+    chunk = await stream.__anext__()
+    while chunk == ": heartbeat\n\n":
+        chunk = await stream.__anext__()
+
+    assert chunk == f'id: {event.id}\nevent: menu_item.created\ndata: {{"id": 5}}\n\n'
+
+    await stream.aclose()
+    assert bus.subscriber_count() == 0
+
+
+class FakePubSub:
+    def __init__(self, messages, error=None):
+        self.messages = messages
+        self.error = error
+        self.closed = False
+
+    async def psubscribe(self, pattern):
+        pass
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        if self.error is not None:
+            raise self.error
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    def __init__(self, connections):
+        self.connections = list(connections)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        connection = self.connections.pop(0)
+        if isinstance(connection, Exception):
+            raise connection
+        return connection
+
+
+def remote(channel: str, data: dict) -> dict:
+    event = Event(id=f"1-remote-{data['id']}", channel=channel, type="t", data=data)
+    return {"type": "pmessage", "data": event.to_json()}
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_after_redis_connection_drops(monkeypatch):
+    monkeypatch.setattr(event_bus, "RECONNECT_DELAY", 0)
+    dropped = FakePubSub(
+        [remote("branch:1", {"id": 1})], error=ConnectionError("Connection lost")
+    )
+    bus = EventBus(redis_url="redis://fake")
+    bus._redis = FakeRedis(
+        [
+            dropped,
+            ConnectionError("Connection refused"),
+            FakePubSub([remote("branch:1", {"id": 2})]),
+        ]
+    )
+    subscription = await bus.subscribe(["branch:1"])
+
+    assert (await subscription.get(timeout=1)).data == {"id": 1}
+    assert (await subscription.get(timeout=1)).data == {"id": 2}
+    assert dropped.closed is True
+    assert not bus._listener.done()
+
+    bus._redis = None
+    await bus.stop()
@@ -0,0 +1,129 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from src.backoffice.core.services.image_processing import (
+    JPEG,
+    ImageFormat,
+    read_dimensions,
+    render_thumbnails,
+)
+from src.backoffice.core.services.metrics import MetricsRegistry
+from src.backoffice.core.services.process_pool import CpuTaskPool
+from src.backoffice.core.services.s3_client import s3_client
+from tests.utils.images import make_image, render_thumbnails_from_full_image
+
+
+@pytest.mark.asyncio
+async def test_thumbnails_rendered_in_worker_process_with_cpu_time_recorded():
+    registry = MetricsRegistry()
+    pool = CpuTaskPool("image", max_workers=1, max_queue=0, registry=registry)
+    try:
+        rendered = await pool.run(
+            "thumbnails",
+            render_thumbnails,
+            make_image(1200, 900),
+            [("small", (150, 150)), ("large", (600, 600))],
+        )
+    finally:
+        pool.shutdown()
+
+    assert (rendered.width, rendered.height) == (1200, 900)
+    assert [(t.size, t.width, t.height) for t in rendered.thumbnails] == [
+        ("small", 150, 113),
+        ("large", 600, 450),
+    ]
+    assert Image.open(io.BytesIO(rendered.thumbnails[0].content)).format == "JPEG"
+    assert registry.get("image_thumbnails_calls") == 1
+    assert registry.get("image_thumbnails_cpu_seconds") > 0
+    assert registry.get("image_pool_submitted") == 0
+
+
+@pytest.mark.asyncio
+async def test_workers_not_forked_from_the_app():
+    pool = CpuTaskPool("image", max_workers=1, max_queue=0, registry=MetricsRegistry())
+    try:
+        await pool.run("dimensions", read_dimensions, make_image(10, 10))
+        start_method = pool._executor._mp_context.get_start_method()
+    finally:
+        pool.shutdown()
+
+    assert start_method in ("forkserver", "spawn")
+
+
+@pytest.mark.asyncio
+async def test_upload_puts_thumbnails_concurrently(monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def put_object(file_path, file_content, content_type):
+        in_flight.append(file_path)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(file_path)
+
+    monkeypatch.setattr(s3_client, "_put_object", put_object)
+    content = make_image(800, 400)
+    file = UploadFile(
+        io.BytesIO(content),
+        size=len(content),
+        filename="dish.png",
+        headers=Headers({"content-type": "image/png"}),
+    )
+
+    result = await s3_client.upload_file(file)
+
+    assert (result["width"], result["height"]) == (800, 400)
+    assert [(t["size"], t["mime_type"]) for t in result["thumbnails"]] == [
+        ("small", "image/jpeg"),
+        ("small", "image/webp"),
+        ("medium", "image/jpeg"),
+        ("medium", "image/webp"),
+        ("large", "image/jpeg"),
+        ("large", "image/webp"),
+    ]
+    assert result["thumbnails"][5]["file_path"].endswith("_large.webp")
+    assert result["thumbnails"][4]["file_path"].endswith("_large.jpg")
+    assert result["thumbnails"][4]["width"] == 600
+    assert len({t["file_path"] for t in result["thumbnails"]}) == 6
+    assert max(peak) == 6
+
+
+def test_cascade_from_draft_decoded_jpeg_matches_full_resize():
+    content = make_image(4000, 3000, "JPEG", "RGB")
+    sizes = [("small", (150, 150)), ("large", (600, 600)), ("medium", (300, 300))]
+
+    rendered = render_thumbnails(content, sizes)
+    expected = render_thumbnails_from_full_image(content, sizes)
+
+    assert (rendered.width, rendered.height) == (4000, 3000)
+    assert [(t.size, t.width, t.height) for t in rendered.thumbnails] == [
+        (t.size, t.width, t.height) for t in expected.thumbnails
+    ]
+    for thumbnail, reference in zip(rendered.thumbnails, expected.thumbnails):
+        pixels = Image.open(io.BytesIO(thumbnail.content)).convert("L").getdata()
+        reference_pixels = Image.open(io.BytesIO(reference.content)).convert("L")
+        difference = [abs(a - b) for a, b in zip(pixels, reference_pixels.getdata())]
+        assert sum(difference) / len(difference) < 4
+
+
+def test_each_size_encoded_in_every_format():
+    webp = ImageFormat("WEBP", "image/webp", ".webp", {"quality": 80, "method": 4})
+
+    rendered = render_thumbnails(
+        make_image(900, 600),
+        [("small", (150, 150)), ("large", (600, 600))],
+        [JPEG, webp],
+    )
+
+    assert [(t.size, t.mime_type, t.width) for t in rendered.thumbnails] == [
+        ("small", "image/jpeg", 150),
+        ("small", "image/webp", 150),
+        ("large", "image/jpeg", 600),
+        ("large", "image/webp", 600),
+    ]
+    assert Image.open(io.BytesIO(rendered.thumbnails[1].content)).format == "WEBP"
@@ -0,0 +1,45 @@
+from typing import List, Optional, Tuple
+
+import pytest
+
+from src.backoffice.core.services.kafka_client import InMemoryBroker
+
+
+@pytest.mark.asyncio
+async def test_messages_sent_before_consuming_are_delivered_in_order():
+    broker = InMemoryBroker()
+    received: List[Tuple[bytes, Optional[bytes]]] = []
+
+    async def handler(value, key):
+        received.append((value, key))
+
+    await broker.send("jobs", b"first", key=b"1")
+    async with broker.consume("jobs", "workers", handler):
+        await broker.send("jobs", b"second")
+        await broker.drain()
+
+    assert received == [(b"first", b"1"), (b"second", None)]
+
+
+@pytest.mark.asyncio
+async def test_every_group_gets_each_message_and_failures_do_not_stop_it():
+    broker = InMemoryBroker()
+    workers: List[bytes] = []
+    auditors: List[bytes] = []
+
+    async def work(value, key):
+        if value == b"broken":
+            raise ValueError(value)
+        workers.append(value)
+
+    async def audit(value, key):
+        auditors.append(value)
+
+    async with broker.consume("jobs", "workers", work):
+        async with broker.consume("jobs", "auditors", audit):
+            for value in (b"a", b"broken", b"b"):
+                await broker.send("jobs", value)
+            await broker.drain()
+
+    assert workers == [b"a", b"b"]
+    assert auditors == [b"a", b"broken", b"b"]
@@ -0,0 +1,127 @@
+import itertools
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any, Dict, List, Set
+
+import pytest
+
+from src.backoffice.core.services import search_backend
+from src.backoffice.core.services.search_backend import (
+    ElasticsearchBackend,
+    InMemorySearchBackend,
+    SearchIndex,
+)
+
+INDEX = SearchIndex("menu_items")
+
+
+class FakeIndices:
+    """Indices and aliases of the `indices` API, documents kept per index"""
+
+    def __init__(self):
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.aliases: Dict[str, Set[str]] = defaultdict(set)
+
+    def resolve(self, name: str) -> List[str]:
+        return sorted(self.aliases.get(name) or [name])
+
+    async def create(self, index, mappings):
+        self.documents[index] = {}
+
+    async def put_alias(self, index, name):
+        self.aliases[name].add(index)
+
+    async def exists_alias(self, name):
+        return bool(self.aliases.get(name))
+
+    async def get_alias(self, name):
+        return {index: {} for index in self.aliases[name]}
+
+    async def update_aliases(self, actions):
+        for action in actions:
+            for operation, target in action.items():
+                names = self.aliases[target["alias"]]
+                if operation == "add":
+                    names.add(target["index"])
+                else:
+                    names.discard(target["index"])
+
+    async def refresh(self, index):
+        pass
+
+    async def delete(self, index, ignore_unavailable=False):
+        self.documents.pop(index, None)
+        for names in self.aliases.values():
+            names.discard(index)
+
+
+class FakeElasticsearch:
+    def __init__(self):
+        self.indices = FakeIndices()
+
+    async def bulk(self, actions):
+        for action in actions:
+            (index,) = self.indices.resolve(action["_index"])
+            documents = self.indices.documents[index]
+            operation = action.get("_op_type", "index")
+            if operation == "delete":
+                documents.pop(action["_id"], None)
+            elif operation == "index" or action["_id"] not in documents:
+                documents[action["_id"]] = action["_source"]
+
+    def search(self, alias):
+        (index,) = self.indices.resolve(alias)
+        return self.indices.documents[index]
+
+
+@pytest.fixture
+def elasticsearch(monkeypatch) -> ElasticsearchBackend:
+    backend = ElasticsearchBackend("http://localhost:9200")
+    backend._client = FakeElasticsearch()
+    monkeypatch.setattr(backend, "_bulk", backend._client.bulk)
+    # Index names carry the creation time, one second apart
+    clock = itertools.count(1)
+    monkeypatch.setattr(
+        search_backend, "time", SimpleNamespace(time=lambda: next(clock))
+    )
+    return backend
+
+
+def document(id: int, name: str) -> Dict[str, Any]:
+    return {"id": id, "name": name}
+
+
+async def rebuild_with_concurrent_writes(backend):
+    """Soup renamed and Salad deleted while the rebuild is under way"""
+    await backend.bulk_index(INDEX, [document(1, "Soup"), document(2, "Salad")])
+
+    async def batches():
+        yield [document(1, "Soup")]
+        await backend.bulk_index(INDEX, [document(1, "Borscht")])
+        await backend.bulk_delete(INDEX, [2])
+        await backend.bulk_index(INDEX, [document(3, "Tea")])
+        yield [document(1, "Soup"), document(3, "Tea")]
+
+    return await backend.rebuild(INDEX, batches())
+
+
+@pytest.mark.asyncio
+async def test_writes_during_elasticsearch_rebuild_kept(elasticsearch):
+    await rebuild_with_concurrent_writes(elasticsearch)
+
+    assert elasticsearch._client.search("menu_items") == {
+        "1": document(1, "Borscht"),
+        "3": document(3, "Tea"),
+    }
+    assert elasticsearch._client.indices.aliases["menu_items-rebuild"] == set()
+    assert len(elasticsearch._client.indices.documents) == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_during_in_memory_rebuild_kept():
+    backend = InMemorySearchBackend()
+
+    assert await rebuild_with_concurrent_writes(backend) == 2
+    assert backend.get(INDEX, 1) == document(1, "Borscht")
+    assert backend.get(INDEX, 2) is None
+    assert backend.get(INDEX, 3) == document(3, "Tea")
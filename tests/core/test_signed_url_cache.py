@@ -0,0 +1,51 @@
+from typing import List, Tuple
+
+import pytest
+
+from src.backoffice.core.config import s3_settings
+from src.backoffice.core.services.metrics import MetricsRegistry
+from src.backoffice.core.services.s3_client import s3_client
+from src.backoffice.core.services.signed_url_cache import SignedUrlCache
+
+
+class FakeSigner:
+    def __init__(self):
+        self.calls: List[Tuple[str, int]] = []
+
+    def __call__(self, file_path: str, expires_in: int) -> str:
+        self.calls.append((file_path, expires_in))
+        return f"https://s3/{file_path}?sig={len(self.calls)}"
+
+
+def test_urls_reused_until_requested_validity_runs_out():
+    now = [1000.0]
+    signer = FakeSigner()
+    registry = MetricsRegistry()
+    cache = SignedUrlCache(signer, registry=registry, clock=lambda: now[0])
+
+    first = cache.get_many(["a.jpg", "b.jpg", "a.jpg"], 3600)
+    assert signer.calls == [("a.jpg", 4500), ("b.jpg", 4500)]
+
+    now[0] += 900
+    assert cache.get_many(["a.jpg", "b.jpg"], 3600) == first
+    assert cache.get("a.jpg", 60) != first["a.jpg"]
+
+    now[0] += 1
+    assert cache.get("a.jpg", 3600) != first["a.jpg"]
+    assert len(signer.calls) == 4
+    assert registry.snapshot() == {
+        "s3_url_cache_hit_rate": 0.3333,
+        "s3_url_cache_hits": 2,
+        "s3_url_cache_misses": 4,
+        "s3_url_cache_size": 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_cdn_urls_are_not_signed(monkeypatch):
+    monkeypatch.setattr(s3_settings, "cdn_base_url", "https://cdn.example.com")
+    monkeypatch.setattr(s3_client, "_sign_url", None)
+
+    urls = await s3_client.get_urls(["menu-images/a.jpg"])
+
+    assert urls == {"menu-images/a.jpg": "https://cdn.example.com/menu-images/a.jpg"}
@@ -0,0 +1,22 @@
+import pytest
+
+from src.backoffice.core.services.image_processing import render_thumbnails
+from tests.utils.images import make_image, render_thumbnails_from_full_image
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [("small", (150, 150)), ("medium", (300, 300)), ("large", (600, 600))]
+# A 12 megapixel camera photo
+PHOTO = make_image(4000, 3000, "JPEG", "RGB")
+
+
+@pytest.mark.benchmark(group="thumbnails")
+def test_benchmark_full_image_resize(benchmark):
+    rendered = benchmark(render_thumbnails_from_full_image, PHOTO, SIZES)
+    assert len(rendered.thumbnails) == 3
+
+
+@pytest.mark.benchmark(group="thumbnails")
+def test_benchmark_draft_cascade(benchmark):
+    rendered = benchmark(render_thumbnails, PHOTO, SIZES)
+    assert len(rendered.thumbnails) == 3
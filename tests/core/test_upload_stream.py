@@ -0,0 +1,127 @@
+import asyncio
+import hashlib
+import io
+from typing import List, Tuple
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from src.backoffice.core.config import s3_settings
+from src.backoffice.core.services.s3_client import s3_client
+from src.backoffice.core.services.upload_stream import MIN_PART_SIZE
+
+MIB = 1024 * 1024
+
+
+class FakeS3:
+    def __init__(self):
+        self.calls: List[Tuple[str, dict]] = []
+
+    def __getattr__(self, operation):
+        def call(**kwargs):
+            self.calls.append((operation, kwargs))
+            if operation == "create_multipart_upload":
+                return {"UploadId": "upload-1"}
+            if operation == "upload_part":
+                return {"ETag": f"etag-{kwargs['PartNumber']}"}
+            return {}
+
+        return call
+
+    def operations(self) -> List[str]:
+        return [operation for operation, _ in self.calls]
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setattr(s3_client, "s3_client", fake)
+    monkeypatch.setattr(s3_settings, "multipart_part_size", MIN_PART_SIZE)
+    monkeypatch.setattr(s3_settings, "max_file_size", 20 * MIB)
+    return fake
+
+
+def png_upload(content: bytes) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        filename="menu.png",
+        headers=Headers({"content-type": "image/png"}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_large_upload_sent_in_parts_and_hashed(fake_s3):
+    content = b"\x89PNG\r\n\x1a\n" + bytes(12 * MIB)
+
+    result = await s3_client.upload_file(png_upload(content), generate_thumbnails=False)
+
+    assert fake_s3.operations() == [
+        "create_multipart_upload",
+        "upload_part",
+        "upload_part",
+        "upload_part",
+        "complete_multipart_upload",
+    ]
+    assert [len(kwargs["Body"]) for _, kwargs in fake_s3.calls[1:4]] == [
+        MIN_PART_SIZE,
+        MIN_PART_SIZE,
+        len(content) - 2 * MIN_PART_SIZE,
+    ]
+    assert [
+        part["PartNumber"] for part in fake_s3.calls[4][1]["MultipartUpload"]["Parts"]
+    ] == [1, 2, 3]
+    assert result["file_size"] == len(content)
+    assert result["content_hash"] == hashlib.sha256(content).hexdigest()
+    assert result["mime_type"] == "image/png"
+
+
+@pytest.mark.asyncio
+async def test_upload_stored_under_its_content_hash(fake_s3):
+    content = b"\x89PNG\r\n\x1a\n" + bytes(1024)
+
+    result = await s3_client.upload_file(png_upload(content), generate_thumbnails=False)
+
+    content_hash = hashlib.sha256(content).hexdigest()
+    assert result["file_path"] == f"menu-images/{content_hash}.png"
+    assert result["original_filename"] == "menu.png"
+    assert fake_s3.operations() == ["put_object"]
+    assert fake_s3.calls[0][1]["Body"] == content
+
+
+@pytest.mark.asyncio
+async def test_size_limit_enforced_before_anything_is_sent(fake_s3, monkeypatch):
+    monkeypatch.setattr(s3_settings, "max_file_size", 7 * MIB)
+    content = b"\x89PNG\r\n\x1a\n" + bytes(12 * MIB)
+
+    with pytest.raises(HTTPException) as error:
+        await s3_client.upload_file(png_upload(content), generate_thumbnails=False)
+
+    assert "exceeds the maximum" in error.value.detail
+    assert fake_s3.operations() == []
+
+
+@pytest.mark.asyncio
+async def test_content_not_matching_an_image_type_is_rejected(fake_s3):
+    with pytest.raises(HTTPException) as error:
+        await s3_client.upload_file(png_upload(b"<html>not an image</html>"))
+
+    assert "not an allowed image type" in error.value.detail
+    assert fake_s3.operations() == []
+
+
+@pytest.mark.asyncio
+async def test_upload_file_io_runs_off_the_event_loop(fake_s3, monkeypatch):
+    file_io = []
+    to_thread = asyncio.to_thread
+
+    async def recording_to_thread(func, *args, **kwargs):
+        file_io.append(func.__name__)
+        return await to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+    content = b"\x89PNG\r\n\x1a\n" + bytes(2 * MIB)
+
+    await s3_client.upload_file(png_upload(content), generate_thumbnails=False)
+
+    assert file_io == ["write", "write", "write", "flush", "read"]
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,6 +12,12 @@ from src.backoffice.apps.company.models.types import (
     CompanyRole,
     CuisineCategory,
 )
+from src.backoffice.apps.menu.models import (
+    Category,
+    CompanyBranchMenu,
+    MenuImage,
+    MenuItem,
+)
 from src.backoffice.apps.qr_manager.models import QRCode
 from src.backoffice.apps.qr_manager.services import QRCodeService
 
@@ -182,3 +189,118 @@ class QRCodeFactory:
             await session.commit()
             await session.refresh(qr_code)
         return qr_code
+
+
+class CategoryFactory:
+    @staticmethod
+    async def create(
+        session: AsyncSession,
+        name: str = "Test Category",
+        slug: str = "test-category",
+        parent_id: Optional[int] = None,
+        commit: bool = True,
+    ) -> Category:
+        category = Category(name=name, slug=slug, parent_id=parent_id)
+        session.add(category)
+        if commit:
+            await session.commit()
+            await session.refresh(category)
+        return category
+
+
+class MenuItemFactory:
+    @staticmethod
+    async def create(
+        session: AsyncSession,
+        category_id: int,
+        owner_company_id: Optional[int] = None,
+        name: str = "Test Dish",
+        slug: Optional[str] = None,
+        description: str = "A test dish",
+        grams: int = 250,
+        kilocalories: Optional[int] = None,
+        proteins: Optional[int] = None,
+        fats: Optional[int] = None,
+        carbohydrated: Optional[int] = None,
+        is_template: bool = False,
+        commit: bool = True,
+    ) -> MenuItem:
+        menu_item = MenuItem(
+            name=name,
+            slug=slug or f"{name.lower().replace(' ', '-')}-{owner_company_id}",
+            description=description,
+            category_id=category_id,
+            owner_company_id=owner_company_id,
+            grams=grams,
+            kilocalories=kilocalories,
+            proteins=proteins,
+            fats=fats,
+            carbohydrated=carbohydrated,
+            is_template=is_template,
+        )
+        session.add(menu_item)
+        if commit:
+            await session.commit()
+            await session.refresh(menu_item)
+        return menu_item
+
+
+class MenuImageFactory:
+    @staticmethod
+    async def create(
+        session: AsyncSession,
+        menu_item_id: int,
+        filename: str = "image.jpg",
+        file_path: Optional[str] = None,
+        file_size: int = 1024,
+        mime_type: str = "image/jpeg",
+        width: Optional[int] = 800,
+        height: Optional[int] = 600,
+        alt_text: Optional[str] = None,
+        display_order: int = 0,
+        is_primary: bool = False,
+        is_active: bool = True,
+        commit: bool = True,
+    ) -> MenuImage:
+        image = MenuImage(
+            filename=filename,
+            original_filename=filename,
+            file_path=file_path or f"menu-images/{filename}",
+            file_size=file_size,
+            mime_type=mime_type,
+            width=width,
+            height=height,
+            alt_text=alt_text,
+            menu_item_id=menu_item_id,
+            display_order=display_order,
+            is_primary=is_primary,
+            is_active=is_active,
+        )
+        session.add(image)
+        if commit:
+            await session.commit()
+            await session.refresh(image)
+        return image
+
+
+class CompanyBranchMenuFactory:
+    @staticmethod
+    async def create(
+        session: AsyncSession,
+        company_branch_id: int,
+        menu_item_id: int,
+        price: Decimal = Decimal("100.00"),
+        available: bool = True,
+        commit: bool = True,
+    ) -> CompanyBranchMenu:
+        branch_menu = CompanyBranchMenu(
+            company_branch_id=company_branch_id,
+            menu_item_id=menu_item_id,
+            price=price,
+            available=available,
+        )
+        session.add(branch_menu)
+        if commit:
+            await session.commit()
+            await session.refresh(branch_menu)
+        return branch_menu
@@ -0,0 +1,38 @@
+from datetime import timedelta
+from typing import AsyncGenerator
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.menu.services import (
+    BranchMenuService,
+    MenuItemService,
+    MenuSyncService,
+)
+from tests.fixtures.factories import CategoryFactory
+
+
+@pytest_asyncio.fixture
+async def menu_item_service(test_session: AsyncSession) -> MenuItemService:
+    return MenuItemService(test_session)
+
+
+@pytest_asyncio.fixture
+async def menu_sync_service(test_session: AsyncSession) -> MenuSyncService:
+    # Exact deltas, the lag is covered by its own test
+    return MenuSyncService(test_session, watermark_lag=timedelta(0))
+
+
+@pytest_asyncio.fixture
+async def branch_menu_service(test_session: AsyncSession) -> BranchMenuService:
+    return BranchMenuService(test_session)
+
+
+@pytest_asyncio.fixture
+async def test_category(test_session: AsyncSession) -> AsyncGenerator:
+    category = await CategoryFactory.create(
+        session=test_session,
+        name="Hot dishes",
+        slug="hot-dishes",
+    )
+    yield category
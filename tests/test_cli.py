@@ -0,0 +1,20 @@
+import pytest
+from click.testing import CliRunner
+
+from src.backoffice.cli import cli
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["import-menu", "--company", "demo", "--file", __file__, "--batch-size", "0"],
+        ["reindex-search", "--batch-size", "-1"],
+        ["gc-images", "--page-size", "0"],
+        ["gc-images", "--rate", "0"],
+    ],
+)
+def test_sizes_and_rates_must_be_positive(args):
+    result = CliRunner().invoke(cli, args)
+
+    assert result.exit_code == 2
+    assert "Invalid value" in result.output
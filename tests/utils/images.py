@@ -0,0 +1,51 @@
+import io
+from typing import List, Sequence, Tuple
+
+from PIL import Image, ImageDraw
+
+from src.backoffice.core.services.image_processing import (
+    RenderedImage,
+    RenderedThumbnail,
+    ThumbnailSize,
+)
+
+
+def make_image(width: int, height: int, format: str = "PNG", mode="RGBA") -> bytes:
+    """Gradient with some shapes, so encoders have real detail to work on"""
+    image = Image.linear_gradient("L").resize((width, height)).convert(mode)
+    draw = ImageDraw.Draw(image)
+    for step in range(0, min(width, height) // 2, max(min(width, height) // 20, 1)):
+        draw.ellipse((step, step, width - step, height - step), outline="red")
+    buffer = io.BytesIO()
+    image.save(buffer, format)
+    return buffer.getvalue()
+
+
+def render_thumbnails_from_full_image(
+    file_content: bytes, sizes: Sequence[ThumbnailSize], quality: int = 85
+) -> RenderedImage:
+    """
+    Thumbnails as they were rendered before the cascade: a full decode, then
+    every size resized from a copy of the full image
+    """
+    thumbnails: List[RenderedThumbnail] = []
+    with Image.open(io.BytesIO(file_content)) as img:
+        dimensions: Tuple[int, int] = img.size
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGB")
+        for size_name, box in sizes:
+            thumbnail = img.copy()
+            thumbnail.thumbnail(box, Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, format="JPEG", quality=quality)
+            thumbnails.append(
+                RenderedThumbnail(
+                    size=size_name,
+                    width=thumbnail.width,
+                    height=thumbnail.height,
+                    content=buffer.getvalue(),
+                )
+            )
+    return RenderedImage(
+        width=dimensions[0], height=dimensions[1], thumbnails=thumbnails
+    )
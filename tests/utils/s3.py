@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from typing import Dict
+
+from botocore.exceptions import ClientError
+
+
+class FakeBucket:
+    """In-memory stand-in for the boto3 client, for `s3_client.s3_client`"""
+
+    def __init__(self):
+        self.objects: Dict[str, bytes] = {}
+        self.modified: Dict[str, datetime] = {}
+
+    def put_object(self, Key, Body, **kwargs):
+        self.objects[Key] = bytes(Body)
+        self.modified[Key] = datetime.now(timezone.utc)
+        return {}
+
+    def download_file(self, bucket, key, destination):
+        with open(destination, "wb") as file:
+            file.write(self.objects[key])
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        return f"https://cdn/{Params['Key']}"
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError(
+                {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+            )
+        return {
+            "ContentLength": len(self.objects[Key]),
+            "LastModified": self.modified[Key],
+        }
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys, ContinuationToken=None):
+        keys = sorted(
+            key
+            for key in self.objects
+            if key.startswith(Prefix) and key > (ContinuationToken or "")
+        )
+        page = keys[:MaxKeys]
+        response = {
+            "Contents": [
+                {
+                    "Key": key,
+                    "Size": len(self.objects[key]),
+                    "LastModified": self.modified[key],
+                }
+                for key in page
+            ],
+            "IsTruncated": len(keys) > MaxKeys,
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = page[-1]
+        return response
+
+    def delete_objects(self, Bucket, Delete):
+        for item in Delete["Objects"]:
+            self.objects.pop(item["Key"], None)
+            self.modified.pop(item["Key"], None)
+        return {}